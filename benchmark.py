@@ -0,0 +1,143 @@
+"""성능 비교 스크립트.
+
+사용법:
+    python benchmark.py              # 모든 항목
+    python benchmark.py summarize    # 지정한 항목만
+
+네트워크나 API 키 없이 만든 데이터로 예전 구현과 현재 구현의 시간을 비교합니다.
+"""
+import sys
+import time
+
+import feedparser
+
+from news_chatbot import simple_summarize, simple_summarize_batch
+from news_rss import parse_rss_items
+
+
+def _legacy_simple_summarize(text: str, max_sentences: int = 2) -> str:
+    """비교용: 글자마다 문자열을 이어 붙이던 예전 simple_summarize."""
+    if not text:
+        return "(요약할 내용이 없습니다.)"
+
+    cleaned = (
+        text.replace("<br>", ". ")
+        .replace("<br/>", ". ")
+        .replace("<br />", ". ")
+        .replace("&nbsp;", " ")
+    )
+
+    sentences = []
+    current = ""
+    for ch in cleaned:
+        current += ch
+        if ch in ".?!？！" or ch == "다" or ch == "요":
+            if current.strip():
+                sentences.append(current.strip())
+                current = ""
+    if current.strip():
+        sentences.append(current.strip())
+
+    if not sentences:
+        return cleaned.strip()
+
+    summary = " ".join(sentences[:max_sentences])
+    return summary.strip()
+
+
+def _best_of(fn, repeat: int = 5) -> float:
+    """repeat 번 실행한 것 중 가장 짧은 시간(초)."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def _report(name: str, legacy: float, current: float):
+    print(f"  {name:<28} 예전 {legacy * 1000:9.2f} ms   현재 {current * 1000:9.2f} ms   {legacy / current:6.1f}배")
+
+
+def _rss_descriptions(count: int, sentences: int) -> list:
+    sentence = (
+        "정부는 다음 달부터 반도체 수출 지원 대책을 시행한다고 밝혔다. "
+        "업계에서는 &quot;투자 여력이 커질 것&quot;이라는 기대가 나온다.<br/>"
+        "U.S. officials said the plan was reviewed on Jan. 5 by Dr. Lee. "
+    )
+    return [f"<p>{i}번 기사. " + sentence * sentences + "</p>" for i in range(count)]
+
+
+def bench_summarize():
+    """simple_summarize: 예전 글자 단위 구현 / 문장 나누기 엔진 / 일괄 처리."""
+    print("simple_summarize")
+    for count, sentences in ((100, 3), (100, 200), (20, 2000)):
+        texts = _rss_descriptions(count, sentences)
+        size = sum(len(t) for t in texts) // count
+        legacy = _best_of(lambda: [_legacy_simple_summarize(t) for t in texts])
+        current = _best_of(lambda: [simple_summarize(t) for t in texts])
+        batch = _best_of(lambda: simple_summarize_batch(texts))
+        _report(f"{count}개 x {size:,}자", legacy, current)
+        _report(f"{count}개 x {size:,}자 (일괄)", legacy, batch)
+    print()
+
+
+def _google_news_feed(count: int) -> bytes:
+    """Google 뉴스 검색 RSS 와 같은 형식의 문서."""
+    items = []
+    for i in range(count):
+        source = ("연합뉴스", "한국경제", "조선일보", "KBS 뉴스")[i % 4]
+        title = f"반도체 수출 {i}개월 연속 증가…&quot;역대 최대&quot; 전망 - {source}"
+        description = (
+            f'<a href="https://news.google.com/rss/articles/CBMi{i:08d}?oc=5" target="_blank">'
+            f"반도체 수출 {i}개월 연속 증가…&quot;역대 최대&quot; 전망</a>"
+            f'&nbsp;&nbsp;<font color="#6f6f6f">{source}</font>'
+        )
+        items.append(
+            f"<item><title>{title}</title>"
+            f"<link>https://news.google.com/rss/articles/CBMi{i:08d}?oc=5</link>"
+            f'<guid isPermaLink="false">CBMi{i:08d}</guid>'
+            f"<pubDate>Mon, 07 Oct 2024 {i % 24:02d}:00:00 GMT</pubDate>"
+            f"<description>{description.replace('&', '&amp;').replace('<', '&lt;')}</description>"
+            f'<source url="https://www.example.com">{source}</source></item>'
+        )
+    return (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?><rss version="2.0" '
+        'xmlns:media="http://search.yahoo.com/mrss/"><channel><generator>NFE/5.0</generator>'
+        '<title>"반도체" - Google 뉴스</title><link>https://news.google.com/search?q=반도체</link>'
+        "<language>ko</language><description>Google 뉴스</description>"
+        + "".join(items)
+        + "</channel></rss>"
+    ).encode("utf-8")
+
+
+def bench_rss():
+    """RSS 파싱: feedparser 전체 파싱 / news_rss 로 필요한 항목만."""
+    print("RSS 파싱 (feedparser 대비)")
+    content = _google_news_feed(100)
+    for max_results in (10, 50, 100):
+        legacy = _best_of(lambda: feedparser.parse(content).entries[:max_results])
+        current = _best_of(lambda: parse_rss_items(content, max_results))
+        _report(f"100개 중 {max_results}개", legacy, current)
+    print()
+
+
+BENCHMARKS = {
+    "summarize": bench_summarize,
+    "rss": bench_rss,
+}
+
+
+def main(argv) -> int:
+    names = argv or list(BENCHMARKS)
+    unknown = [name for name in names if name not in BENCHMARKS]
+    if unknown:
+        print(f"알 수 없는 항목: {', '.join(unknown)} (가능: {', '.join(BENCHMARKS)})")
+        return 1
+    for name in names:
+        BENCHMARKS[name]()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
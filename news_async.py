@@ -0,0 +1,313 @@
+"""asyncio 기반 뉴스 / 재미나이 클라이언트.
+
+모든 비동기 요청은 백그라운드 스레드에서 도는 공유 이벤트 루프 하나에서 실행되고,
+Google 뉴스 요청은 그 루프에 묶인 aiohttp 커넥션 풀을, 재미나이 요청은 그 루프에서 만든
+API 키별 비동기(grpc) 클라이언트를 사용하므로 스레드 수와 상관없이 많은 요청을 동시에
+기다릴 수 있습니다. 결과 캐시, 조건부 GET, 오류 형식, 같은 요청을 한 번만 보내는
+single-flight 는 동기 API(news_chatbot)와 함께 씁니다.
+
+스레드 풀은 루프를 막는 작업에만 씁니다: RSS 파싱(CPU)은 "parse" 풀, aiohttp 가
+설치되어 있지 않을 때의 동기 다운로드와 기사가 많아 나눠 요약(map-reduce)하는 단계는
+"blocking" 풀. news_chatbot.shutdown() 이 이 모듈의 shutdown() 도 부릅니다.
+
+    result = await afetch_news("인공지능")
+    summary = await asummarize_with_gemini(result["articles"])
+
+동기 코드에서는 run_sync(afetch_news("인공지능")) 처럼 호출할 수 있습니다.
+"""
+import asyncio
+import contextlib
+import functools
+import os
+import threading
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import aiohttp
+except ImportError:  # 선택 의존성
+    aiohttp = None
+
+import news_chatbot
+import news_http
+from news_cache import normalize_keyword
+
+
+ASYNC_MAX_CONNECTIONS = 100  # aiohttp 커넥션 풀 전체 크기
+ASYNC_MAX_CONNECTIONS_PER_HOST = 32
+ASYNC_PARSE_WORKERS = os.cpu_count() or 4  # RSS 파싱(CPU 작업)용 스레드 수
+ASYNC_BLOCKING_WORKERS = 32  # 동기 다운로드, 나눠 요약하기 등 블로킹 작업용 스레드 수
+ASYNC_SHUTDOWN_TIMEOUT = 5  # shutdown() 에서 커넥션 풀을 닫고 루프를 멈출 때 기다리는 최대 초
+
+_lock = threading.Lock()
+_loop = None
+_loop_thread = None
+_executors = {}  # "parse" / "blocking" → ThreadPoolExecutor
+_http = None  # aiohttp.ClientSession (공유 루프에서만 사용)
+_MODEL_SLOT = "async"  # news_chatbot._gemini_models 에서 공유 루프용 모델을 구분하는 키 끝부분
+
+
+def get_loop():
+    """공유 이벤트 루프를 반환합니다. 처음 호출할 때 백그라운드 스레드에서 시작합니다."""
+    global _loop, _loop_thread
+    with _lock:
+        if _loop is None or _loop.is_closed():
+            loop = asyncio.new_event_loop()
+            _loop_thread = threading.Thread(target=loop.run_forever, name="news-async-loop", daemon=True)
+            _loop_thread.start()
+            _loop = loop
+        return _loop
+
+
+def run_sync(coro, timeout=None):
+    """동기 코드에서 코루틴을 공유 루프에 실행하고 결과를 기다립니다."""
+    return asyncio.run_coroutine_threadsafe(coro, get_loop()).result(timeout)
+
+
+async def _on_shared_loop(coro):
+    loop = get_loop()
+    if asyncio.get_running_loop() is loop:
+        return await coro
+    return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, loop))
+
+
+def _get_executor(kind: str):
+    with _lock:
+        executor = _executors.get(kind)
+        if executor is None:
+            workers = ASYNC_PARSE_WORKERS if kind == "parse" else ASYNC_BLOCKING_WORKERS
+            executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"news-async-{kind}")
+            _executors[kind] = executor
+        return executor
+
+
+async def _run_in(kind: str, fn, *args):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_executor(kind), functools.partial(fn, *args))
+
+
+@contextlib.asynccontextmanager
+async def _holding(lock):
+    """threading.Lock 을 루프를 막지 않고 잡습니다. 다른 스레드가 잡고 있을 때만
+    blocking 풀에서 기다리고, 기다리다 취소되면 나중에 잡히는 대로 놓아 줍니다."""
+    if not lock.acquire(blocking=False):
+        acquired = asyncio.get_running_loop().run_in_executor(_get_executor("blocking"), lock.acquire)
+        try:
+            await asyncio.shield(acquired)
+        except asyncio.CancelledError:
+            acquired.add_done_callback(lambda _: lock.release())
+            raise
+    try:
+        yield
+    finally:
+        lock.release()
+
+
+def _get_model(api_key: str):
+    """공유 루프에서 쓰는 API 키별 재미나이 모델.
+
+    grpc 비동기 클라이언트는 만들 때의 이벤트 루프에 묶이므로 공유 루프에서 만들어
+    news_chatbot 의 모델 캐시에 (키, 모델, "async") 로 넣어 둡니다. 그래서
+    invalidate_gemini_models(키) 와 인증 실패 처리가 동기 모델과 함께 버립니다.
+    """
+    key = (api_key, news_chatbot.GEMINI_MODEL, _MODEL_SLOT)
+    model = news_chatbot._gemini_models.get(key)
+    if model is not None:
+        return model
+
+    with news_chatbot._gemini_models_lock:
+        model = news_chatbot._gemini_models.get(key)
+        if model is None:
+            # 동기 모델과 같은 이유로 내부 속성(_async_client)에 키별 클라이언트를 넣습니다.
+            news_chatbot.genai.configure(api_key=api_key)
+            model = news_chatbot.genai.GenerativeModel(news_chatbot.GEMINI_MODEL)
+            model._async_client = news_chatbot.genai_client.get_default_generative_async_client()
+            news_chatbot._gemini_models.set(key, model)
+        return model
+
+
+def _get_http():
+    global _http
+    if _http is None or _http.closed:
+        connector = aiohttp.TCPConnector(
+            limit=ASYNC_MAX_CONNECTIONS,
+            limit_per_host=ASYNC_MAX_CONNECTIONS_PER_HOST,
+        )
+        _http = aiohttp.ClientSession(connector=connector)
+    return _http
+
+
+async def afetch_news(keyword: str, max_results: int = 10, use_cache: bool = True):
+    """fetch_news 의 비동기 버전. 반환 형식과 캐시를 그대로 공유합니다."""
+    if use_cache:
+        cached = news_chatbot._cached_news(keyword, max_results)
+        if cached is not None:
+            return cached
+
+    result = await _on_shared_loop(_arefresh_news(keyword, max_results))
+    if result.get("error"):
+        return result
+    return news_chatbot._copy_result(result)
+
+
+async def _arefresh_news(keyword: str, max_results: int):
+    # 같은 키워드의 동시 요청은 (동기 fetch_news 호출까지 포함해) 하나의 다운로드를 함께 기다립니다.
+    cache_key = (normalize_keyword(keyword), max_results)
+    return await news_chatbot._news_flight.ado(
+        cache_key, _adownload_and_cache, cache_key, keyword, max_results
+    )
+
+
+async def _adownload_and_cache(cache_key, keyword: str, max_results: int):
+    result = await _adownload_news(keyword, max_results)
+    if not result.get("error"):
+        news_chatbot._news_cache.set(cache_key, result)
+    return result
+
+
+async def _adownload_news(keyword: str, max_results: int):
+    if aiohttp is None:
+        return await _run_in("blocking", news_chatbot._download_news, keyword, max_results)
+
+    url = news_chatbot.GOOGLE_NEWS_SEARCH_RSS.format(query=urllib.parse.quote(keyword))
+    request_headers, stored = news_chatbot._conditional_headers(url, max_results)
+    timeout = aiohttp.ClientTimeout(
+        sock_connect=news_http.CONNECT_TIMEOUT, sock_read=news_http.READ_TIMEOUT
+    )
+
+    # news_http 와 같은 재시도 정책 (일시적인 5xx, 연결 끊김)
+    error = None
+    for attempt in range(news_http.RETRY_TOTAL + 1):
+        if attempt:
+            await asyncio.sleep(news_http.RETRY_BACKOFF * (2 ** (attempt - 1)))
+        try:
+            async with _get_http().get(url, headers=request_headers, timeout=timeout) as resp:
+                status, headers = resp.status, resp.headers
+                content = await resp.read()
+        except asyncio.TimeoutError:
+            error = news_chatbot._timeout_error()
+            continue
+        except aiohttp.ClientConnectionError:
+            error = news_chatbot._connection_error()
+            continue
+        except aiohttp.ClientError as e:
+            return news_chatbot._request_error(e)
+
+        if status >= 400:
+            error = news_chatbot._request_error(f"{status} Error for url: {url}")
+            if status in news_http.RETRY_STATUS:
+                continue
+            return error
+
+        # feedparser 는 CPU 작업이므로 루프 밖에서 실행합니다.
+        return await _run_in(
+            "parse", news_chatbot._handle_feed_response, url, max_results, status, headers, content, stored
+        )
+    return error
+
+
+async def asummarize_with_gemini(articles: list, topic: str = None) -> dict:
+    """summarize_with_gemini 의 비동기 버전. 요약 캐시와 single-flight 를 함께 씁니다."""
+    return await _on_shared_loop(_asummarize(articles, topic))
+
+
+async def _asummarize(articles: list, topic):
+    api_key, articles, result = news_chatbot._summary_request(articles, topic)
+    if result is not None:
+        return result
+    return dict(
+        await news_chatbot._gemini_flight.ado(
+            news_chatbot._summary_flight_key(articles, topic), _agenerate_summary, api_key, articles, topic
+        )
+    )
+
+
+async def _agenerate_summary(api_key: str, articles: list, topic):
+    try:
+        model = _get_model(api_key)
+        sync_model = news_chatbot.get_gemini_model(api_key)
+        if news_chatbot._fits_one_prompt(articles):
+            plan = news_chatbot._summary_prompt_plan(sync_model, articles, topic)
+        else:
+            # 묶음별 요약은 news_chatbot 의 요약 스레드 풀에서 동시에 만들고 기다리기만 합니다.
+            plan = await _run_in("blocking", news_chatbot._summary_prompt_plan, sync_model, articles, topic)
+        if plan["prompt"] is None:
+            summary = plan["summary"]
+        else:
+            summary = (await model.generate_content_async(plan["prompt"])).text.strip()
+        news_chatbot._store_planned_summary(articles, topic, plan, summary)
+        return news_chatbot._summary_result(plan, summary)
+    except Exception as e:
+        return news_chatbot._generation_error(api_key, e, "요약")
+
+
+async def achat_with_gemini(articles: list, user_message: str, conversation_id: str = None) -> dict:
+    """chat_with_gemini 의 비동기 버전. 대화 기록과 single-flight 를 함께 씁니다."""
+    return await _on_shared_loop(_achat(articles, user_message, conversation_id))
+
+
+async def _achat(articles: list, user_message: str, conversation_id):
+    api_key, error = news_chatbot._chat_request(articles)
+    if error is not None:
+        return error
+
+    conversation = news_chatbot.get_conversation(conversation_id, articles)
+    flight_key = news_chatbot._chat_flight_key(api_key, conversation, user_message)
+    result = dict(
+        await news_chatbot._gemini_flight.ado(flight_key, _agenerate_chat, api_key, conversation, user_message)
+    )
+    if news_chatbot._merged_into_other_chat(conversation, result):
+        async with _holding(conversation.lock):
+            news_chatbot._adopt_chat_result(conversation, user_message, result)
+    return result
+
+
+async def _agenerate_chat(api_key: str, conversation, user_message: str) -> dict:
+    try:
+        model = _get_model(api_key)
+        # 동기 호출과 마찬가지로 같은 대화의 차례는 순서대로 처리합니다.
+        async with _holding(conversation.lock):
+            context, retrieval = conversation.article_context_for(user_message)
+            prompt = conversation.build_prompt(user_message, context)
+            response = await model.generate_content_async(prompt)
+            answer = response.text.strip()
+            conversation.add_turn(user_message, answer)
+        return news_chatbot._chat_result(conversation, answer, prompt, retrieval)
+    except Exception as e:
+        return news_chatbot._generation_error(api_key, e, "대화")
+
+
+async def _aclose_http():
+    global _http
+    if _http is not None:
+        await _http.close()
+        _http = None
+
+
+def shutdown():
+    """커넥션 풀, 스레드 풀, 공유 루프와 그 루프에 묶인 재미나이 모델을 정리합니다.
+
+    커넥션 풀을 닫지 못해도(시간 초과 등) 루프와 스레드 풀은 항상 정리합니다.
+    """
+    global _loop, _loop_thread, _executors, _http
+    with _lock:
+        loop, _loop = _loop, None
+        thread, _loop_thread = _loop_thread, None
+        executors, _executors = _executors, {}
+    if loop is not None and loop.is_running():
+        closing = asyncio.run_coroutine_threadsafe(_aclose_http(), loop)
+        try:
+            closing.result(ASYNC_SHUTDOWN_TIMEOUT)
+        except Exception as e:  # concurrent.futures.TimeoutError 포함
+            closing.cancel()
+            print(f"비동기 커넥션 풀을 닫지 못했습니다: {e!r}")
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(ASYNC_SHUTDOWN_TIMEOUT)
+    if loop is not None and not loop.is_running():
+        loop.close()
+    _http = None
+    for executor in executors.values():
+        executor.shutdown(wait=False)
+    for key in news_chatbot._gemini_models.keys():
+        if key[-1] == _MODEL_SLOT:
+            news_chatbot._gemini_models.delete(key)
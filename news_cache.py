@@ -0,0 +1,495 @@
+"""뉴스 검색 결과 등에 사용하는 인메모리 캐시와 백그라운드 갱신 도구."""
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import time
+import unicodedata
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+
+def normalize_keyword(keyword: str) -> str:
+    """캐시 키로 쓸 수 있도록 키워드를 정규화합니다 (NFC, 대소문자, 공백)."""
+    text = unicodedata.normalize("NFC", keyword or "").casefold()
+    return " ".join(text.split())
+
+
+class TTLCache:
+    """크기 제한(LRU 제거)과 항목별 TTL을 가진 스레드 안전 캐시.
+
+    stale_ttl 을 지정하면 만료된 항목도 그 시간 동안은 지우지 않고 남겨 두어
+    get_stale() 로 오래된 값을 먼저 돌려줄 수 있습니다 (stale-while-revalidate).
+    weigher(값) 를 지정하면 항목별 크기(예: 바이트 수)를 합산해서
+    max_weight 를 넘지 않도록 오래된 항목부터 제거합니다.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = 256,
+        ttl: float = 300,
+        stale_ttl: float = 0,
+        max_weight: int = None,
+        weigher=None,
+    ):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_weight = max_weight
+        self.weigher = weigher
+        self.weight = 0
+        self._data = OrderedDict()  # key -> (만료 시각, 값, 크기)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _lookup(self, key, now):
+        """(값, 신선 여부)를 반환합니다. 없거나 완전히 만료되면 None. 락 안에서 호출."""
+        item = self._data.get(key)
+        if item is None:
+            return None
+        expires_at, value, _ = item
+        if expires_at is None or expires_at > now:
+            return value, True
+        if self.stale_ttl and expires_at + self.stale_ttl > now:
+            return value, False
+        self._remove(key)
+        self.expirations += 1
+        return None
+
+    def _remove(self, key):
+        """항목을 지우고 크기 합계를 줄입니다. 락 안에서 호출."""
+        _, _, weight = self._data.pop(key)
+        self.weight -= weight
+
+    def _over_limit(self) -> bool:
+        return len(self._data) > self.maxsize or (
+            self.max_weight is not None and self.weight > self.max_weight
+        )
+
+    def purge_expired(self) -> int:
+        """완전히 만료된 항목을 모두 지우고 지운 개수를 반환합니다."""
+        with self._lock:
+            return self._purge_expired(time.monotonic())
+
+    def _purge_expired(self, now) -> int:
+        grace = self.stale_ttl or 0
+        expired = [
+            key for key, (expires_at, _, _) in self._data.items()
+            if expires_at is not None and expires_at + grace <= now
+        ]
+        for key in expired:
+            self._remove(key)
+        self.expirations += len(expired)
+        return len(expired)
+
+    def get(self, key, default=None):
+        with self._lock:
+            found = self._lookup(key, time.monotonic())
+            if found is None or not found[1]:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return found[0]
+
+    def get_stale(self, key):
+        """(값, 신선 여부) 를 반환합니다. 만료 후 stale_ttl 이 지난 항목은 None."""
+        with self._lock:
+            found = self._lookup(key, time.monotonic())
+            if found is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            if found[1]:
+                self.hits += 1
+            else:
+                self.stale_hits += 1
+            return found
+
+    def expires_in(self, key):
+        """남은 유효 시간(초). 항목이 없으면 None, 만료 기한이 없으면 inf."""
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            if item[0] is None:
+                return float("inf")
+            return item[0] - time.monotonic()
+
+    def set(self, key, value, ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        now = time.monotonic()
+        expires_at = now + ttl if ttl else None
+        weight = self.weigher(value) if self.weigher is not None else 0
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+            self._data[key] = (expires_at, value, weight)
+            self.weight += weight
+            if self._over_limit():
+                # 만료된 항목부터 정리하고, 그래도 넘치면 가장 오래 쓰지 않은 항목을 제거
+                self._purge_expired(now)
+            while self._data and self._over_limit():
+                self._remove(next(iter(self._data)))
+                self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            if key not in self._data:
+                return False
+            self._remove(key)
+            return True
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.weight = 0
+
+    def keys(self) -> list:
+        """지금 들어 있는 키 목록 (만료되었지만 아직 지우지 않은 항목 포함)."""
+        with self._lock:
+            return list(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            return item is not None and (item[0] is None or item[0] > time.monotonic())
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.stale_hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "stale_ttl": self.stale_ttl,
+                "weight": self.weight,
+                "max_weight": self.max_weight,
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.hits + self.stale_hits) / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+class DiskCache:
+    """키(해시 문자열)별로 JSON 값을 파일에 저장하는 캐시. 재시작 후에도 유지됩니다."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.errors = 0
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def get(self, key: str, default=None):
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                value = json.load(f)
+        except FileNotFoundError:
+            self.misses += 1
+            return default
+        except (OSError, ValueError):
+            self.errors += 1
+            self.misses += 1
+            return default
+        self.hits += 1
+        return value
+
+    def set(self, key: str, value):
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # 임시 파일에 쓴 뒤 교체해서 읽는 쪽이 반쯤 쓴 파일을 보지 않게 합니다.
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(value, f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+            self.writes += 1
+        except OSError:
+            self.errors += 1
+
+    def stats(self) -> dict:
+        return {
+            "directory": self.directory,
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "errors": self.errors,
+        }
+
+
+class SingleFlight:
+    """같은 키로 동시에 들어온 호출을 하나로 합칩니다 (single-flight).
+
+    먼저 들어온 호출만 fn 을 실행하고, 그동안 들어온 나머지 호출은 기다렸다가
+    같은 결과(또는 같은 예외)를 받습니다. 코루틴은 ado() 로 실행하며, 같은 키의
+    do() 호출과 ado() 호출도 서로 합쳐집니다.
+    """
+
+    class _Call:
+        def __init__(self):
+            self.done = threading.Event()
+            self.result = None
+            self.error = None
+            self.callbacks = []  # 끝나면 부를 함수 (asyncio 에서 기다리는 호출용). 끝난 뒤에는 None
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.executed = 0
+        self.coalesced = 0
+
+    def _join(self, key):
+        """(call, leader). leader 가 True 면 이 호출이 fn 을 실행해야 합니다."""
+        with self._lock:
+            self.calls += 1
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = self._Call()
+                self.executed += 1
+            else:
+                self.coalesced += 1
+            return call, leader
+
+    def _finish(self, key, call):
+        with self._lock:
+            del self._calls[key]
+            callbacks, call.callbacks = call.callbacks, None
+        call.done.set()
+        for callback in callbacks:
+            callback()
+
+    def do(self, key, fn, *args, **kwargs):
+        call, leader = self._join(key)
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            self._finish(key, call)
+
+    async def ado(self, key, fn, *args, **kwargs):
+        """do() 의 asyncio 버전. fn 은 코루틴 함수입니다.
+
+        기다리는 동안 이벤트 루프를 막지 않고, 기다리던 쪽이 취소되어도 실행 중인 fn 은
+        끝까지 실행되어 다른 호출들이 결과를 받습니다.
+        """
+        loop = asyncio.get_running_loop()
+        call, leader = self._join(key)
+        if leader:
+            task = loop.create_task(fn(*args, **kwargs))
+            task.add_done_callback(lambda t: self._settle(key, call, t))
+            return await asyncio.shield(task)
+
+        waiter = loop.create_future()
+
+        def wake():
+            try:
+                loop.call_soon_threadsafe(lambda: waiter.done() or waiter.set_result(None))
+            except RuntimeError:  # 루프가 이미 닫힘
+                pass
+
+        with self._lock:
+            pending = call.callbacks is not None
+            if pending:
+                call.callbacks.append(wake)
+        if pending:
+            await waiter
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def _settle(self, key, call, task):
+        if task.cancelled():
+            call.error = asyncio.CancelledError()
+        elif task.exception() is not None:
+            call.error = task.exception()
+        else:
+            call.result = task.result()
+        self._finish(key, call)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "executed": self.executed,
+                "coalesced": self.coalesced,
+                "in_flight": len(self._calls),
+            }
+
+
+class RateLimiter:
+    """토큰 버킷 방식의 요청 속도 제한 (초당 rate 개, 최대 burst 개까지 몰아서 허용)."""
+
+    def __init__(self, rate: float, burst: int = 1):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+
+class HotKeyTracker:
+    """최근 많이 조회된 키를 셉니다. decay() 로 오래된 인기도를 점차 줄입니다."""
+
+    def __init__(self, maxsize: int = 1000):
+        self.maxsize = maxsize
+        self._counts = Counter()
+        self._args = {}  # key -> 갱신 함수에 넘길 인자
+        self._lock = threading.Lock()
+
+    def record(self, key, *args):
+        with self._lock:
+            self._counts[key] += 1
+            self._args[key] = args
+            if len(self._counts) > self.maxsize:
+                keep = dict(self._counts.most_common(self.maxsize // 2))
+                self._counts = Counter(keep)
+                self._args = {k: self._args[k] for k in keep}
+
+    def top(self, n: int):
+        """[(key, args), ...] 를 조회 수가 많은 순서로 반환합니다."""
+        with self._lock:
+            return [(key, self._args[key]) for key, _ in self._counts.most_common(n)]
+
+    def decay(self, factor: float = 0.9):
+        with self._lock:
+            for key in list(self._counts):
+                self._counts[key] *= factor
+                if self._counts[key] < 1:
+                    del self._counts[key]
+                    self._args.pop(key, None)
+
+    def __len__(self):
+        return len(self._counts)
+
+
+class BackgroundRefresher:
+    """캐시 항목을 백그라운드 스레드 풀에서 갱신합니다.
+
+    같은 키의 갱신은 동시에 하나만 실행하고, rate_limiter 로 전체 갱신 속도를 제한합니다.
+    """
+
+    def __init__(self, max_workers: int = 2, rate_limiter: RateLimiter = None):
+        self.max_workers = max_workers
+        self.rate_limiter = rate_limiter
+        self._executor = None
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._counters = Counter()
+
+    def submit(self, key, fn, *args) -> bool:
+        """갱신 작업을 예약합니다. 이미 진행 중이거나 속도 제한에 걸리면 False."""
+        with self._lock:
+            if key in self._pending:
+                self._counters["skipped_pending"] += 1
+                return False
+            if self.rate_limiter is not None and not self.rate_limiter.try_acquire():
+                self._counters["skipped_rate_limited"] += 1
+                return False
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="cache-refresh"
+                )
+            self._pending.add(key)
+            self._counters["submitted"] += 1
+            executor = self._executor
+        executor.submit(self._run, key, fn, args)
+        return True
+
+    def _run(self, key, fn, args):
+        try:
+            fn(*args)
+            outcome = "completed"
+        except Exception:
+            outcome = "failed"
+        with self._lock:
+            self._pending.discard(key)
+            self._counters[outcome] += 1
+
+    def shutdown(self, wait: bool = False):
+        """대기 중인 갱신은 취소합니다. 취소된 작업은 _run 이 불리지 않으므로 예약 표시도
+        여기서 지워야 다시 시작한 뒤 같은 키를 갱신할 수 있습니다."""
+        with self._lock:
+            executor, self._executor = self._executor, None
+            self._pending.clear()
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = {
+                name: self._counters[name]
+                for name in ("submitted", "completed", "failed", "skipped_pending", "skipped_rate_limited")
+            }
+            stats["pending"] = len(self._pending)
+            return stats
+
+
+class PeriodicTask:
+    """interval 초마다 fn 을 실행하는 데몬 스레드."""
+
+    def __init__(self, interval: float, fn, name: str = "periodic-task"):
+        self.interval = interval
+        self.fn = fn
+        self.name = name
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = None):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def _loop(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.fn()
+            except Exception as e:
+                print(f"{self.name} 실행 중 오류 발생: {e}")
@@ -1,33 +1,244 @@
+import hashlib
 import json
 import os
+import queue
+import re
+import secrets
+import sys
 import textwrap
+import threading
+import time
+import unicodedata
 import urllib.parse
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait
 from datetime import datetime
 
 import feedparser
 import google.generativeai as genai
 import requests
+from google.api_core import exceptions as google_exceptions
+from google.generativeai import client as genai_client
+
+from news_cache import (
+    BackgroundRefresher,
+    DiskCache,
+    HotKeyTracker,
+    PeriodicTask,
+    RateLimiter,
+    SingleFlight,
+    TTLCache,
+    normalize_keyword,
+)
+from news_conversation import Conversation
+from news_dedup import canonical_link, dedupe_articles, unique_article_indices
+from news_http import close_session, get_pool_stats, http_get
+from news_retrieval import RETRIEVAL_TOP_K, BM25Index
+from news_rss import RssFormatError, parse_rss_items
+from news_store import JsonlStore, SqliteNewsStore
+from news_text import (
+    estimate_tokens,
+    html_to_text,
+    lead_sentences,
+    lead_sentences_batch,
+    plain_text,
+    strip_source_suffix,
+)
 
 
 GOOGLE_NEWS_SEARCH_RSS = (
     "https://news.google.com/rss/search?q={query}&hl=ko&gl=KR&ceid=KR:ko"
 )
+FAST_RSS_PARSER = True  # False 면 항상 feedparser 로 전체 문서를 파싱
 
 # API 키 저장 파일 경로
 API_KEY_FILE = "api_key.json"
+# 메모리에 보관한 API 키를 파일 변경(mtime)과 비교하는 주기 (초). None 이면 확인하지 않음
+API_KEY_CHECK_INTERVAL = 2.0
+# 저장한 뉴스: "sqlite" (색인, 페이지 조회) 또는 "jsonl" (한 줄에 한 건씩 덧붙이는 텍스트 파일).
+# SQLite 를 처음 사용할 때 예전 JSONL(SAVED_NEWS_LOG) / JSON 배열(SAVED_NEWS_FILE) 기록을 한 번 옮깁니다.
+SAVED_NEWS_BACKEND = "sqlite"
+SAVED_NEWS_DB = "saved_news.db"
+SAVED_NEWS_LOG = "saved_news.jsonl"
 SAVED_NEWS_FILE = "saved_news.json"
+SAVED_NEWS_FSYNC = True  # 저장할 때마다 디스크 기록까지 기다림 (False 면 더 빠르지만 정전 시 유실 가능)
+SAVED_PAGE_SIZE = 20  # /saved 한 페이지의 기본 항목 수
+
+GEMINI_MODEL = "gemini-2.5-flash"
+GEMINI_MODEL_CACHE_SIZE = 8  # (API 키, 모델 이름) 조합별로 재사용할 모델 수
+
+# 검색 결과 캐시 설정 (정규화된 키워드 + max_results 기준)
+NEWS_CACHE_SIZE = 256
+NEWS_CACHE_TTL = 300  # 초
+
+# stale-while-revalidate: 만료된 결과도 NEWS_STALE_TTL 초 동안은 바로 돌려주고
+# 백그라운드에서 새로 가져옵니다.
+SWR_ENABLED = True
+NEWS_STALE_TTL = 3600
+REFRESH_WORKERS = 2
+REFRESH_RATE = 1.0  # 초당 최대 백그라운드 갱신 수 (Google 뉴스 부하 제한)
+REFRESH_BURST = 5
+
+# 자주 검색되는 키워드는 만료되기 전에 미리 갱신합니다.
+HOT_KEYWORD_COUNT = 10
+HOT_REFRESH_INTERVAL = 30  # 초
+HOT_REFRESH_LEAD = 60  # 만료까지 남은 시간이 이보다 짧으면 갱신
+
+_news_cache = TTLCache(maxsize=NEWS_CACHE_SIZE, ttl=NEWS_CACHE_TTL, stale_ttl=NEWS_STALE_TTL)
+_hot_keywords = HotKeyTracker()
+_refresher = BackgroundRefresher(
+    max_workers=REFRESH_WORKERS,
+    rate_limiter=RateLimiter(REFRESH_RATE, burst=REFRESH_BURST),
+)
+_hot_refresh_task = None
+
+# 동시에 들어온 같은 검색 / 같은 Gemini 요청은 한 번만 실행합니다.
+_news_flight = SingleFlight()
+_gemini_flight = SingleFlight()
+
+# 재미나이 요약 캐시: 기사 제목/내용 + 프롬프트 버전 + 모델 이름의 해시를 키로 사용
+SUMMARY_PROMPT_VERSION = "summary-v1"  # 요약 프롬프트를 바꾸면 함께 올려 주세요
+SUMMARY_CACHE_SIZE = 512
+SUMMARY_CACHE_DIR = None  # 예: "summary_cache" 로 지정하면 디스크에도 저장 (재시작 후 재사용)
+
+_summary_cache = TTLCache(maxsize=SUMMARY_CACHE_SIZE, ttl=None)
+_summary_disk_cache = None
+
+# 기사가 많으면 묶음별로 나눠 요약(map)한 뒤 합칩니다(reduce).
+SUMMARY_CHUNK_TOKENS = 6000  # 한 프롬프트에 넣을 기사 본문의 최대 토큰 수 (추정치)
+SUMMARY_MAP_WORKERS = 4  # 묶음 요약을 동시에 실행할 최대 개수
+SUMMARY_CHUNK_RETRIES = 2  # 묶음 하나가 실패했을 때 다시 시도할 횟수
+SUMMARY_RETRY_BACKOFF = 1.0  # 초
+
+_summary_executor = None
+_summary_executor_lock = threading.Lock()
+
+# 같은 주제를 다시 요약할 때 이전 요약에 새 기사만 반영합니다 (주제 = 정규화된 검색 키워드).
+INCREMENTAL_MIN_OVERLAP = 0.5  # 이전 기사와 겹치는 비율이 이보다 낮으면 전체를 다시 요약
+INCREMENTAL_MAX_CHAIN = 5  # 이어서 고친 횟수가 이만큼 쌓이면 전체를 다시 요약
+PREVIOUS_SUMMARY_SIZE = 256
+PREVIOUS_SUMMARY_TTL = 6 * 3600  # 초
+
+_previous_summaries = TTLCache(maxsize=PREVIOUS_SUMMARY_SIZE, ttl=PREVIOUS_SUMMARY_TTL)
+_summary_stats = {
+    "lookups": 0,
+    "memory_hits": 0,
+    "disk_hits": 0,
+    "chunks": 0,
+    "chunk_retries": 0,
+    "incremental": 0,
+}
+_summary_stats_lock = threading.Lock()
+
+# 스트리밍 응답의 첫 토큰까지 걸린 시간 (time-to-first-token)
+_stream_stats = {"streams": 0, "first_token_count": 0, "first_token_seconds": 0.0}
+_stream_stats_lock = threading.Lock()
+
+# 서버에 보관하는 검색 결과 (result_id 로 /summarize, /chat, /save 에서 재사용)
+RESULT_SET_MAX = 2000
+RESULT_SET_MAX_BYTES = 64 * 1024 * 1024
+RESULT_SET_TTL = 3600  # 초
+
+# 여러 번 주고받는 대화 (conversation_id 별 질문/답변 기록)
+CONVERSATION_MAX = 1000
+CONVERSATION_TTL = 1800  # 마지막 사용 후 초
+
+_conversations = TTLCache(maxsize=CONVERSATION_MAX, ttl=CONVERSATION_TTL)
+
+# 기사가 RETRIEVAL_TOP_K 개보다 많으면 질문과 관련된 기사만 골라 보냅니다.
+# 색인은 기사 목록 해시별로 만들어 두고 여러 대화에서 함께 사용합니다.
+RETRIEVAL_INDEX_CACHE_SIZE = 64
+_retrieval_indexes = TTLCache(maxsize=RETRIEVAL_INDEX_CACHE_SIZE, ttl=CONVERSATION_TTL)
+
+# 여러 키워드 동시 검색 (fetch_news_many) 설정
+BATCH_MAX_WORKERS = 8
+BATCH_MAX_KEYWORDS = 50
+BATCH_DEADLINE = 30  # 초
+
+_batch_executor = None
+_batch_executor_lock = threading.Lock()
+
+_saved_news_store = None
+_saved_news_store_lock = threading.Lock()
+
+# 피드 URL별 ETag / Last-Modified 와 마지막으로 파싱한 기사 목록 (조건부 GET 재검증용)
+FEED_VALIDATOR_CACHE_SIZE = 512
+
+_feed_validators = TTLCache(maxsize=FEED_VALIDATOR_CACHE_SIZE, ttl=None)
+_feed_stats = {
+    "downloads": 0,
+    "conditional_requests": 0,
+    "not_modified": 0,
+    "fast_parses": 0,  # news_rss 로 파싱
+    "feedparser_fallbacks": 0,  # 형식이 달라 feedparser 로 다시 파싱
+    # 기사 정리(HTML 제거 등) 전후의 제목+내용 토큰 수 (추정치)
+    "cleaned_articles": 0,
+    "raw_tokens": 0,
+    "clean_tokens": 0,
+}
+_feed_stats_lock = threading.Lock()
+
+
+class _ApiKeyStore:
+    """API 키를 메모리에 보관합니다.
+
+    파일은 처음 한 번만 읽고, 이후에는 API_KEY_CHECK_INTERVAL 마다 mtime 만
+    확인해서 외부에서 파일을 고친 경우에만 다시 읽습니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._path = None
+        self._value = ""
+        self._mtime = None
+        self._checked_at = 0.0
+
+    def get(self) -> str:
+        now = time.monotonic()
+        if self._path == API_KEY_FILE and (
+            API_KEY_CHECK_INTERVAL is None or now - self._checked_at < API_KEY_CHECK_INTERVAL
+        ):
+            return self._value
+
+        with self._lock:
+            if self._path != API_KEY_FILE or _file_mtime(API_KEY_FILE) != self._mtime:
+                self._load()
+            self._checked_at = now
+            return self._value
+
+    def set(self, api_key: str):
+        with self._lock:
+            self._update(API_KEY_FILE, api_key, _file_mtime(API_KEY_FILE))
+            self._checked_at = time.monotonic()
+
+    def _load(self):
+        value = ""
+        try:
+            if os.path.exists(API_KEY_FILE):
+                with open(API_KEY_FILE, "r", encoding="utf-8") as f:
+                    value = json.load(f).get("api_key", "")
+        except Exception:
+            value = ""
+        self._update(API_KEY_FILE, value, _file_mtime(API_KEY_FILE))
+
+    def _update(self, path, value, mtime):
+        if self._path is not None and value != self._value:
+            invalidate_gemini_models()
+        self._path, self._value, self._mtime = path, value, mtime
+
+
+def _file_mtime(path: str):
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+_api_key_store = _ApiKeyStore()
 
 
 def get_api_key():
     """저장된 API 키를 불러옵니다."""
-    try:
-        if os.path.exists(API_KEY_FILE):
-            with open(API_KEY_FILE, "r", encoding="utf-8") as f:
-                data = json.load(f)
-                return data.get("api_key", "")
-        return ""
-    except Exception:
-        return ""
+    return _api_key_store.get()
 
 
 def save_api_key(api_key: str):
@@ -35,11 +246,63 @@ def save_api_key(api_key: str):
     try:
         with open(API_KEY_FILE, "w", encoding="utf-8") as f:
             json.dump({"api_key": api_key}, f, ensure_ascii=False, indent=2)
+        _api_key_store.set(api_key)
         return True
     except Exception:
         return False
 
 
+_gemini_models = TTLCache(maxsize=GEMINI_MODEL_CACHE_SIZE, ttl=None)
+_gemini_models_lock = threading.Lock()
+
+
+def get_gemini_model(api_key: str, model_name: str = GEMINI_MODEL):
+    """API 키와 모델 이름별로 만들어 둔 GenerativeModel 을 재사용합니다."""
+    key = (api_key, model_name)
+    model = _gemini_models.get(key)
+    if model is not None:
+        return model
+
+    with _gemini_models_lock:
+        model = _gemini_models.get(key)
+        if model is None:
+            # genai.configure 는 프로세스 전역 설정이므로 잠금 안에서 호출하고,
+            # 만든 클라이언트를 모델에 바로 묶어 두어 다른 키로 다시 설정해도
+            # 이미 만든 모델은 영향을 받지 않도록 합니다.
+            # google-generativeai 0.3.2 의 GenerativeModel 은 키별 클라이언트를 받는 공개 인자가
+            # 없어 내부 속성(_client)에 넣습니다. 버전을 올릴 때 함께 확인하세요
+            # (requirements.txt 에 버전을 고정해 둠). 비동기 클라이언트는 만든 이벤트 루프에
+            # 묶이므로 news_async 가 공유 루프에서 따로 만듭니다.
+            genai.configure(api_key=api_key)
+            model = genai.GenerativeModel(model_name)
+            model._client = genai_client.get_default_generative_client()
+            _gemini_models.set(key, model)
+        return model
+
+
+def invalidate_gemini_models(api_key: str = None):
+    """캐시된 재미나이 모델을 버립니다. api_key 를 주면 그 키로 만든 모델만 버립니다."""
+    if api_key is None:
+        _gemini_models.clear()
+        return
+    for key in _gemini_models.keys():
+        if key[0] == api_key:
+            _gemini_models.delete(key)
+
+
+def _is_auth_error(error: Exception) -> bool:
+    """API 키가 잘못되었거나 권한이 없어 난 오류인지."""
+    if isinstance(error, (google_exceptions.Unauthenticated, google_exceptions.PermissionDenied)):
+        return True
+    return "API_KEY_INVALID" in str(error)
+
+
+def _forget_model_on_auth_error(api_key: str, error: Exception):
+    """인증 오류이면 그 키로 만든 모델을 캐시에서 버립니다 (다음 호출에서 새로 만듦)."""
+    if _is_auth_error(error):
+        invalidate_gemini_models(api_key)
+
+
 def validate_api_key(api_key: str) -> dict:
     """API 키 유효성을 검증합니다."""
     if not api_key or not api_key.strip():
@@ -61,8 +324,7 @@ def validate_api_key(api_key: str) -> dict:
     
     # 실제 API 호출로 검증
     try:
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel("gemini-2.5-flash")
+        model = get_gemini_model(api_key)
         # 간단한 테스트 요청
         response = model.generate_content("테스트")
         if response:
@@ -74,6 +336,7 @@ def validate_api_key(api_key: str) -> dict:
     except Exception as e:
         error_str = str(e)
         if "API_KEY_INVALID" in error_str or "invalid" in error_str.lower():
+            invalidate_gemini_models(api_key)
             return {
                 "valid": False,
                 "message": "❌ API 키가 유효하지 않습니다.",
@@ -99,36 +362,308 @@ def validate_api_key(api_key: str) -> dict:
     }
 
 
-def fetch_news(keyword: str, max_results: int = 10):
-    """Fetch news from Google News RSS for the given keyword."""
+def _copy_result(result: dict) -> dict:
+    """Return a copy so callers can annotate articles without touching the cache."""
+    return {
+        "error": False,
+        "articles": [dict(article) for article in result.get("articles", [])],
+    }
+
+
+def fetch_news(keyword: str, max_results: int = 10, use_cache: bool = True):
+    """Fetch news from Google News RSS for the given keyword.
+
+    Successful results are cached by normalized keyword and max_results.
+    With SWR_ENABLED, an expired entry is returned immediately and refreshed
+    in the background. Pass use_cache=False to skip the cache lookup and
+    force a fresh fetch.
+    """
+    if use_cache:
+        cached = _cached_news(keyword, max_results)
+        if cached is not None:
+            return cached
+
+    result = _refresh_news(keyword, max_results)
+    if result.get("error"):
+        return result
+    return _copy_result(result)
+
+
+def _cached_news(keyword: str, max_results: int):
+    """Return a copy of the cached result, or None if it must be downloaded.
+
+    Stale entries are returned as-is (and refreshed in the background) when
+    SWR_ENABLED is set.
+    """
+    cache_key = (normalize_keyword(keyword), max_results)
+    _hot_keywords.record(cache_key, keyword, max_results)
+    cached = _news_cache.get_stale(cache_key)
+    if cached is None:
+        return None
+
+    result, fresh = cached
+    if fresh:
+        return _copy_result(result)
+    if SWR_ENABLED:
+        _refresher.submit(cache_key, _refresh_news, keyword, max_results)
+        return _copy_result(result)
+    return None
+
+
+def _get_batch_executor():
+    global _batch_executor
+    with _batch_executor_lock:
+        if _batch_executor is None:
+            _batch_executor = ThreadPoolExecutor(
+                max_workers=BATCH_MAX_WORKERS, thread_name_prefix="news-batch"
+            )
+        return _batch_executor
+
+
+def fetch_news_many(keywords, max_results: int = 10, use_cache: bool = True, deadline: float = BATCH_DEADLINE):
+    """여러 키워드의 뉴스를 동시에 가져옵니다.
+
+    결과는 {"error": False, "results": {키워드: fetch_news 결과}, "duplicates": {...}} 형태입니다.
+    정규화했을 때 같은 키워드("AI", " ai ")는 한 번만 가져오지만 results 에는 요청한
+    키워드마다(앞뒤 공백 제거) 같은 결과의 사본이 들어갑니다.
+    키워드별 오류는 해당 키워드의 결과에만 담기고, deadline 초 안에 끝나지 않은
+    키워드는 시간 초과 오류로 표시됩니다. 이미 시작된 다운로드는 멈출 수 없으므로
+    응답 뒤에도 끝까지 실행되어 결과를 캐시에 넣으며, 그동안 배치 전용 스레드 풀
+    (BATCH_MAX_WORKERS 개, 검색/요약 풀과는 별도)의 자리를 차지합니다.
+    여러 키워드에 함께 나온 기사에는 "duplicate": True 와 "also_in" (다른 키워드 목록) 이 붙습니다.
+    """
+    # 정규화했을 때 같은 키워드는 한 번만 가져옵니다 (대표 키워드 = 처음 나온 표기).
+    unique = {}
+    requested = []
+    for keyword in keywords:
+        keyword = (keyword or "").strip()
+        if keyword:
+            unique.setdefault(normalize_keyword(keyword), keyword)
+            if keyword not in requested:
+                requested.append(keyword)
+
+    executor = _get_batch_executor()
+    futures = {
+        keyword: executor.submit(fetch_news, keyword, max_results, use_cache)
+        for keyword in unique.values()
+    }
+    done, _ = wait(futures.values(), timeout=deadline)
+
+    results = {}
+    for keyword, future in futures.items():
+        if future not in done:
+            future.cancel()
+            results[keyword] = {
+                "error": True,
+                "message": "네트워크 요청 시간이 초과되었습니다.",
+                "details": f"{deadline}초 안에 뉴스를 가져오지 못했습니다. 잠시 후 다시 시도해주세요."
+            }
+            continue
+        try:
+            results[keyword] = future.result()
+        except Exception as e:
+            results[keyword] = _request_error(e)
+
+    duplicates = _flag_duplicates(results)
+    # 다른 표기로 요청한 키워드에는 대표 키워드 결과의 사본을 넣습니다.
+    for keyword in requested:
+        if keyword not in results:
+            shared = dict(results[unique[normalize_keyword(keyword)]])
+            if "articles" in shared:
+                shared["articles"] = [dict(article) for article in shared["articles"]]
+            results[keyword] = shared
+    return {
+        "error": False,
+        "results": {keyword: results[keyword] for keyword in requested},
+        "duplicates": duplicates,
+    }
+
+
+def _flag_duplicates(results: dict) -> dict:
+    """여러 키워드 결과에 함께 나온 기사를 표시하고 {링크: [키워드, ...]} 를 반환합니다.
+
+    링크는 news_dedup.canonical_link 로 정규화해서 비교합니다 (추적 파라미터 차이 등 무시).
+    """
+    seen = {}
+    for keyword, result in results.items():
+        for article in result.get("articles", []):
+            key = canonical_link(article.get("link")) or article.get("title")
+            if key and keyword not in seen.setdefault(key, []):
+                seen[key].append(keyword)
+
+    duplicates = {key: kws for key, kws in seen.items() if len(kws) > 1}
+    for keyword, result in results.items():
+        for article in result.get("articles", []):
+            kws = duplicates.get(canonical_link(article.get("link")) or article.get("title"))
+            if kws:
+                article["duplicate"] = True
+                article["also_in"] = [kw for kw in kws if kw != keyword]
+    return duplicates
+
+
+def _refresh_news(keyword: str, max_results: int):
+    """Download the feed and store a successful result in the cache.
+
+    Concurrent refreshes of the same keyword share one download.
+    """
+    cache_key = (normalize_keyword(keyword), max_results)
+    return _news_flight.do(cache_key, _download_and_cache, cache_key, keyword, max_results)
+
+
+def _download_and_cache(cache_key, keyword: str, max_results: int):
+    result = _download_news(keyword, max_results)
+    if not result.get("error"):
+        _news_cache.set(cache_key, result)
+    return result
+
+
+def clear_news_cache():
+    """검색 결과 캐시를 비웁니다."""
+    _news_cache.clear()
+
+
+def _refresh_hot_keywords():
+    """인기 키워드 중 곧 만료되는 결과를 미리 갱신합니다."""
+    for cache_key, args in _hot_keywords.top(HOT_KEYWORD_COUNT):
+        remaining = _news_cache.expires_in(cache_key)
+        if remaining is None or remaining < HOT_REFRESH_LEAD:
+            _refresher.submit(cache_key, _refresh_news, *args)
+    _hot_keywords.decay()
+
+
+def start_background_refresh():
+    """인기 키워드 사전 갱신 스케줄러를 시작합니다 (웹 서버에서 호출)."""
+    global _hot_refresh_task
+    if _hot_refresh_task is None:
+        _hot_refresh_task = PeriodicTask(
+            HOT_REFRESH_INTERVAL, _refresh_hot_keywords, name="hot-keyword-refresh"
+        )
+    _hot_refresh_task.start()
+
+
+def stop_background_refresh():
+    """스케줄러와 백그라운드 갱신 작업을 멈춥니다."""
+    if _hot_refresh_task is not None:
+        _hot_refresh_task.stop(timeout=5)
+    _refresher.shutdown()
+
+
+def check_readiness() -> dict:
+    """요청을 받을 준비가 되었는지 확인합니다 (/readyz 용).
+
+    저장소는 처음 사용할 때 열리고 예전 기록을 옮기므로, 여기서 미리 열어 두면
+    첫 요청이 그 비용을 치르지 않습니다.
+    """
+    checks = {}
+    try:
+        _get_saved_news_store()
+        checks["saved_news"] = "ok"
+    except Exception as e:
+        checks["saved_news"] = f"error: {e}"
+    return {"ready": all(value == "ok" for value in checks.values()), "checks": checks}
+
+
+def shutdown():
+    """서버 종료 시 백그라운드 갱신, 요약 스레드 풀, HTTP 세션, 저장소 연결을 정리합니다.
+
+    news_async 를 사용했으면 그 이벤트 루프와 aiohttp 커넥션 풀도 닫습니다.
+    """
+    global _summary_executor
+    stop_background_refresh()
+    with _summary_executor_lock:
+        executor, _summary_executor = _summary_executor, None
+    if executor is not None:
+        executor.shutdown(wait=False, cancel_futures=True)
+    close_session()
+    # news_async 가 news_chatbot 을 import 하므로 여기서는 이미 불러온 경우에만 정리합니다.
+    news_async = sys.modules.get("news_async")
+    if news_async is not None:
+        news_async.shutdown()
+    if _saved_news_store is not None:
+        _saved_news_store.close()
+
+
+def _count_feed_stat(name: str, amount: int = 1):
+    with _feed_stats_lock:
+        _feed_stats[name] += amount
+
+
+def _conditional_headers(url: str, max_results: int):
+    """Return (headers, stored) for revalidating a previously downloaded feed.
+
+    Validators are only sent when the stored article list covers max_results,
+    otherwise a 304 would leave us without enough parsed articles.
+    """
+    stored = _feed_validators.get(url)
+    if stored is None or stored["max_results"] < max_results:
+        return {}, None
+
+    headers = {}
+    if stored.get("etag"):
+        headers["If-None-Match"] = stored["etag"]
+    if stored.get("last_modified"):
+        headers["If-Modified-Since"] = stored["last_modified"]
+    if headers:
+        _count_feed_stat("conditional_requests")
+    return headers, stored
+
+
+def _download_news(keyword: str, max_results: int):
+    """Download and parse the Google News RSS feed (no result caching)."""
     query = urllib.parse.quote(keyword)
     url = GOOGLE_NEWS_SEARCH_RSS.format(query=query)
+    request_headers, stored = _conditional_headers(url, max_results)
 
     try:
-        # Use requests so we can handle HTTP errors explicitly
-        resp = requests.get(url, timeout=15)
+        # Shared keep-alive session (connection pool + retry), see news_http.py
+        resp = http_get(url, headers=request_headers or None)
         resp.raise_for_status()
     except requests.exceptions.Timeout:
-        return {
-            "error": True,
-            "message": "네트워크 요청 시간이 초과되었습니다.",
-            "details": "인터넷 연결을 확인하거나 잠시 후 다시 시도해주세요."
-        }
+        return _timeout_error()
     except requests.exceptions.ConnectionError:
-        return {
-            "error": True,
-            "message": "인터넷 연결에 실패했습니다.",
-            "details": "인터넷 연결 상태를 확인해주세요."
-        }
+        return _connection_error()
     except requests.RequestException as e:
-        return {
-            "error": True,
-            "message": f"뉴스를 불러오는 중 오류가 발생했습니다: {str(e)}",
-            "details": "네트워크 연결을 확인하거나 잠시 후 다시 시도해주세요."
-        }
+        return _request_error(e)
+
+    return _handle_feed_response(
+        url, max_results, resp.status_code, resp.headers, resp.content, stored
+    )
+
+
+def _timeout_error() -> dict:
+    return {
+        "error": True,
+        "message": "네트워크 요청 시간이 초과되었습니다.",
+        "details": "인터넷 연결을 확인하거나 잠시 후 다시 시도해주세요."
+    }
+
+
+def _connection_error() -> dict:
+    return {
+        "error": True,
+        "message": "인터넷 연결에 실패했습니다.",
+        "details": "인터넷 연결 상태를 확인해주세요."
+    }
 
+
+def _request_error(e: Exception) -> dict:
+    return {
+        "error": True,
+        "message": f"뉴스를 불러오는 중 오류가 발생했습니다: {str(e)}",
+        "details": "네트워크 연결을 확인하거나 잠시 후 다시 시도해주세요."
+    }
+
+
+def _handle_feed_response(url, max_results, status_code, headers, content, stored):
+    """Turn a successful (2xx/304) feed response into a result dict."""
+    if status_code == 304 and stored is not None:
+        # Not modified: reuse the articles parsed last time, skip feedparser.
+        _count_feed_stat("not_modified")
+        return {"error": False, "articles": stored["articles"][:max_results]}
+
+    _count_feed_stat("downloads")
     try:
-        feed = feedparser.parse(resp.content)
+        entries = _parse_feed(content, max_results)
     except Exception as e:
         return {
             "error": True,
@@ -136,20 +671,56 @@ def fetch_news(keyword: str, max_results: int = 10):
             "details": str(e)
         }
 
+    articles = _parse_entries(entries)
+
+    etag = headers.get("ETag")
+    last_modified = headers.get("Last-Modified")
+    if etag or last_modified:
+        _feed_validators.set(
+            url,
+            {
+                "etag": etag,
+                "last_modified": last_modified,
+                "max_results": max_results,
+                "articles": articles,
+            },
+        )
+
+    return {"error": False, "articles": articles}
+
+
+def _parse_feed(content: bytes, max_results: int) -> list:
+    """앞의 max_results 개 RSS 항목. Google 뉴스 RSS 는 news_rss 로 필요한 만큼만 읽고,
+    형식이 다르면(Atom, 깨진 XML 등) feedparser 로 전체를 파싱합니다."""
+    if FAST_RSS_PARSER:
+        try:
+            entries = parse_rss_items(content, max_results)
+            _count_feed_stat("fast_parses")
+            return entries
+        except RssFormatError:
+            _count_feed_stat("feedparser_fallbacks")
+    return feedparser.parse(content).entries[:max_results]
+
+
+def _parse_entries(entries: list) -> list:
     articles = []
-    for entry in feed.entries[:max_results]:
-        title = entry.get("title", "(제목 없음)")
+    raw_tokens = clean_tokens = 0
+    for entry in entries:
+        raw_title = entry.get("title", "(제목 없음)")
+        raw_summary = entry.get("summary", "") or entry.get("description", "")
+        title, summary, source = _clean_entry_text(raw_title, raw_summary, entry.get("source"))
+        raw_tokens += estimate_tokens(raw_title) + estimate_tokens(raw_summary)
+        clean_tokens += estimate_tokens(title) + estimate_tokens(summary)
         link = entry.get("link", "")
-        summary = entry.get("summary", "") or entry.get("description", "")
         published = entry.get("published", "")
 
         # Try to parse date to a nicer format
         published_str = published
         if published:
             try:
-                # feedparser returns a structured time in published_parsed
-                if hasattr(entry, "published_parsed") and entry.published_parsed:
-                    dt = datetime(*entry.published_parsed[:6])
+                # feedparser / news_rss return a structured time in published_parsed
+                if entry.get("published_parsed"):
+                    dt = datetime(*entry["published_parsed"][:6])
                     published_str = dt.strftime("%Y-%m-%d %H:%M")
             except Exception:
                 # Fallback to raw string
@@ -161,132 +732,806 @@ def fetch_news(keyword: str, max_results: int = 10):
                 "link": link,
                 "summary": summary,
                 "published": published_str,
+                "source": source,
             }
         )
+    _count_feed_stat("cleaned_articles", len(articles))
+    _count_feed_stat("raw_tokens", raw_tokens)
+    _count_feed_stat("clean_tokens", clean_tokens)
+    return articles
 
-    return {"error": False, "articles": articles}
+
+# Google 뉴스 내용에서 기사마다 붙는 언론사 표시 (<font color="#6f6f6f">언론사</font>)
+_SOURCE_LABEL_RE = re.compile(r"<font\b[^>]*>.*?</font>", re.IGNORECASE | re.DOTALL)
+
+
+def _clean_entry_text(title: str, summary: str, source) -> tuple:
+    """RSS 항목의 제목/내용을 글자로 정리하고 (제목, 내용, 언론사) 를 반환합니다.
+
+    Google 뉴스의 내용은 "<a href=...>제목</a>&nbsp;<font>언론사</font>" 같은 HTML 이고
+    제목 끝에도 " - 언론사" 가 붙어 있으므로, 내용은 태그와 엔티티를 지우고 공백을 줄인 뒤
+    끝의 언론사 이름을 떼어 source 에 따로 담습니다. 제목과 언론사 이름은 HTML 이 아니므로
+    ("<작품명>" 이 자주 들어 있음) 엔티티만 풉니다. 결과는 기사와 함께 캐시되므로
+    기사마다 한 번만 정리합니다.
+    """
+    source = plain_text(source.get("title", "")) if isinstance(source, dict) else ""
+    title = plain_text(title) or "(제목 없음)"
+    summary = html_to_text(_SOURCE_LABEL_RE.sub(" ", summary))
+    if source:
+        title = strip_source_suffix(title, source)
+        summary = strip_source_suffix(summary, source)
+    return title, summary, source
+
+
+def _result_set_size(result_set: dict) -> int:
+    return result_set["bytes"]
+
+
+_result_sets = TTLCache(
+    maxsize=RESULT_SET_MAX,
+    ttl=RESULT_SET_TTL,
+    max_weight=RESULT_SET_MAX_BYTES,
+    weigher=_result_set_size,
+)
+
+
+def create_result_set(keyword: str, articles: list) -> str:
+    """검색 결과를 서버에 보관하고 이후 요청에서 쓸 result_id 를 반환합니다."""
+    result_id = secrets.token_urlsafe(16)
+    size = len(json.dumps(articles, ensure_ascii=False).encode("utf-8"))
+    _result_sets.set(
+        result_id,
+        {
+            "keyword": keyword,
+            "articles": articles,
+            "created": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "bytes": size,
+        },
+    )
+    return result_id
+
+
+def get_result_set(result_id: str):
+    """보관 중인 검색 결과를 반환합니다. 만료되었거나 없으면 None."""
+    if not result_id:
+        return None
+    return _result_sets.get(result_id)
+
+
+def get_runtime_stats() -> dict:
+    """캐시/커넥션 풀 등 런타임 통계를 반환합니다."""
+    return {
+        "http": get_pool_stats(),
+        "news_cache": _news_cache.stats(),
+        "feeds": dict(
+            _feed_stats,
+            validators=len(_feed_validators),
+            tokens_saved=_feed_stats["raw_tokens"] - _feed_stats["clean_tokens"],
+        ),
+        "gemini_models": _gemini_models.stats(),
+        "summary_cache": _summary_cache_stats(),
+        "previous_summaries": _previous_summaries.stats(),
+        "result_sets": _result_sets.stats(),
+        "conversations": _conversations.stats(),
+        "saved_news": _saved_news_store.stats() if _saved_news_store is not None else None,
+        "retrieval_indexes": _retrieval_indexes.stats(),
+        "streaming": _streaming_stats(),
+        "single_flight": {
+            "news": _news_flight.stats(),
+            "gemini": _gemini_flight.stats(),
+        },
+        "background_refresh": dict(
+            _refresher.stats(),
+            scheduler_running=bool(_hot_refresh_task and _hot_refresh_task.running),
+            tracked_keywords=len(_hot_keywords),
+        ),
+    }
+
+
+def _normalize_text(text) -> str:
+    return " ".join(unicodedata.normalize("NFC", str(text or "")).split())
+
+
+def _articles_fingerprint(articles: list, fields, *extra) -> str:
+    """기사 목록에서 지정한 필드(공백/유니코드 정규화)로 안정적인 해시를 만듭니다."""
+    payload = [list(extra)]
+    payload += [[_normalize_text(article.get(field)) for field in fields] for article in articles]
+    data = json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def _get_summary_disk_cache():
+    global _summary_disk_cache
+    if not SUMMARY_CACHE_DIR:
+        return None
+    if _summary_disk_cache is None or _summary_disk_cache.directory != SUMMARY_CACHE_DIR:
+        _summary_disk_cache = DiskCache(SUMMARY_CACHE_DIR)
+    return _summary_disk_cache
+
+
+def _count_summary_stat(name: str):
+    with _summary_stats_lock:
+        _summary_stats[name] += 1
+
+
+def _lookup_summary(cache_key: str):
+    """메모리 → 디스크 순서로 캐시된 요약을 찾습니다."""
+    _count_summary_stat("lookups")
+    summary = _summary_cache.get(cache_key)
+    if summary is not None:
+        _count_summary_stat("memory_hits")
+        return summary
+
+    disk = _get_summary_disk_cache()
+    if disk is not None:
+        entry = disk.get(cache_key)
+        if entry is not None:
+            _count_summary_stat("disk_hits")
+            _summary_cache.set(cache_key, entry["summary"])
+            return entry["summary"]
+    return None
+
+
+def _store_summary(cache_key: str, summary: str):
+    _summary_cache.set(cache_key, summary)
+    disk = _get_summary_disk_cache()
+    if disk is not None:
+        disk.set(
+            cache_key,
+            {
+                "summary": summary,
+                "model": GEMINI_MODEL,
+                "prompt_version": SUMMARY_PROMPT_VERSION,
+                "created": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            },
+        )
+
+
+def _summary_cache_stats() -> dict:
+    lookups = _summary_stats["lookups"]
+    hits = _summary_stats["memory_hits"] + _summary_stats["disk_hits"]
+    disk = _get_summary_disk_cache()
+    return dict(
+        _summary_stats,
+        hit_rate=round(hits / lookups, 4) if lookups else 0.0,
+        memory=_summary_cache.stats(),
+        disk=disk.stats() if disk is not None else None,
+    )
+
+
+def summarize_with_gemini(articles: list, progress=None, topic: str = None) -> dict:
+    """재미나이 API를 사용하여 뉴스 기사들을 요약합니다.
+
+    기사가 많으면 묶음별로 나눠 요약한 뒤 합칩니다. progress 를 주면 진행 상황을
+    {"stage": "map", "level", "done", "total"} / {"stage": "reduce"} 형태로 넘겨 줍니다.
+    topic(검색 키워드)을 주면 같은 주제의 이전 요약에 새로 들어온 기사만 반영합니다.
+    여러 언론사에 실린 같은 기사는 하나만 프롬프트에 넣습니다.
+    """
+    api_key, articles, result = _summary_request(articles, topic)
+    if result is not None:
+        return result
+    return dict(
+        _gemini_flight.do(
+            _summary_flight_key(articles, topic), _generate_summary, api_key, articles, progress, topic
+        )
+    )
 
 
-def summarize_with_gemini(articles: list) -> dict:
-    """재미나이 API를 사용하여 뉴스 기사들을 요약합니다."""
+def _summary_request(articles: list, topic):
+    """요약 요청을 확인합니다: (api_key, 중복을 뺀 기사, 바로 돌려줄 결과 또는 None)."""
     api_key = get_api_key()
     if not api_key:
-        return {
-            "error": True,
-            "message": "API 키가 설정되지 않았습니다.",
-            "details": "상단에서 재미나이 API 키를 입력하고 검증해주세요."
-        }
+        return api_key, articles, _no_api_key_error()
 
     if not articles:
-        return {
+        return api_key, articles, {
             "error": True,
             "message": "요약할 뉴스가 없습니다."
         }
+    articles = dedupe_articles(articles)
+
+    # 같은 기사 묶음은 캐시된 요약을 그대로 사용합니다.
+    cached = _cached_summary(articles, topic)
+    if cached is not None:
+        _remember_summary(topic, articles, cached)
+        return api_key, articles, {"error": False, "summary": cached, "cached": True}
+    return api_key, articles, None
+
+
+def _summary_flight_key(articles: list, topic) -> tuple:
+    # 같은 기사 묶음·같은 주제에 대한 동시 요약 요청은 한 번만 생성합니다. 주제마다 이어서
+    # 쓸 이전 요약이 다르므로 주제가 다르면 따로 생성합니다.
+    return ("summary", _summary_cache_key(articles), normalize_keyword(topic) if topic else None)
+
+
+def _no_api_key_error() -> dict:
+    return {
+        "error": True,
+        "message": "API 키가 설정되지 않았습니다.",
+        "details": "상단에서 재미나이 API 키를 입력하고 검증해주세요."
+    }
 
-    try:
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel("gemini-2.5-flash")
 
-        # 뉴스 기사들을 텍스트로 정리
-        news_text = "다음은 수집한 뉴스 기사들입니다:\n\n"
-        for idx, article in enumerate(articles, 1):
-            title = article.get("title", "")
-            summary = article.get("summary", "")
-            news_text += f"[기사 {idx}]\n제목: {title}\n내용: {summary}\n\n"
+def _summary_cache_key(articles: list, topic=None) -> str:
+    """요약 캐시 키. 이전 요약에 이어서 쓴 요약은 주제(topic)를 넣은 키에 따로 저장합니다."""
+    extra = (normalize_keyword(topic),) if topic else ()
+    return _articles_fingerprint(
+        articles, ("title", "summary"), SUMMARY_PROMPT_VERSION, GEMINI_MODEL, *extra
+    )
+
+
+def _cached_summary(articles: list, topic):
+    """전체 요약 캐시를 찾고, 없으면 이 주제의 이전 요약에 이어서 쓴 요약을 찾습니다."""
+    cached = _lookup_summary(_summary_cache_key(articles))
+    if cached is None and topic:
+        cached = _lookup_summary(_summary_cache_key(articles, topic))
+    return cached
+
+
+def _store_planned_summary(articles: list, topic, plan: dict, summary: str):
+    """생성한 요약을 캐시에 저장하고 이 주제의 이전 요약으로 기억합니다."""
+    _store_summary(_summary_cache_key(articles, topic if plan["incremental"] else None), summary)
+    _remember_summary(topic, articles, summary, plan["chain"])
+
 
-        prompt = f"""다음 뉴스 기사들을 읽고 전체적인 요약을 한국어로 작성해주세요.
+def _summary_blocks(articles: list) -> list:
+    blocks = []
+    for idx, article in enumerate(articles, 1):
+        title = article.get("title", "")
+        summary = article.get("summary", "")
+        blocks.append(f"[기사 {idx}]\n제목: {title}\n내용: {summary}\n\n")
+    return blocks
+
+
+def _build_summary_prompt(articles: list) -> str:
+    # 뉴스 기사들을 텍스트로 정리
+    news_text = "다음은 수집한 뉴스 기사들입니다:\n\n" + "".join(_summary_blocks(articles))
+
+    return f"""다음 뉴스 기사들을 읽고 전체적인 요약을 한국어로 작성해주세요.
 요약은 3-5문장 정도로 간결하게 작성하고, 주요 내용과 핵심 포인트를 포함해주세요.
 
 {news_text}
 
 요약:"""
 
-        response = model.generate_content(prompt)
-        return {
-            "error": False,
-            "summary": response.text.strip()
-        }
+
+def _build_chunk_prompt(blocks: list) -> str:
+    return f"""다음은 전체 뉴스 중 일부입니다. 이 부분의 핵심 사실과 주요 흐름을 한국어로 5문장 이내로 정리해주세요.
+나중에 다른 부분의 정리와 합쳐 전체 요약을 만들 예정이니, 중요한 이름/숫자/날짜는 빠뜨리지 마세요.
+
+{"".join(blocks)}
+
+정리:"""
+
+
+def _build_reduce_prompt(blocks: list) -> str:
+    return f"""다음은 많은 뉴스 기사를 여러 묶음으로 나누어 각각 정리한 내용입니다.
+이를 종합해 전체적인 요약을 한국어로 작성해주세요.
+요약은 3-5문장 정도로 간결하게 작성하고, 주요 내용과 핵심 포인트를 포함해주세요.
+
+{"".join(blocks)}
+
+요약:"""
+
+
+def _fits_one_prompt(articles: list) -> bool:
+    """기사들이 나눠 요약(map-reduce)하지 않고 한 프롬프트에 들어가는지."""
+    return sum(estimate_tokens(block) for block in _summary_blocks(articles)) <= SUMMARY_CHUNK_TOKENS
+
+
+def _pack_blocks(blocks: list, token_budget: int) -> list:
+    """블록들을 순서대로 token_budget 이하의 묶음으로 나눕니다."""
+    chunks, current, used = [], [], 0
+    for block in blocks:
+        tokens = estimate_tokens(block)
+        if current and used + tokens > token_budget:
+            chunks.append(current)
+            current, used = [], 0
+        current.append(block)
+        used += tokens
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _final_summary_prompt(model, articles: list, progress=None) -> str:
+    """최종 요약 프롬프트를 만듭니다.
+
+    기사가 한 프롬프트(SUMMARY_CHUNK_TOKENS)에 들어가면 예전처럼 한 번에 요약합니다.
+    넘치면 묶음별 요약(map)을 동시에 만들고, 그 정리들로 최종 요약(reduce) 프롬프트를
+    만듭니다. 정리들도 넘치면 한 단계 더 묶어서 정리합니다.
+    """
+    blocks = _summary_blocks(articles)
+    level = 0
+    while sum(estimate_tokens(block) for block in blocks) > SUMMARY_CHUNK_TOKENS:
+        chunks = _pack_blocks(blocks, SUMMARY_CHUNK_TOKENS)
+        partials = _map_summaries(model, chunks, level, progress)
+        blocks = [f"[묶음 {idx}]\n{partial}\n\n" for idx, partial in enumerate(partials, 1)]
+        level += 1
+
+    if level == 0:
+        return _build_summary_prompt(articles)
+    if progress is not None:
+        progress({"stage": "reduce"})
+    return _build_reduce_prompt(blocks)
+
+
+def _map_summaries(model, chunks: list, level: int, progress=None) -> list:
+    """묶음별 요약을 SUMMARY_MAP_WORKERS 개까지 동시에 만듭니다. 결과는 묶음 순서대로."""
+    total = len(chunks)
+    if progress is not None:
+        progress({"stage": "map", "level": level, "done": 0, "total": total})
+
+    futures = [_get_summary_executor().submit(_summarize_chunk, model, chunk) for chunk in chunks]
+    try:
+        for done, future in enumerate(as_completed(futures), 1):
+            future.result()
+            if progress is not None:
+                progress({"stage": "map", "level": level, "done": done, "total": total})
+    except Exception:
+        for future in futures:
+            future.cancel()
+        raise
+    return [future.result() for future in futures]
+
+
+def _summarize_chunk(model, blocks: list) -> str:
+    # 묶음별 요약도 캐시해 두므로, 일부 묶음이 실패해 다시 요청하면 실패한 묶음만 새로 만듭니다.
+    payload = json.dumps([SUMMARY_PROMPT_VERSION, GEMINI_MODEL, "map", blocks], ensure_ascii=False)
+    cache_key = hashlib.sha256(payload.encode("utf-8")).hexdigest()
+    cached = _lookup_summary(cache_key)
+    if cached is not None:
+        return cached
+
+    prompt = _build_chunk_prompt(blocks)
+    for attempt in range(SUMMARY_CHUNK_RETRIES + 1):
+        if attempt:
+            _count_summary_stat("chunk_retries")
+            time.sleep(SUMMARY_RETRY_BACKOFF * (2 ** (attempt - 1)))
+        try:
+            partial = model.generate_content(prompt).text.strip()
+            break
+        except Exception:
+            if attempt == SUMMARY_CHUNK_RETRIES:
+                raise
+    _count_summary_stat("chunks")
+    _store_summary(cache_key, partial)
+    return partial
+
+
+def _get_summary_executor():
+    global _summary_executor
+    with _summary_executor_lock:
+        if _summary_executor is None:
+            _summary_executor = ThreadPoolExecutor(
+                max_workers=SUMMARY_MAP_WORKERS, thread_name_prefix="news-summary"
+            )
+        return _summary_executor
+
+
+def _article_identity(article: dict) -> str:
+    """기사 비교용 식별자: 링크가 있으면 링크, 없으면 정규화한 제목의 해시."""
+    link = (article.get("link") or "").strip()
+    if link:
+        return link
+    title = _normalize_text(article.get("title")).casefold()
+    return "title:" + hashlib.sha1(title.encode("utf-8")).hexdigest()
+
+
+def _incremental_plan(articles: list, topic):
+    """이전 요약을 이어서 쓸 수 있으면 {"previous", "new_articles", "chain"} 을, 아니면 None 을 반환합니다.
+
+    같은 주제(정규화된 키워드)의 이전 기사 목록과 겹치는 비율이 INCREMENTAL_MIN_OVERLAP
+    이상이어야 하고, 새 기사가 한 프롬프트에 들어가야 하며, 이어서 고친 횟수가
+    INCREMENTAL_MAX_CHAIN 을 넘지 않아야 합니다 (넘으면 전체를 다시 요약해 내용이 흐려지는 것을 막음).
+    """
+    if not topic:
+        return None
+    previous = _previous_summaries.get(normalize_keyword(topic))
+    if previous is None or previous["chain"] >= INCREMENTAL_MAX_CHAIN:
+        return None
+
+    known = previous["ids"]
+    identities = [_article_identity(article) for article in articles]
+    overlap = sum(1 for identity in identities if identity in known) / len(identities)
+    if overlap < INCREMENTAL_MIN_OVERLAP:
+        return None
+
+    new_articles = [a for a, identity in zip(articles, identities) if identity not in known]
+    if sum(estimate_tokens(block) for block in _summary_blocks(new_articles)) > SUMMARY_CHUNK_TOKENS:
+        return None
+    return {"previous": previous["summary"], "new_articles": new_articles, "chain": previous["chain"] + 1}
+
+
+def _remember_summary(topic, articles: list, summary: str, chain: int = 0):
+    if topic:
+        _previous_summaries.set(
+            normalize_keyword(topic),
+            {
+                "summary": summary,
+                "ids": frozenset(_article_identity(article) for article in articles),
+                "chain": chain,
+            },
+        )
+
+
+def _build_incremental_prompt(previous: str, new_articles: list) -> str:
+    return f"""다음은 같은 주제의 뉴스에 대해 이전에 작성한 요약입니다.
+
+[이전 요약]
+{previous}
+
+그 뒤로 새로 들어온 기사들입니다:
+
+{"".join(_summary_blocks(new_articles))}
+
+이전 요약에 새 기사의 내용을 반영해 전체적인 요약을 한국어로 다시 작성해주세요.
+요약은 3-5문장 정도로 간결하게 작성하고, 새로운 소식이 중요하면 앞쪽에 배치해주세요.
+
+요약:"""
+
+
+def _summary_prompt_plan(model, articles: list, topic, progress=None) -> dict:
+    """요약 방식을 정합니다: {"prompt", "incremental", "new_articles", "chain"}.
+
+    이전 요약을 이어서 쓸 수 있는데 새 기사가 없으면 prompt 대신 "summary" 에
+    이전 요약을 그대로 담아 반환합니다 (재미나이 호출 없음).
+    """
+    plan = _incremental_plan(articles, topic)
+    if plan is None:
+        prompt = _final_summary_prompt(model, articles, progress)
+        return {"prompt": prompt, "incremental": False, "new_articles": len(articles), "chain": 0}
+
+    _count_summary_stat("incremental")
+    result = {"incremental": True, "new_articles": len(plan["new_articles"]), "chain": plan["chain"]}
+    if not plan["new_articles"]:
+        return dict(result, prompt=None, summary=plan["previous"], chain=plan["chain"] - 1)
+    return dict(result, prompt=_build_incremental_prompt(plan["previous"], plan["new_articles"]))
+
+
+def _generate_summary(api_key: str, articles: list, progress=None, topic=None) -> dict:
+    try:
+        model = get_gemini_model(api_key)
+        plan = _summary_prompt_plan(model, articles, topic, progress)
+        if plan["prompt"] is None:
+            summary = plan["summary"]
+        else:
+            summary = model.generate_content(plan["prompt"]).text.strip()
+        _store_planned_summary(articles, topic, plan, summary)
+        return _summary_result(plan, summary)
     except Exception as e:
-        return {
-            "error": True,
-            "message": f"요약 생성 중 오류가 발생했습니다: {str(e)}",
-            "details": "API 키가 유효한지 확인하거나 잠시 후 다시 시도해주세요."
-        }
+        return _generation_error(api_key, e, "요약")
+
+
+def _summary_result(plan: dict, summary: str) -> dict:
+    return {
+        "error": False,
+        "summary": summary,
+        "incremental": plan["incremental"],
+        "new_articles": plan["new_articles"],
+    }
+
+
+def _generation_error(api_key: str, error: Exception, action: str) -> dict:
+    """재미나이 생성 실패 응답. 인증 오류이면 그 키의 모델을 캐시에서 버립니다."""
+    _forget_model_on_auth_error(api_key, error)
+    return {
+        "error": True,
+        "message": f"{action} 생성 중 오류가 발생했습니다: {str(error)}",
+        "details": "API 키가 유효한지 확인하거나 잠시 후 다시 시도해주세요."
+    }
+
+
+def chat_with_gemini(articles: list, user_message: str, conversation_id: str = None) -> dict:
+    """재미나이 API를 사용하여 수집한 뉴스 기사들에 대해 대화합니다.
+
+    conversation_id 를 넘기면 이전 질문/답변을 이어서 사용합니다. 응답에는 다음
+    질문에 넘길 conversation_id 가 들어 있습니다 (없거나 만료되었으면 새로 만듦).
+    """
+    api_key, error = _chat_request(articles)
+    if error is not None:
+        return error
 
+    conversation = get_conversation(conversation_id, articles)
+    flight_key = _chat_flight_key(api_key, conversation, user_message)
+    result = dict(_gemini_flight.do(flight_key, _generate_chat, api_key, conversation, user_message))
+    if _merged_into_other_chat(conversation, result):
+        with conversation.lock:
+            _adopt_chat_result(conversation, user_message, result)
+    return result
 
-def chat_with_gemini(articles: list, user_message: str) -> dict:
-    """재미나이 API를 사용하여 수집한 뉴스 기사들에 대해 대화합니다."""
+
+def _chat_request(articles: list):
+    """대화 요청을 확인합니다: (api_key, 바로 돌려줄 오류 또는 None)."""
     api_key = get_api_key()
     if not api_key:
-        return {
-            "error": True,
-            "message": "API 키가 설정되지 않았습니다.",
-            "details": "상단에서 재미나이 API 키를 입력하고 검증해주세요."
-        }
+        return api_key, _no_api_key_error()
 
     if not articles:
-        return {
+        return api_key, {
             "error": True,
             "message": "대화할 뉴스가 없습니다. 먼저 뉴스를 검색해주세요."
         }
+    return api_key, None
+
+
+def _chat_flight_key(api_key: str, conversation: Conversation, user_message: str) -> tuple:
+    if conversation.total_turns == 0:
+        # 첫 질문은 이전 대화가 없어 프롬프트가 기사 목록과 질문만으로 정해지므로, 대화가
+        # 달라도 같은 기사 목록에 같은 질문이 겹쳐 들어오면 한 번만 생성합니다.
+        return ("chat", api_key, conversation.articles_key, user_message)
+    # 이어지는 질문은 같은 대화의 같은 차례일 때만 합칩니다.
+    return ("chat", api_key, conversation.id, conversation.total_turns, user_message)
+
+
+def _merged_into_other_chat(conversation: Conversation, result: dict) -> bool:
+    """다른 대화의 첫 질문에 합쳐져 받은 결과인지."""
+    return not result["error"] and result["conversation_id"] != conversation.id
+
+
+def _adopt_chat_result(conversation: Conversation, user_message: str, result: dict):
+    """합쳐져 받은 답변을 이 대화에도 기록하고 이 대화의 id 를 돌려주도록 고칩니다.
+    conversation.lock 을 잡고 호출합니다."""
+    conversation.add_turn(user_message, result["response"])
+    result["conversation_id"] = conversation.id
+
 
+def get_conversation(conversation_id, articles: list) -> Conversation:
+    """대화를 찾아 반환합니다. 없거나 만료되었거나 기사 목록이 바뀌었으면 새로 시작합니다.
+
+    중복 기사는 빼고 대화하되, 기사 번호는 사용자가 보는 원래 목록의 번호를 유지합니다.
+    """
+    articles_key = _articles_fingerprint(articles, ("title", "summary", "published"))
+    conversation = _conversations.get(conversation_id) if conversation_id else None
+    if conversation is None or conversation.articles_key != articles_key:
+        # 기사 본문 프롬프트(또는 검색 색인)는 대화를 시작할 때 한 번만 만들어 둡니다.
+        kept = unique_article_indices(articles)
+        unique = [articles[i] for i in kept]
+        conversation = Conversation(
+            secrets.token_urlsafe(16),
+            articles_key,
+            unique,
+            _get_retrieval_index(articles_key, unique),
+            numbers=[i + 1 for i in kept],
+        )
+    # 사용할 때마다 다시 넣어 만료 시간을 연장합니다.
+    _conversations.set(conversation.id, conversation)
+    return conversation
+
+
+def _get_retrieval_index(articles_key: str, articles: list):
+    if len(articles) <= RETRIEVAL_TOP_K:
+        return None
+    index = _retrieval_indexes.get(articles_key)
+    if index is None:
+        index = BM25Index(articles)
+        _retrieval_indexes.set(articles_key, index)
+    return index
+
+
+def _chat_result(conversation: Conversation, answer: str, prompt: str, retrieval) -> dict:
+    return {
+        "error": False,
+        "response": answer,
+        "conversation_id": conversation.id,
+        "prompt_tokens": estimate_tokens(prompt),
+        # 관련 기사 검색 결과 (기사 번호, 제목, 점수). 기사가 적어 전부 보냈으면 None
+        "retrieval": retrieval,
+    }
+
+
+def _generate_chat(api_key: str, conversation: Conversation, user_message: str) -> dict:
     try:
-        genai.configure(api_key=api_key)
-        model = genai.GenerativeModel("gemini-2.5-flash")
+        model = get_gemini_model(api_key)
+        with conversation.lock:
+            context, retrieval = conversation.article_context_for(user_message)
+            prompt = conversation.build_prompt(user_message, context)
+            response = model.generate_content(prompt)
+            answer = response.text.strip()
+            conversation.add_turn(user_message, answer)
+        return _chat_result(conversation, answer, prompt, retrieval)
+    except Exception as e:
+        return _generation_error(api_key, e, "대화")
 
-        # 뉴스 기사들을 텍스트로 정리
-        news_text = "다음은 수집한 뉴스 기사들입니다:\n\n"
-        for idx, article in enumerate(articles, 1):
-            title = article.get("title", "")
-            summary = article.get("summary", "")
-            published = article.get("published", "")
-            news_text += f"[기사 {idx}]\n제목: {title}\n발행일: {published}\n내용: {summary}\n\n"
 
-        prompt = f"""당신은 뉴스 분석 전문가입니다. 사용자가 제공한 뉴스 기사들을 바탕으로 질문에 답변해주세요.
-뉴스 기사 내용을 참고하여 정확하고 도움이 되는 답변을 한국어로 작성해주세요.
+def stream_summarize_with_gemini(articles: list, topic: str = None):
+    """summarize_with_gemini 의 스트리밍 버전.
 
-{news_text}
+    기사가 많아 나눠서 요약할 때는 먼저 {"type": "progress", "stage": ...} 이벤트를
+    내보냅니다. 생성되는 대로 {"type": "chunk", "text": ...} 이벤트를 내보내고, 마지막에
+    {"type": "done", "summary": 전체 요약, "cached": bool} 또는
+    {"type": "error", "message": ..., "details": ...} 이벤트를 내보냅니다.
+    """
+    api_key = get_api_key()
+    if not api_key:
+        yield dict(_no_api_key_error(), type="error")
+        return
+    if not articles:
+        yield {"type": "error", "error": True, "message": "요약할 뉴스가 없습니다."}
+        return
+    articles = dedupe_articles(articles)
 
-사용자 질문: {user_message}
+    cached = _cached_summary(articles, topic)
+    if cached is not None:
+        _remember_summary(topic, articles, cached)
+        yield {"type": "chunk", "text": cached}
+        yield {"type": "done", "summary": cached, "cached": True}
+        return
 
-답변:"""
+    try:
+        model = get_gemini_model(api_key)
+        if not _fits_one_prompt(articles):
+            plan = yield from _with_progress_events(_summary_prompt_plan, model, articles, topic)
+        else:
+            plan = _summary_prompt_plan(model, articles, topic)
 
-        response = model.generate_content(prompt)
-        return {
-            "error": False,
-            "response": response.text.strip()
+        if plan["prompt"] is None:
+            summary = plan["summary"]
+            yield {"type": "chunk", "text": summary}
+        else:
+            parts = []
+            for text in _stream_text(model, plan["prompt"]):
+                parts.append(text)
+                yield {"type": "chunk", "text": text}
+            summary = "".join(parts).strip()
+        _store_planned_summary(articles, topic, plan, summary)
+        yield {
+            "type": "done",
+            "summary": summary,
+            "cached": False,
+            "incremental": plan["incremental"],
+            "new_articles": plan["new_articles"],
         }
     except Exception as e:
-        return {
+        _forget_model_on_auth_error(api_key, e)
+        yield {
+            "type": "error",
+            "error": True,
+            "message": f"요약 생성 중 오류가 발생했습니다: {str(e)}",
+            "details": "API 키가 유효한지 확인하거나 잠시 후 다시 시도해주세요."
+        }
+
+
+def stream_chat_with_gemini(articles: list, user_message: str, conversation_id: str = None):
+    """chat_with_gemini 의 스트리밍 버전. 이벤트 형식은 stream_summarize_with_gemini 와 같고
+    done 이벤트에는 전체 답변("response")과 conversation_id 가 들어 있습니다."""
+    api_key = get_api_key()
+    if not api_key:
+        yield dict(_no_api_key_error(), type="error")
+        return
+    if not articles:
+        yield {"type": "error", "error": True, "message": "대화할 뉴스가 없습니다. 먼저 뉴스를 검색해주세요."}
+        return
+
+    conversation = get_conversation(conversation_id, articles)
+    try:
+        model = get_gemini_model(api_key)
+        with conversation.lock:
+            context, retrieval = conversation.article_context_for(user_message)
+            prompt = conversation.build_prompt(user_message, context)
+            parts = []
+            for text in _stream_text(model, prompt):
+                parts.append(text)
+                yield {"type": "chunk", "text": text}
+            answer = "".join(parts).strip()
+            conversation.add_turn(user_message, answer)
+        yield dict(_chat_result(conversation, answer, prompt, retrieval), type="done")
+    except Exception as e:
+        _forget_model_on_auth_error(api_key, e)
+        yield {
+            "type": "error",
             "error": True,
             "message": f"대화 생성 중 오류가 발생했습니다: {str(e)}",
             "details": "API 키가 유효한지 확인하거나 잠시 후 다시 시도해주세요."
         }
 
 
+def _with_progress_events(fn, *args):
+    """fn(*args, progress=...) 을 별도 스레드에서 실행하는 동안 진행 상황을
+    {"type": "progress", ...} 이벤트로 내보내고, 끝나면 fn 의 결과를 반환합니다."""
+    events = queue.Queue()
+    outcome = {}
+
+    def run():
+        try:
+            outcome["result"] = fn(*args, progress=events.put)
+        except Exception as e:
+            outcome["error"] = e
+        finally:
+            events.put(None)
+
+    threading.Thread(target=run, name="news-summary-progress", daemon=True).start()
+    while True:
+        event = events.get()
+        if event is None:
+            break
+        yield dict(event, type="progress")
+    if "error" in outcome:
+        raise outcome["error"]
+    return outcome["result"]
+
+
+def _stream_text(model, prompt: str):
+    """generate_content(stream=True) 의 텍스트 조각을 차례로 내보냅니다."""
+    started = time.monotonic()
+    first = True
+    with _stream_stats_lock:
+        _stream_stats["streams"] += 1
+
+    for chunk in model.generate_content(prompt, stream=True):
+        try:
+            text = chunk.text
+        except ValueError:
+            # 안전 필터 등으로 텍스트가 없는 조각은 건너뜁니다.
+            continue
+        if not text:
+            continue
+        if first:
+            first = False
+            with _stream_stats_lock:
+                _stream_stats["first_token_count"] += 1
+                _stream_stats["first_token_seconds"] += time.monotonic() - started
+        yield text
+
+
+def _streaming_stats() -> dict:
+    with _stream_stats_lock:
+        count = _stream_stats["first_token_count"]
+        return {
+            "streams": _stream_stats["streams"],
+            "avg_time_to_first_token": (
+                round(_stream_stats["first_token_seconds"] / count, 3) if count else None
+            ),
+        }
+
+
+def _get_saved_news_store():
+    global _saved_news_store
+    with _saved_news_store_lock:
+        store = _saved_news_store
+        path = SAVED_NEWS_DB if SAVED_NEWS_BACKEND == "sqlite" else SAVED_NEWS_LOG
+        if store is None or store.path != path or store.fsync != SAVED_NEWS_FSYNC:
+            if SAVED_NEWS_BACKEND == "sqlite":
+                store = SqliteNewsStore(SAVED_NEWS_DB, fsync=SAVED_NEWS_FSYNC)
+                _migrate_saved_news_to_sqlite(store)
+            else:
+                store = JsonlStore(SAVED_NEWS_LOG, fsync=SAVED_NEWS_FSYNC)
+                migrated = store.migrate_json_array(SAVED_NEWS_FILE)
+                if migrated:
+                    print(f"{SAVED_NEWS_FILE} 의 저장 기록 {migrated}개를 {SAVED_NEWS_LOG} 로 옮겼습니다.")
+            _saved_news_store = store
+        return store
+
+
+def _migrate_saved_news_to_sqlite(store: SqliteNewsStore):
+    """SQLite 가 비어 있으면 예전 JSONL / JSON 배열 기록을 한 번 옮기고 원본은 .migrated 로 남깁니다."""
+    for source in (SAVED_NEWS_LOG, SAVED_NEWS_FILE):
+        if not os.path.exists(source):
+            continue
+        migrated = store.import_if_empty(lambda: _read_legacy_saved_news(source))
+        if migrated:
+            os.replace(source, source + ".migrated")
+            print(f"{source} 의 저장 기록 {migrated}개를 {store.path} 로 옮겼습니다.")
+        return
+
+
+def _read_legacy_saved_news(source: str) -> list:
+    if source == SAVED_NEWS_LOG:
+        return JsonlStore(source, fsync=False).read_all()
+    with open(source, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
 def save_news(keyword: str, articles: list):
-    """키워드와 뉴스 기사들을 JSON 파일에 저장합니다."""
+    """키워드와 뉴스 기사들을 저장 파일 끝에 한 줄로 덧붙입니다."""
     try:
-        # 기존 데이터 불러오기
-        if os.path.exists(SAVED_NEWS_FILE):
-            with open(SAVED_NEWS_FILE, "r", encoding="utf-8") as f:
-                saved_data = json.load(f)
-        else:
-            saved_data = []
-
-        # 새 데이터 추가
-        saved_data.append(
+        _get_saved_news_store().append(
             {
                 "keyword": keyword,
                 "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
                 "articles": articles,
             }
         )
-
-        # 저장
-        with open(SAVED_NEWS_FILE, "w", encoding="utf-8") as f:
-            json.dump(saved_data, f, ensure_ascii=False, indent=2)
-
         return True
     except Exception as e:
         print(f"저장 중 오류 발생: {e}")
@@ -296,47 +1541,57 @@ def save_news(keyword: str, articles: list):
 def load_saved_news():
     """저장된 뉴스 데이터를 불러옵니다."""
     try:
-        if os.path.exists(SAVED_NEWS_FILE):
-            with open(SAVED_NEWS_FILE, "r", encoding="utf-8") as f:
-                return json.load(f)
-        return []
+        return _get_saved_news_store().read_all()
     except Exception as e:
         print(f"불러오기 중 오류 발생: {e}")
         return []
 
 
-def simple_summarize(text: str, max_sentences: int = 2) -> str:
-    """Very simple summarizer: take the first N 'sentences'."""
-    if not text:
-        return "(요약할 내용이 없습니다.)"
+def list_saved_news(limit: int = SAVED_PAGE_SIZE, cursor=None, keyword=None, with_articles: bool = False) -> dict:
+    """저장된 뉴스를 최신 순으로 한 페이지씩 불러옵니다.
+
+    {"items": [{"id", "keyword", "timestamp", "article_count"}, ...], "next_cursor": ...} 를
+    반환하며, 다음 페이지는 next_cursor 를 cursor 로 넘겨 받습니다.
+    with_articles=True 이면 각 항목에 "articles" 도 포함합니다.
+    """
+    return _get_saved_news_store().list_searches(
+        limit=limit, cursor=cursor, keyword=keyword, with_articles=with_articles
+    )
+
+
+def search_saved_news(query: str, limit: int = SAVED_PAGE_SIZE, offset: int = 0, date_from=None, date_to=None) -> dict:
+    """저장된 기사 제목/내용을 전문 검색합니다 (관련도 순, 저장 기간 필터, 페이지).
 
-    # Replace HTML breaks that sometimes appear in RSS
-    cleaned = (
-        text.replace("<br>", ". ")
-        .replace("<br/>", ". ")
-        .replace("<br />", ". ")
-        .replace("&nbsp;", " ")
+    {"items": [기사 + "score", "search_id", "keyword", "saved_at"], "next_offset": ...} 를 반환합니다.
+    """
+    return _get_saved_news_store().search(
+        query, limit=limit, offset=offset, date_from=date_from, date_to=date_to
     )
 
-    # Split by typical Korean / English sentence delimiters
-    # This is very naive but usually good enough.
-    sentences = []
-    current = ""
-    for ch in cleaned:
-        current += ch
-        if ch in ".?!？！" or ch == "다" or ch == "요":
-            # Heuristic: treat some endings as sentence boundaries
-            if current.strip():
-                sentences.append(current.strip())
-                current = ""
-    if current.strip():
-        sentences.append(current.strip())
 
-    if not sentences:
-        return cleaned.strip()
+def get_saved_news(search_id: int):
+    """저장된 검색 기록 한 건을 기사와 함께 불러옵니다. 없으면 None."""
+    return _get_saved_news_store().get_search(search_id)
 
-    summary = " ".join(sentences[:max_sentences])
-    return summary.strip()
+
+def compact_saved_news(keep=None) -> int:
+    """저장소를 정리합니다 (keep(record) 가 False 인 기록 삭제, 파일 크기 줄이기)."""
+    return _get_saved_news_store().compact(keep)
+
+
+def simple_summarize(text: str, max_sentences: int = 2) -> str:
+    """Very simple summarizer: take the first N sentences (see news_text.iter_sentences)."""
+    if not text:
+        return "(요약할 내용이 없습니다.)"
+    return lead_sentences(text, max_sentences) or "(요약할 내용이 없습니다.)"
+
+
+def simple_summarize_batch(texts, max_sentences: int = 2) -> list:
+    """simple_summarize 를 여러 글에 한 번에 적용합니다 (같은 글은 한 번만 처리)."""
+    return [
+        summary or "(요약할 내용이 없습니다.)"
+        for summary in lead_sentences_batch(texts, max_sentences)
+    ]
 
 
 def print_articles(articles):
@@ -362,7 +1617,8 @@ def print_articles(articles):
 def chat_loop():
     print("=== 뉴스 요약 챗봇 ===")
     print("키워드를 입력하면 구글 뉴스에서 관련 기사를 10개 찾아 요약해 드립니다.")
-    print("종료하려면 'quit' 또는 'exit' 을(를) 입력하세요.\n")
+    print("종료하려면 'quit' 또는 'exit' 을(를) 입력하세요.")
+    print("'통계' 를 입력하면 연결/캐시 통계를 볼 수 있습니다.\n")
 
     while True:
         keyword = input("검색할 키워드: ").strip()
@@ -371,8 +1627,14 @@ def chat_loop():
 
         if keyword.lower() in {"quit", "exit", "종료", "끝"}:
             print("챗봇을 종료합니다. 이용해 주셔서 감사합니다.")
+            close_session()
             break
 
+        if keyword.lower() in {"stats", "통계"}:
+            print(json.dumps(get_runtime_stats(), ensure_ascii=False, indent=2))
+            print()
+            continue
+
         print(f"\n'{keyword}' 관련 뉴스를 검색 중입니다...\n")
         result = fetch_news(keyword, max_results=10)
         if result.get("error"):
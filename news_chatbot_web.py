@@ -1,20 +1,109 @@
-from flask import Flask, render_template_string, request, jsonify
+import json
+import os
+import threading
+
+from flask import (
+    Blueprint,
+    Flask,
+    Response,
+    current_app,
+    render_template_string,
+    request,
+    jsonify,
+    stream_with_context,
+)
 from flask_cors import CORS
 
 from news_chatbot import (
+    BATCH_MAX_KEYWORDS,
+    SAVED_PAGE_SIZE,
     fetch_news,
+    fetch_news_many,
+    create_result_set,
+    get_result_set,
     summarize_with_gemini,
     chat_with_gemini,
+    stream_summarize_with_gemini,
+    stream_chat_with_gemini,
     save_news,
     load_saved_news,
-    get_api_key,
+    list_saved_news,
+    search_saved_news,
+    get_saved_news,
     save_api_key,
     validate_api_key,
+    get_runtime_stats,
+    simple_summarize_batch,
+    start_background_refresh,
+    check_readiness,
+    shutdown,
 )
+from news_static import ASSET_CACHE_CONTROL, StaticAsset, load_directory, load_file
+
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+STATIC_DIR = os.path.join(BASE_DIR, "static")  # 메인 페이지의 CSS/JS
+PAGE_FILES = ("index2.html", "index3.html")
+
+bp = Blueprint("news", __name__)
+_draining = threading.Event()  # 종료 중이면 /readyz 가 503 을 반환
+
+
+def create_app(config: dict = None) -> Flask:
+    """Flask 앱을 만듭니다. 모듈을 import 할 때는 아무 작업도 하지 않습니다.
+
+    config 예: {"START_BACKGROUND_REFRESH": True} 이면 인기 키워드 사전 갱신을 시작합니다.
+    운영 서버(serve.py)는 워커 프로세스마다 이 함수로 앱을 만듭니다.
+    """
+    app = Flask(__name__, static_folder=None)  # /static 은 미리 압축해 둔 파일로 직접 제공
+    app.config["START_BACKGROUND_REFRESH"] = False
+    app.config.update(config or {})
+    CORS(app)  # file:// 에서도 localhost API 호출 가능
+    app.register_blueprint(bp)
+    app.extensions["news_pages"] = build_pages(app)
+    _draining.clear()
+    if app.config["START_BACKGROUND_REFRESH"]:
+        start_background_refresh()
+    return app
+
+
+def begin_shutdown():
+    """/readyz 를 503 으로 바꿔 새 요청이 오지 않게 합니다 (처리 중인 요청은 계속)."""
+    _draining.set()
+
+
+def shutdown_app():
+    """앱이 쓰던 백그라운드 작업과 연결을 정리합니다 (워커가 끝날 때 호출)."""
+    begin_shutdown()
+    shutdown()
+
+
+def build_pages(app: Flask) -> dict:
+    """페이지와 정적 파일을 한 번만 읽고(메인 페이지는 한 번만 렌더링) 압축해 둡니다.
+
+    CSS/JS 주소에는 내용 해시(?v=...)를 붙이므로 브라우저가 오래 캐시해도
+    파일이 바뀌면 새 주소로 받아 갑니다.
+    """
+    assets = load_directory(STATIC_DIR)
+
+    def asset_url(name: str) -> str:
+        return f"/static/{name}?v={assets[name].version}"
+
+    with app.app_context():
+        index_html = render_template_string(HTML_TEMPLATE, asset_url=asset_url)
+    return {
+        "index": StaticAsset(index_html.encode("utf-8"), "text/html; charset=utf-8"),
+        "files": {name: load_file(os.path.join(BASE_DIR, name)) for name in PAGE_FILES},
+        "assets": assets,
+    }
 
 
-app = Flask(__name__)
-CORS(app)  # file:// 에서도 localhost API 호출 가능
+RESULT_EXPIRED_ERROR = {
+    "error": True,
+    "expired": True,
+    "message": "검색 결과가 만료되었습니다.",
+    "details": "뉴스를 다시 검색해주세요."
+}
 
 
 HTML_TEMPLATE = """
@@ -30,157 +119,7 @@ HTML_TEMPLATE = """
     integrity="sha384-QWTKZyjpPEjISv5WaRU9OFeRpok6YctnYmDr5pNlyT2bRjXh0JMhjY6hW+ALEwIH"
     crossorigin="anonymous"
   />
-  <style>
-    body {
-      background-color: #f5f5f7;
-      font-family: -apple-system, BlinkMacSystemFont, "Segoe UI", Roboto, sans-serif;
-    }
-    .main-container {
-      max-width: 1400px;
-      margin: 20px auto;
-      padding: 0 20px;
-    }
-    .section-card {
-      background: #ffffff;
-      border-radius: 12px;
-      box-shadow: 0 2px 8px rgba(0,0,0,0.1);
-      padding: 24px;
-      margin-bottom: 20px;
-    }
-    .section-title {
-      font-size: 1.25rem;
-      font-weight: 600;
-      margin-bottom: 16px;
-      color: #111827;
-      border-bottom: 2px solid #3b82f6;
-      padding-bottom: 8px;
-    }
-    .api-key-input {
-      font-family: monospace;
-      font-size: 0.95rem;
-    }
-    .validation-result {
-      padding: 12px;
-      border-radius: 8px;
-      margin-top: 12px;
-      font-size: 0.95rem;
-    }
-    .validation-success {
-      background-color: #d1fae5;
-      border: 1px solid #10b981;
-      color: #065f46;
-    }
-    .validation-error {
-      background-color: #fee2e2;
-      border: 1px solid #ef4444;
-      color: #991b1b;
-    }
-    .validation-warning {
-      background-color: #fef3c7;
-      border: 1px solid #f59e0b;
-      color: #92400e;
-    }
-    .article-card {
-      border-radius: 8px;
-      border: 1px solid #e5e7eb;
-      padding: 14px;
-      margin-bottom: 10px;
-      background-color: #f9fafb;
-    }
-    .article-title {
-      font-size: 0.95rem;
-      font-weight: 600;
-      margin-bottom: 4px;
-    }
-    .article-meta {
-      font-size: 0.85rem;
-      color: #6b7280;
-      margin-bottom: 6px;
-    }
-    .article-summary {
-      font-size: 0.9rem;
-      color: #111827;
-    }
-    .chat-container {
-      min-height: 400px;
-      max-height: 500px;
-      overflow-y: auto;
-      border: 2px solid #3b82f6;
-      border-radius: 8px;
-      padding: 16px;
-      background-color: #ffffff;
-      margin-bottom: 12px;
-    }
-    .message {
-      margin-bottom: 12px;
-      padding: 12px 14px;
-      border-radius: 8px;
-      word-wrap: break-word;
-      line-height: 1.6;
-    }
-    .message.user {
-      background-color: #3b82f6;
-      color: white;
-      margin-left: 20%;
-      text-align: right;
-    }
-    .message.bot {
-      background-color: #f3f4f6;
-      color: #111827;
-      margin-right: 20%;
-      border: 1px solid #e5e7eb;
-    }
-    .summary-box {
-      background-color: #eff6ff;
-      border-left: 4px solid #3b82f6;
-      padding: 16px;
-      border-radius: 8px;
-      margin-bottom: 16px;
-    }
-    .grid-layout {
-      display: grid;
-      grid-template-columns: 1fr 1fr;
-      gap: 20px;
-    }
-    @media (max-width: 1200px) {
-      .grid-layout {
-        grid-template-columns: 1fr;
-      }
-    }
-    .status-badge {
-      display: inline-block;
-      padding: 4px 12px;
-      border-radius: 12px;
-      font-size: 0.85rem;
-      font-weight: 500;
-      margin-left: 8px;
-    }
-    .status-ready {
-      background-color: #d1fae5;
-      color: #065f46;
-    }
-    .status-waiting {
-      background-color: #fef3c7;
-      color: #92400e;
-    }
-    .server-alert {
-      position: fixed;
-      top: 0;
-      left: 0;
-      right: 0;
-      z-index: 9999;
-      background: #fef3c7;
-      border-bottom: 3px solid #f59e0b;
-      padding: 16px 24px;
-      text-align: center;
-      font-weight: 600;
-      box-shadow: 0 4px 12px rgba(0,0,0,0.15);
-    }
-    .server-alert a {
-      color: #1d4ed8;
-      text-decoration: underline;
-    }
-  </style>
+  <link rel="stylesheet" href="{{ asset_url('news_chatbot.css') }}">
 </head>
 <body>
   <div id="server-alert" class="server-alert" style="display: none;">
@@ -303,332 +242,27 @@ HTML_TEMPLATE = """
     <!-- 저장된 뉴스 섹션 -->
     <div class="section-card">
       <div class="section-title">💾 저장된 뉴스</div>
-      <button class="btn btn-sm btn-secondary mb-3" onclick="loadSavedNews()">
-        새로고침
-      </button>
+      <div class="d-flex gap-2 mb-3">
+        <button class="btn btn-sm btn-secondary" onclick="loadSavedNews()">
+          새로고침
+        </button>
+        <form id="saved-search-form" class="d-flex gap-2 flex-grow-1">
+          <input type="text" id="saved-search-input" class="form-control form-control-sm"
+            placeholder="저장된 기사 검색 (제목/내용)">
+          <button type="submit" class="btn btn-sm btn-outline-primary">검색</button>
+        </form>
+      </div>
       <div id="saved-news-list">
         <div class="text-muted">저장된 뉴스가 없습니다.</div>
       </div>
+      <button id="saved-news-more" class="btn btn-sm btn-outline-secondary" style="display: none;"
+        onclick="loadMoreSaved()">
+        더 보기
+      </button>
     </div>
   </div>
 
-  <script>
-    const API_BASE = (window.location.protocol === "file:") ? "http://localhost:5000" : "";
-    const NETWORK_MSG = "서버에 연결할 수 없습니다. start.bat을 실행한 뒤 브라우저에서 http://localhost:5000 으로 접속해 주세요.";
-
-    let currentArticles = [];
-    let currentKeyword = "";
-
-    function isNetworkError(err) {
-      const msg = (err && err.message) ? err.message : String(err);
-      return /fetch|network|Failed to load|연결할 수 없습니다|JSON|Unexpected token/i.test(msg);
-    }
-
-    // API 키 검증 및 저장
-    async function validateAndSaveApiKey() {
-      const apiKeyInput = document.getElementById("api-key-input");
-      const apiKey = apiKeyInput.value.trim();
-      const resultDiv = document.getElementById("api-validation-result");
-
-      if (!apiKey) {
-        resultDiv.innerHTML = `
-          <div class="validation-result validation-error">
-            <strong>❌ API 키가 입력되지 않았습니다.</strong><br>
-            재미나이(Gemini) API 키를 입력해주세요.
-          </div>
-        `;
-        return;
-      }
-
-      resultDiv.innerHTML = `
-        <div class="validation-result" style="background-color: #f3f4f6; border: 1px solid #9ca3af;">
-          <strong>⏳ API 키를 검증하는 중...</strong>
-        </div>
-      `;
-
-      try {
-        const resp = await fetch(API_BASE + "/validate-api", {
-          method: "POST",
-          headers: { "Content-Type": "application/json" },
-          body: JSON.stringify({ api_key: apiKey }),
-        });
-        const data = await resp.json();
-
-        if (data.valid) {
-          resultDiv.innerHTML = `
-            <div class="validation-result validation-success">
-              <strong>${data.message}</strong><br>
-              <small>${data.details}</small>
-            </div>
-          `;
-          // 저장
-          await fetch(API_BASE + "/save-api-key", {
-            method: "POST",
-            headers: { "Content-Type": "application/json" },
-            body: JSON.stringify({ api_key: apiKey }),
-          });
-        } else {
-          resultDiv.innerHTML = `
-            <div class="validation-result validation-error">
-              <strong>${data.message}</strong><br>
-              <small>${data.details}</small>
-            </div>
-          `;
-        }
-      } catch (err) {
-        const detail = isNetworkError(err) ? NETWORK_MSG : err.message;
-        resultDiv.innerHTML = `
-          <div class="validation-result validation-error">
-            <strong>❌ 검증 중 오류 발생</strong><br>
-            <small>${detail}</small>
-          </div>
-        `;
-      }
-    }
-
-    // 뉴스 검색
-    document.getElementById("search-form").addEventListener("submit", async (e) => {
-      e.preventDefault();
-      const keyword = document.getElementById("search-keyword").value.trim();
-      if (!keyword) return;
-
-      const errorDiv = document.getElementById("search-error");
-      const articlesContainer = document.getElementById("articles-container");
-      const articlesList = document.getElementById("articles-list");
-      const statusBadge = document.getElementById("news-status");
-
-      errorDiv.style.display = "none";
-      articlesContainer.innerHTML = "";
-      articlesList.innerHTML = "";
-      statusBadge.textContent = "검색 중...";
-      statusBadge.className = "status-badge status-waiting";
-
-      try {
-        const resp = await fetch(API_BASE + "/search", {
-          method: "POST",
-          headers: { "Content-Type": "application/json" },
-          body: JSON.stringify({ keyword: keyword }),
-        });
-        const data = await resp.json();
-
-        if (data.error) {
-          errorDiv.innerHTML = `<strong>${data.message}</strong><br><small>${data.details || ""}</small>`;
-          errorDiv.style.display = "block";
-          statusBadge.textContent = "검색 실패";
-          statusBadge.className = "status-badge status-waiting";
-        } else {
-          currentArticles = data.articles || [];
-          currentKeyword = keyword;
-
-          if (currentArticles.length > 0) {
-            statusBadge.textContent = `${currentArticles.length}개 뉴스 수집 완료`;
-            statusBadge.className = "status-badge status-ready";
-
-            // 뉴스 목록 표시
-            let listHtml = "";
-            currentArticles.forEach((article, idx) => {
-              listHtml += `
-                <div class="article-card">
-                  <div class="article-title">
-                    ${idx + 1}. ${article.title || "(제목 없음)"}
-                  </div>
-                  ${article.published ? `<div class="article-meta">${article.published}</div>` : ""}
-                </div>
-              `;
-            });
-            articlesList.innerHTML = listHtml;
-
-            // 상세 뉴스 표시
-            let detailHtml = `<p class="text-muted mb-2">총 ${currentArticles.length}개의 기사를 찾았습니다.</p>`;
-            currentArticles.forEach((article) => {
-              detailHtml += `
-                <div class="article-card">
-                  <div class="article-title">
-                    ${article.link ? `<a href="${article.link}" target="_blank">${article.title}</a>` : article.title}
-                  </div>
-                  ${article.published ? `<div class="article-meta">${article.published}</div>` : ""}
-                  <div class="article-summary">${article.summary_short || article.summary || ""}</div>
-                </div>
-              `;
-            });
-            articlesContainer.innerHTML = detailHtml;
-
-            // 대화 상태 업데이트
-            document.getElementById("chat-status").textContent = `${currentArticles.length}개 뉴스 준비됨`;
-            document.getElementById("chat-status").className = "status-badge status-ready";
-            
-            // 액션 버튼 표시
-            document.getElementById("action-buttons").style.display = "block";
-          } else {
-            statusBadge.textContent = "뉴스를 찾지 못했습니다";
-            statusBadge.className = "status-badge status-waiting";
-            articlesList.innerHTML = '<div class="text-muted">뉴스를 찾지 못했습니다.</div>';
-          }
-        }
-      } catch (err) {
-        const detail = isNetworkError(err) ? NETWORK_MSG : err.message;
-        errorDiv.innerHTML = `<strong>오류 발생</strong><br><small>${detail}</small>`;
-        errorDiv.style.display = "block";
-        statusBadge.textContent = "검색 실패";
-        statusBadge.className = "status-badge status-waiting";
-      }
-    });
-
-    // AI 요약 생성
-    async function generateSummary() {
-      if (currentArticles.length === 0) {
-        alert("요약할 뉴스가 없습니다.");
-        return;
-      }
-
-      const summaryBox = document.getElementById("summary-box");
-      const summaryContent = document.getElementById("summary-content");
-      summaryBox.style.display = "block";
-      summaryContent.textContent = "요약 생성 중...";
-
-      try {
-        const resp = await fetch(API_BASE + "/summarize", {
-          method: "POST",
-          headers: { "Content-Type": "application/json" },
-          body: JSON.stringify({ articles: currentArticles }),
-        });
-        const data = await resp.json();
-        if (data.error) {
-          summaryContent.innerHTML = `<strong>오류:</strong> ${data.message}<br><small>${data.details || ""}</small>`;
-        } else {
-          summaryContent.textContent = data.summary;
-        }
-      } catch (err) {
-        summaryContent.textContent = isNetworkError(err) ? NETWORK_MSG : ("요약 생성 중 오류: " + err.message);
-      }
-    }
-
-    // 채팅 기능
-    document.getElementById("chat-form").addEventListener("submit", async (e) => {
-      e.preventDefault();
-      const input = document.getElementById("chat-input");
-      const message = input.value.trim();
-      if (!message) return;
-
-      if (currentArticles.length === 0) {
-        alert("먼저 뉴스를 검색해주세요.");
-        return;
-      }
-
-      // 사용자 메시지 표시
-      const chatMessages = document.getElementById("chat-messages");
-      const userMsg = document.createElement("div");
-      userMsg.className = "message user";
-      userMsg.textContent = message;
-      chatMessages.appendChild(userMsg);
-      input.value = "";
-
-      // 로딩 표시
-      const loading = document.getElementById("chat-loading");
-      loading.style.display = "block";
-
-      try {
-        const resp = await fetch(API_BASE + "/chat", {
-          method: "POST",
-          headers: { "Content-Type": "application/json" },
-          body: JSON.stringify({
-            articles: currentArticles,
-            message: message,
-          }),
-        });
-        const data = await resp.json();
-        if (data.error) {
-          const errorMsg = document.createElement("div");
-          errorMsg.className = "message bot";
-          errorMsg.innerHTML = `<strong>오류:</strong> ${data.message}<br><small>${data.details || ""}</small>`;
-          chatMessages.appendChild(errorMsg);
-        } else {
-          const botMsg = document.createElement("div");
-          botMsg.className = "message bot";
-          botMsg.textContent = data.response;
-          chatMessages.appendChild(botMsg);
-        }
-      } catch (err) {
-        const errorMsg = document.createElement("div");
-        errorMsg.className = "message bot";
-        errorMsg.textContent = isNetworkError(err) ? NETWORK_MSG : ("오류: " + err.message);
-        chatMessages.appendChild(errorMsg);
-      } finally {
-        loading.style.display = "none";
-        chatMessages.scrollTop = chatMessages.scrollHeight;
-      }
-    });
-
-    // 뉴스 저장하기
-    async function saveCurrentNews() {
-      if (!currentKeyword || currentArticles.length === 0) {
-        alert("저장할 뉴스가 없습니다.");
-        return;
-      }
-
-      try {
-        const resp = await fetch(API_BASE + "/save", {
-          method: "POST",
-          headers: { "Content-Type": "application/json" },
-          body: JSON.stringify({
-            keyword: currentKeyword,
-            articles: currentArticles,
-          }),
-        });
-        const data = await resp.json();
-        if (data.success) {
-          alert("뉴스가 저장되었습니다!");
-          loadSavedNews();
-        } else {
-          alert("저장 실패: " + data.error);
-        }
-      } catch (err) {
-        alert(isNetworkError(err) ? NETWORK_MSG : ("저장 중 오류: " + err.message));
-      }
-    }
-
-    // 저장된 뉴스 불러오기
-    async function loadSavedNews() {
-      try {
-        const resp = await fetch(API_BASE + "/saved");
-        const data = await resp.json();
-        const listEl = document.getElementById("saved-news-list");
-
-        if (data.success && data.saved_news.length > 0) {
-          let html = "";
-          data.saved_news.forEach((item) => {
-            html += `
-              <div class="article-card mb-3">
-                <div class="d-flex justify-content-between align-items-center mb-2">
-                  <div>
-                    <span class="badge bg-primary">${item.keyword}</span>
-                    <span class="text-muted ms-2">${item.timestamp}</span>
-                  </div>
-                  <span class="badge bg-secondary">${item.articles.length}개 기사</span>
-                </div>
-              </div>
-            `;
-          });
-          listEl.innerHTML = html;
-        } else {
-          listEl.innerHTML = '<div class="text-muted">저장된 뉴스가 없습니다.</div>';
-        }
-      } catch (err) {
-        const detail = isNetworkError(err) ? NETWORK_MSG : err.message;
-        document.getElementById("saved-news-list").innerHTML =
-          '<div class="text-danger">불러오기 오류: ' + detail + "</div>";
-      }
-    }
-
-    // 페이지 로드 시
-    document.addEventListener("DOMContentLoaded", () => {
-      if (window.location.protocol === "file:") {
-        document.getElementById("server-alert").style.display = "block";
-      }
-      loadSavedNews();
-      document.getElementById("api-key-input").focus();
-    });
-  </script>
+  <script src="{{ asset_url('news_chatbot.js') }}"></script>
 
   <script
     src="https://cdn.jsdelivr.net/npm/bootstrap@5.3.3/dist/js/bootstrap.bundle.min.js"
@@ -640,35 +274,39 @@ HTML_TEMPLATE = """
 """
 
 
-@app.route("/", methods=["GET"])
+@bp.route("/", methods=["GET"])
 def index():
-    saved_api_key = get_api_key()
-    return render_template_string(HTML_TEMPLATE, saved_api_key=saved_api_key)
+    return current_app.extensions["news_pages"]["index"].response(request)
 
 
-@app.route("/index2.html", methods=["GET"])
+@bp.route("/index2.html", methods=["GET"])
 def index2():
-    import os
-    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "index2.html")
-    try:
-        with open(path, "r", encoding="utf-8") as f:
-            return f.read(), 200, {"Content-Type": "text/html; charset=utf-8"}
-    except FileNotFoundError:
-        return "index2.html not found", 404
+    return serve_page_file("index2.html")
 
 
-@app.route("/index3.html", methods=["GET"])
+@bp.route("/index3.html", methods=["GET"])
 def index3():
-    import os
-    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "index3.html")
-    try:
-        with open(path, "r", encoding="utf-8") as f:
-            return f.read(), 200, {"Content-Type": "text/html; charset=utf-8"}
-    except FileNotFoundError:
-        return "index3.html not found", 404
+    return serve_page_file("index3.html")
+
+
+def serve_page_file(name: str):
+    page = current_app.extensions["news_pages"]["files"].get(name)
+    if page is None:
+        return f"{name} not found", 404
+    return page.response(request)
+
 
+@bp.route("/static/<path:filename>", methods=["GET"])
+def static_asset(filename):
+    asset = current_app.extensions["news_pages"]["assets"].get(filename)
+    if asset is None:
+        return "not found", 404
+    # 현재 버전 주소로 요청하면 오래 캐시하고, 그 밖에는 매번 재검증하게 합니다.
+    versioned = request.args.get("v") == asset.version
+    return asset.response(request, ASSET_CACHE_CONTROL if versioned else None)
 
-@app.route("/validate-api", methods=["POST"])
+
+@bp.route("/validate-api", methods=["POST"])
 def validate_api():
     try:
         data = request.json
@@ -683,7 +321,7 @@ def validate_api():
         })
 
 
-@app.route("/save-api-key", methods=["POST"])
+@bp.route("/save-api-key", methods=["POST"])
 def save_api():
     try:
         data = request.json
@@ -695,7 +333,7 @@ def save_api():
         return jsonify({"success": False, "error": str(e)})
 
 
-@app.route("/search", methods=["POST"])
+@bp.route("/search", methods=["POST"])
 def search():
     try:
         data = request.json
@@ -707,7 +345,9 @@ def search():
                 "message": "키워드가 입력되지 않았습니다."
             })
 
-        result = fetch_news(keyword, max_results=10)
+        # bypass_cache: 캐시를 건너뛰고 새로 가져오기
+        bypass_cache = bool(data.get("bypass_cache")) or request.args.get("nocache") == "1"
+        result = fetch_news(keyword, max_results=10, use_cache=not bypass_cache)
 
         if result.get("error"):
             return jsonify({
@@ -717,16 +357,55 @@ def search():
             })
 
         articles = result.get("articles", [])
-        # 간단한 요약 추가
-        from news_chatbot import simple_summarize
-        for article in articles:
-            article["summary_short"] = simple_summarize(article.get("summary", ""))
+        add_short_summaries(articles)
 
         return jsonify({
             "error": False,
-            "articles": articles
+            "articles": articles,
+            # 이후 요약/대화/저장 요청에서는 기사 목록 대신 result_id 만 보내면 됩니다.
+            "result_id": create_result_set(keyword, articles)
+        })
+
+    except Exception as e:
+        return jsonify({
+            "error": True,
+            "message": f"검색 중 오류 발생: {str(e)}"
         })
 
+
+@bp.route("/search/batch", methods=["POST"])
+def search_batch():
+    try:
+        data = request.json
+        keywords = data.get("keywords", [])
+        if isinstance(keywords, str):
+            keywords = keywords.split(",")
+        keywords = [k.strip() for k in keywords if isinstance(k, str) and k.strip()]
+
+        if not keywords:
+            return jsonify({
+                "error": True,
+                "message": "키워드가 입력되지 않았습니다."
+            })
+
+        if len(keywords) > BATCH_MAX_KEYWORDS:
+            return jsonify({
+                "error": True,
+                "message": f"키워드는 한 번에 최대 {BATCH_MAX_KEYWORDS}개까지 검색할 수 있습니다."
+            })
+
+        max_results = min(max(int(data.get("max_results", 10)), 1), 100)
+        bypass_cache = bool(data.get("bypass_cache")) or request.args.get("nocache") == "1"
+        result = fetch_news_many(keywords, max_results=max_results, use_cache=not bypass_cache)
+
+        for keyword, keyword_result in result["results"].items():
+            if keyword_result.get("error"):
+                continue
+            add_short_summaries(keyword_result["articles"])
+            keyword_result["result_id"] = create_result_set(keyword, keyword_result["articles"])
+
+        return jsonify(result)
+
     except Exception as e:
         return jsonify({
             "error": True,
@@ -734,11 +413,20 @@ def search():
         })
 
 
-@app.route("/summarize", methods=["POST"])
+def add_short_summaries(articles: list):
+    """기사마다 화면 표시용 간단 요약(summary_short)을 추가합니다."""
+    summaries = simple_summarize_batch(article.get("summary", "") for article in articles)
+    for article, summary in zip(articles, summaries):
+        article["summary_short"] = summary
+
+
+@bp.route("/summarize", methods=["POST"])
 def summarize():
     try:
         data = request.json
-        articles = data.get("articles", [])
+        keyword, articles, expired = resolve_articles(data)
+        if expired:
+            return jsonify(RESULT_EXPIRED_ERROR)
 
         if not articles:
             return jsonify({
@@ -746,16 +434,10 @@ def summarize():
                 "message": "뉴스가 없습니다."
             })
 
-        # 원본 summary 필드가 있는지 확인
-        raw_articles = []
-        for a in articles:
-            raw_articles.append({
-                "title": a.get("title"),
-                "summary": a.get("summary") or a.get("summary_short", ""),
-                "published": a.get("published"),
-            })
+        # 링크로 이전 요약의 기사와 비교해 새 기사만 반영합니다.
+        raw_articles = to_raw_articles(articles, with_link=True)
 
-        result = summarize_with_gemini(raw_articles)
+        result = summarize_with_gemini(raw_articles, topic=keyword)
         if result.get("error"):
             return jsonify({
                 "error": True,
@@ -764,7 +446,10 @@ def summarize():
             })
         return jsonify({
             "error": False,
-            "summary": result.get("summary", "")
+            "summary": result.get("summary", ""),
+            "cached": result.get("cached", False),
+            "incremental": result.get("incremental", False),
+            "new_articles": result.get("new_articles")
         })
 
     except Exception as e:
@@ -774,12 +459,25 @@ def summarize():
         })
 
 
-@app.route("/chat", methods=["POST"])
+@bp.route("/summarize/stream", methods=["POST"])
+def summarize_stream():
+    data = request.json or {}
+    keyword, articles, expired = resolve_articles(data)
+    if expired:
+        return sse_response(iter([dict(RESULT_EXPIRED_ERROR, type="error")]))
+    return sse_response(
+        stream_summarize_with_gemini(to_raw_articles(articles, with_link=True), topic=keyword)
+    )
+
+
+@bp.route("/chat", methods=["POST"])
 def chat():
     try:
         data = request.json
-        articles = data.get("articles", [])
+        _, articles, expired = resolve_articles(data)
         message = data.get("message", "")
+        if expired:
+            return jsonify(RESULT_EXPIRED_ERROR)
 
         if not articles:
             return jsonify({
@@ -793,16 +491,9 @@ def chat():
                 "message": "메시지가 없습니다."
             })
 
-        # 원본 summary 필드가 있는지 확인
-        raw_articles = []
-        for a in articles:
-            raw_articles.append({
-                "title": a.get("title"),
-                "summary": a.get("summary") or a.get("summary_short", ""),
-                "published": a.get("published"),
-            })
+        raw_articles = to_raw_articles(articles)
 
-        result = chat_with_gemini(raw_articles, message)
+        result = chat_with_gemini(raw_articles, message, data.get("conversation_id"))
         if result.get("error"):
             return jsonify({
                 "error": True,
@@ -811,7 +502,9 @@ def chat():
             })
         return jsonify({
             "error": False,
-            "response": result.get("response", "")
+            "response": result.get("response", ""),
+            "conversation_id": result.get("conversation_id"),
+            "retrieval": result.get("retrieval")
         })
 
     except Exception as e:
@@ -821,25 +514,77 @@ def chat():
         })
 
 
-@app.route("/save", methods=["POST"])
+@bp.route("/chat/stream", methods=["POST"])
+def chat_stream():
+    data = request.json or {}
+    message = data.get("message", "")
+    if not message:
+        return sse_response(iter([{"type": "error", "error": True, "message": "메시지가 없습니다."}]))
+    _, articles, expired = resolve_articles(data)
+    if expired:
+        return sse_response(iter([dict(RESULT_EXPIRED_ERROR, type="error")]))
+    return sse_response(
+        stream_chat_with_gemini(to_raw_articles(articles), message, data.get("conversation_id"))
+    )
+
+
+def resolve_articles(data: dict):
+    """요청에서 (키워드, 기사 목록, 만료 여부) 를 꺼냅니다.
+
+    result_id 가 있으면 서버에 보관한 검색 결과를 사용하고,
+    없으면 예전처럼 요청 본문의 articles 를 사용합니다.
+    """
+    result_id = data.get("result_id")
+    if result_id:
+        result_set = get_result_set(result_id)
+        if result_set is None:
+            return data.get("keyword", ""), [], True
+        return result_set["keyword"], result_set["articles"], False
+    return data.get("keyword", ""), data.get("articles", []), False
+
+
+def to_raw_articles(articles: list, with_link: bool = False) -> list:
+    """브라우저가 보낸 기사에서 재미나이/저장에 필요한 필드만 추립니다."""
+    raw_articles = []
+    for a in articles:
+        raw = {
+            "title": a.get("title"),
+            # 원본 summary 필드가 없으면 간단 요약 사용
+            "summary": a.get("summary") or a.get("summary_short", ""),
+            "published": a.get("published"),
+        }
+        if with_link:
+            raw["link"] = a.get("link")
+        raw_articles.append(raw)
+    return raw_articles
+
+
+def sse_response(events) -> Response:
+    """이벤트 dict 들을 Server-Sent Events 스트림으로 내보냅니다."""
+    def generate():
+        for event in events:
+            payload = json.dumps(event, ensure_ascii=False)
+            yield f"event: {event.get('type', 'message')}\ndata: {payload}\n\n"
+
+    return Response(
+        stream_with_context(generate()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@bp.route("/save", methods=["POST"])
 def save():
     try:
         data = request.json
-        keyword = data.get("keyword", "")
-        articles = data.get("articles", [])
+        keyword, articles, expired = resolve_articles(data)
+        if expired:
+            return jsonify({"success": False, "expired": True, "error": RESULT_EXPIRED_ERROR["message"]})
 
         if not keyword or not articles:
             return jsonify({"success": False, "error": "키워드 또는 뉴스가 없습니다."})
 
-        # 원본 summary 필드가 있는지 확인
-        raw_articles = []
-        for a in articles:
-            raw_articles.append({
-                "title": a.get("title"),
-                "link": a.get("link"),
-                "summary": a.get("summary") or a.get("summary_short", ""),
-                "published": a.get("published"),
-            })
+        raw_articles = to_raw_articles(articles, with_link=True)
 
         save_news(keyword, raw_articles)
         return jsonify({"success": True})
@@ -848,14 +593,84 @@ def save():
         return jsonify({"success": False, "error": str(e)})
 
 
-@app.route("/saved", methods=["GET"])
+SAVED_PAGE_MAX = 100  # /saved?limit= 의 최댓값
+
+
+@bp.route("/saved", methods=["GET"])
 def saved():
+    """저장된 뉴스 목록 (최신 순, 한 페이지씩).
+
+    ?limit=20&cursor=<next_cursor>&keyword=... 로 페이지를 넘기고, ?articles=1 이면
+    기사 본문도 포함합니다. ?all=1 은 예전처럼 전체 기록을 기사와 함께 돌려줍니다.
+    """
     try:
-        saved_news = load_saved_news()
-        return jsonify({"success": True, "saved_news": saved_news})
+        if request.args.get("all") == "1":
+            return jsonify({"success": True, "saved_news": load_saved_news()})
+
+        limit = min(max(request.args.get("limit", SAVED_PAGE_SIZE, type=int), 1), SAVED_PAGE_MAX)
+        page = list_saved_news(
+            limit=limit,
+            cursor=request.args.get("cursor", type=int),
+            keyword=request.args.get("keyword") or None,
+            with_articles=request.args.get("articles") == "1",
+        )
+        return jsonify({"success": True, "saved_news": page["items"], "next_cursor": page["next_cursor"]})
     except Exception as e:
         return jsonify({"success": False, "error": str(e)})
 
 
+@bp.route("/saved/search", methods=["GET"])
+def saved_search():
+    """저장된 기사 전문 검색: ?q=검색어&from=YYYY-MM-DD&to=YYYY-MM-DD&limit=20&offset=0"""
+    try:
+        query = (request.args.get("q") or "").strip()
+        if not query:
+            return jsonify({"success": False, "error": "검색어를 입력해주세요."}), 400
+        limit = min(max(request.args.get("limit", SAVED_PAGE_SIZE, type=int), 1), SAVED_PAGE_MAX)
+        result = search_saved_news(
+            query,
+            limit=limit,
+            offset=max(request.args.get("offset", 0, type=int), 0),
+            date_from=request.args.get("from") or None,
+            date_to=request.args.get("to") or None,
+        )
+        return jsonify({"success": True, "results": result["items"], "next_offset": result["next_offset"]})
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)})
+
+
+@bp.route("/saved/<int:search_id>", methods=["GET"])
+def saved_item(search_id):
+    """저장된 검색 기록 한 건 (기사 포함)."""
+    try:
+        item = get_saved_news(search_id)
+        if item is None:
+            return jsonify({"success": False, "error": "저장된 뉴스를 찾을 수 없습니다."}), 404
+        return jsonify({"success": True, "saved_news": item})
+    except Exception as e:
+        return jsonify({"success": False, "error": str(e)})
+
+
+@bp.route("/stats", methods=["GET"])
+def stats():
+    return jsonify(get_runtime_stats())
+
+
+@bp.route("/healthz", methods=["GET"])
+def healthz():
+    """프로세스가 살아 있는지 (외부 서비스는 확인하지 않음)."""
+    return jsonify({"status": "ok"})
+
+
+@bp.route("/readyz", methods=["GET"])
+def readyz():
+    """요청을 받을 준비가 되었는지. 종료 중이거나 저장소를 열 수 없으면 503."""
+    if _draining.is_set():
+        return jsonify({"ready": False, "checks": {"shutdown": "draining"}}), 503
+    result = check_readiness()
+    return jsonify(result), 200 if result["ready"] else 503
+
+
 if __name__ == "__main__":
-    app.run(host="0.0.0.0", port=5000, debug=True)
+    # 개발용 서버 (자동 재시작, 디버거). 운영 환경에서는 serve.py 를 사용하세요.
+    create_app({"START_BACKGROUND_REFRESH": True}).run(host="0.0.0.0", port=5000, debug=True)
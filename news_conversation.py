@@ -0,0 +1,130 @@
+"""여러 번 주고받는 뉴스 대화의 기록과 프롬프트 크기(토큰 예산) 관리."""
+import threading
+
+from news_retrieval import RETRIEVAL_TOP_K
+from news_text import estimate_tokens
+
+
+# 한 번의 프롬프트에 들어가는 부분별 토큰 예산
+CHAT_ARTICLE_TOKEN_BUDGET = 4000  # 기사 본문
+CHAT_HISTORY_TOKEN_BUDGET = 1500  # 최근 대화 (원문 그대로)
+CHAT_DIGEST_TOKEN_BUDGET = 500  # 예산을 넘어 밀려난 오래된 대화의 요약
+
+# 오래된 대화를 요약에 담을 때 남길 글자 수
+DIGEST_QUESTION_CHARS = 80
+DIGEST_ANSWER_CHARS = 160
+
+CHAT_INSTRUCTIONS = """당신은 뉴스 분석 전문가입니다. 사용자가 제공한 뉴스 기사들을 바탕으로 질문에 답변해주세요.
+뉴스 기사 내용을 참고하여 정확하고 도움이 되는 답변을 한국어로 작성해주세요."""
+
+
+def build_article_context(articles: list, token_budget: int = CHAT_ARTICLE_TOKEN_BUDGET, numbers=None) -> str:
+    """기사 목록을 프롬프트용 텍스트로 만듭니다. 예산을 넘는 기사는 생략합니다.
+
+    numbers 를 주면 "[기사 n]" 에 원래 목록의 번호를 사용합니다 (검색으로 일부만 고른 경우).
+    """
+    news_text = "다음은 수집한 뉴스 기사들입니다:\n\n"
+    used = estimate_tokens(news_text)
+    for pos, article in enumerate(articles):
+        idx = numbers[pos] if numbers else pos + 1
+        title = article.get("title", "")
+        summary = article.get("summary", "")
+        published = article.get("published", "")
+        block = f"[기사 {idx}]\n제목: {title}\n발행일: {published}\n내용: {summary}\n\n"
+        tokens = estimate_tokens(block)
+        if used + tokens > token_budget and pos > 0:
+            news_text += f"(토큰 예산 때문에 나머지 기사 {len(articles) - pos}개는 생략했습니다.)\n\n"
+            break
+        news_text += block
+        used += tokens
+    return news_text
+
+
+def _shorten(text: str, limit: int) -> str:
+    text = " ".join((text or "").split())
+    return text if len(text) <= limit else text[:limit] + "…"
+
+
+class Conversation:
+    """대화 한 개의 상태.
+
+    기사 본문은 대화를 시작할 때 한 번만 프롬프트 앞부분(article_context)으로
+    만들어 둡니다. 기사가 많아 검색 색인(index)을 받은 경우에는 질문마다
+    관련 기사 k개만 골라 보냅니다. numbers 는 기사별로 사용자 화면의 기사 번호이며
+    (중복 기사를 뺀 경우 위치와 다를 수 있음), 주지 않으면 1부터 차례로 매깁니다. 최근 대화는 CHAT_HISTORY_TOKEN_BUDGET 안에서 원문으로 보냅니다.
+    예산을 넘어 밀려난 오래된 대화는 짧게 줄여 digest 에 쌓고, digest 도
+    CHAT_DIGEST_TOKEN_BUDGET 을 넘으면 가장 오래된 줄부터 버립니다.
+    그래서 대화가 아무리 길어져도 프롬프트 크기는 일정한 범위 안에 머뭅니다.
+    """
+
+    def __init__(self, conversation_id: str, articles_key: str, articles: list, index=None, numbers=None):
+        self.id = conversation_id
+        self.articles_key = articles_key
+        self.articles = articles
+        self.numbers = list(numbers) if numbers else list(range(1, len(articles) + 1))
+        self.index = index  # news_retrieval.BM25Index (기사가 적으면 None)
+        self.article_context = build_article_context(articles, numbers=self.numbers) if index is None else ""
+        self.turns = []  # [(질문, 답변, 토큰 수)]
+        self.digest = []  # 오래된 대화를 줄인 문장들
+        self.total_turns = 0
+        self.lock = threading.Lock()  # 같은 대화의 차례는 순서대로 처리
+
+    @property
+    def history_tokens(self) -> int:
+        return sum(tokens for _, _, tokens in self.turns)
+
+    def article_context_for(self, question: str):
+        """질문에 사용할 기사 본문 프롬프트와 검색 점수 목록(검색하지 않았으면 None)을 반환합니다."""
+        if self.index is None:
+            return self.article_context, None
+
+        previous = self.turns[-1][0] if self.turns else ""
+        hits = self.index.search(
+            question, k=RETRIEVAL_TOP_K, token_budget=CHAT_ARTICLE_TOKEN_BUDGET, context=previous
+        )
+        context = build_article_context(
+            [self.articles[i] for i, _ in hits], numbers=[self.numbers[i] for i, _ in hits]
+        )
+        retrieval = [
+            {"article": self.numbers[i], "title": self.articles[i].get("title", ""), "score": round(score, 3)}
+            for i, score in hits
+        ]
+        return context, retrieval
+
+    def build_prompt(self, question: str, article_context: str = None) -> str:
+        if article_context is None:
+            article_context = self.article_context_for(question)[0]
+        parts = [CHAT_INSTRUCTIONS, article_context.rstrip()]
+        if self.digest:
+            parts.append("[이전 대화 요약]\n" + "\n".join(self.digest))
+        if self.turns:
+            recent = "\n".join(f"사용자: {q}\n답변: {a}" for q, a, _ in self.turns)
+            parts.append("[최근 대화]\n" + recent)
+        parts.append(f"사용자 질문: {question}")
+        parts.append("답변:")
+        return "\n\n".join(parts)
+
+    def add_turn(self, question: str, answer: str):
+        tokens = estimate_tokens(question) + estimate_tokens(answer)
+        self.turns.append((question, answer, tokens))
+        self.total_turns += 1
+
+        # 최근 대화가 예산을 넘으면 오래된 차례를 요약으로 옮깁니다 (마지막 차례는 유지).
+        while len(self.turns) > 1 and self.history_tokens > CHAT_HISTORY_TOKEN_BUDGET:
+            old_q, old_a, _ = self.turns.pop(0)
+            self.digest.append(
+                f"- 질문: {_shorten(old_q, DIGEST_QUESTION_CHARS)} / "
+                f"답변: {_shorten(old_a, DIGEST_ANSWER_CHARS)}"
+            )
+        while len(self.digest) > 1 and estimate_tokens("\n".join(self.digest)) > CHAT_DIGEST_TOKEN_BUDGET:
+            self.digest.pop(0)
+
+    def stats(self) -> dict:
+        return {
+            "turns": self.total_turns,
+            "recent_turns": len(self.turns),
+            "digest_lines": len(self.digest),
+            "articles": len(self.articles),
+            "retrieval": self.index is not None,
+            "history_tokens": self.history_tokens,
+        }
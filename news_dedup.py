@@ -0,0 +1,203 @@
+"""기사 중복 판별.
+
+같은 기사는 정규화한 링크(추적용 파라미터 제거 등) 또는 제목+내용 해시로,
+여러 언론사에 실린 거의 같은 기사는 제목 글자 3-gram 의 MinHash 로 찾습니다.
+MinHash 서명을 band 로 나눈 해시(LSH)가 하나라도 같은 기사만 후보로 비교하므로
+기사 수가 많아도 전체를 서로 비교하지 않습니다.
+"""
+import functools
+import hashlib
+import random
+import re
+import struct
+import unicodedata
+import urllib.parse
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+
+
+MINHASH_PERMUTATIONS = 64
+MINHASH_BANDS = 16  # 16 band x 4 행: 유사도 약 0.5 이상이면 후보가 됨
+SHINGLE_SIZE = 3  # 제목 글자 n-gram 크기
+MIN_TITLE_CHARS = 8  # 이보다 짧은 제목("오늘의 날씨" 등)은 거의 같은 기사로 묶지 않음
+# 추정 자카드 유사도가 이 이상이면 같은 기사로 봄. 저장소에서는 합친 기사를 되돌릴 수 없으므로
+# 숫자 하나만 다른 제목("코스피 2,500 돌파" / "2,600 돌파")은 따로 남도록 높게 잡습니다.
+NEAR_DUPLICATE_THRESHOLD = 0.9
+# 저장소에서 다른 검색의 기사와 합칠 때는 발행 시각이 이만큼 가까워야 함. 매일 같은 제목으로 나오는
+# 기사("오늘의 증시 마감", "[속보] …")는 하루 간격이므로 그보다 짧게 잡습니다.
+NEAR_DUPLICATE_WINDOW = timedelta(hours=12)
+
+# 링크에서 지울 추적용 쿼리 파라미터 (Google 뉴스의 oc 등)
+TRACKING_PARAMS = {"oc", "fbclid", "gclid", "ref", "ref_src", "cmpid", "from"}
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_rng = random.Random(20240601)  # 서명이 DB 에 저장되므로 항상 같은 순열을 사용
+_PERMUTATIONS = [
+    (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+    for _ in range(MINHASH_PERMUTATIONS)
+]
+_SIGNATURE_FORMAT = f"<{MINHASH_PERMUTATIONS}Q"
+
+# "제목 - 언론사" 형태의 마지막 언론사 표기
+_SOURCE_SUFFIX_RE = re.compile(r"\s+[-–—|]\s+[^-–—|]{1,30}$")
+_NON_WORD_RE = re.compile(r"[\W_]+")
+
+
+def canonical_link(link) -> str:
+    """비교용으로 정규화한 링크 (http/https, www, 추적 파라미터, 끝의 / 차이를 없앰)."""
+    link = (link or "").strip()
+    if not link:
+        return ""
+    parts = urllib.parse.urlsplit(link)
+    host = parts.netloc.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    query = [
+        (key, value)
+        for key, value in urllib.parse.parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith("utm_")
+    ]
+    path = parts.path.rstrip("/") or "/"
+    return urllib.parse.urlunsplit(("https", host, path, urllib.parse.urlencode(sorted(query)), ""))
+
+
+def _normalize(text) -> str:
+    return " ".join(unicodedata.normalize("NFC", str(text or "")).casefold().split())
+
+
+def content_hash(article: dict) -> str:
+    """정규화한 제목 + 내용의 해시 (링크가 없는 기사의 식별자)."""
+    data = _normalize(article.get("title")) + "\n" + _normalize(article.get("summary"))
+    return hashlib.sha1(data.encode("utf-8")).hexdigest()
+
+
+def article_key(article: dict) -> str:
+    """같은 기사를 가리키는 키: 정규화한 링크, 링크가 없으면 내용 해시."""
+    link = canonical_link(article.get("link"))
+    return "link:" + link if link else "hash:" + content_hash(article)
+
+
+def normalize_title(title) -> str:
+    """유사도 비교용 제목: 언론사 표기, 문장 부호, 공백을 지운 소문자 문자열."""
+    title = unicodedata.normalize("NFC", str(title or "")).strip()
+    title = _SOURCE_SUFFIX_RE.sub("", title)
+    return _NON_WORD_RE.sub("", title.casefold())
+
+
+def parse_published(value):
+    """기사의 published ("YYYY-MM-DD HH:MM" 또는 RFC 822) 를 UTC 기준 datetime 으로. 모르면 None."""
+    value = (value or "").strip()
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value, "%Y-%m-%d %H:%M")
+    except ValueError:
+        pass
+    try:
+        dt = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt
+
+
+def published_close(a, b, window: timedelta = NEAR_DUPLICATE_WINDOW) -> bool:
+    """두 발행 시각이 window 안인지. 하나라도 알 수 없으면 False."""
+    a, b = parse_published(a), parse_published(b)
+    return a is not None and b is not None and abs(a - b) <= window
+
+
+def title_signature(title):
+    """제목의 MinHash 서명 (정수 튜플). 제목이 너무 짧으면 None."""
+    text = normalize_title(title)
+    if len(text) < MIN_TITLE_CHARS:
+        return None
+    return _signature(text)
+
+
+@functools.lru_cache(maxsize=4096)  # 같은 기사 목록을 여러 번 요약/대화하므로 제목별로 재사용
+def _signature(text: str):
+    shingles = {text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)}
+    hashes = [
+        int.from_bytes(hashlib.blake2b(s.encode("utf-8"), digest_size=8).digest(), "little")
+        for s in shingles
+    ]
+    return tuple(
+        min([(a * h + b) % _MERSENNE_PRIME for h in hashes]) for a, b in _PERMUTATIONS
+    )
+
+
+def similarity(sig_a, sig_b) -> float:
+    """두 서명으로 추정한 자카드 유사도 (0~1)."""
+    return sum(1 for a, b in zip(sig_a, sig_b) if a == b) / len(sig_a)
+
+
+def band_keys(signature) -> list:
+    """LSH band 별 해시 (SQLite INTEGER 범위의 정수)."""
+    rows = MINHASH_PERMUTATIONS // MINHASH_BANDS
+    keys = []
+    for band in range(MINHASH_BANDS):
+        chunk = struct.pack(f"<B{rows}Q", band, *signature[band * rows:(band + 1) * rows])
+        keys.append(int.from_bytes(hashlib.blake2b(chunk, digest_size=7).digest(), "little"))
+    return keys
+
+
+def pack_signature(signature) -> bytes:
+    return struct.pack(_SIGNATURE_FORMAT, *signature)
+
+
+def unpack_signature(data: bytes):
+    return struct.unpack(_SIGNATURE_FORMAT, data)
+
+
+class NearDuplicateIndex:
+    """메모리 안의 LSH 색인. add() 한 항목 중 거의 같은 제목을 find() 로 찾습니다."""
+
+    def __init__(self, threshold: float = NEAR_DUPLICATE_THRESHOLD):
+        self.threshold = threshold
+        self._bands = {}
+        self._signatures = {}
+
+    def find(self, signature, accept=None):
+        """가장 비슷한 항목. accept 를 주면 accept(item_id) 가 참인 항목만 봅니다."""
+        best, best_score = None, self.threshold
+        candidates = set()
+        for key in band_keys(signature):
+            candidates.update(self._bands.get(key, ()))
+        for item_id in candidates:
+            if accept is not None and not accept(item_id):
+                continue
+            score = similarity(signature, self._signatures[item_id])
+            if score >= best_score:
+                best, best_score = item_id, score
+        return best
+
+    def add(self, item_id, signature):
+        self._signatures[item_id] = signature
+        for key in band_keys(signature):
+            self._bands.setdefault(key, []).append(item_id)
+
+
+def unique_article_indices(articles: list, threshold: float = NEAR_DUPLICATE_THRESHOLD) -> list:
+    """중복(같은 링크/내용 또는 거의 같은 제목)을 뺀 기사의 위치 목록. 먼저 나온 기사를 남깁니다."""
+    seen_keys = set()
+    index = NearDuplicateIndex(threshold)
+    kept = []
+    for pos, article in enumerate(articles):
+        key = article_key(article)
+        if key in seen_keys:
+            continue
+        seen_keys.add(key)
+        signature = title_signature(article.get("title"))
+        if signature is not None:
+            if index.find(signature) is not None:
+                continue
+            index.add(pos, signature)
+        kept.append(pos)
+    return kept
+
+
+def dedupe_articles(articles: list, threshold: float = NEAR_DUPLICATE_THRESHOLD) -> list:
+    """중복 기사를 뺀 새 목록을 반환합니다."""
+    return [articles[pos] for pos in unique_article_indices(articles, threshold)]
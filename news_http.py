@@ -0,0 +1,164 @@
+"""Google 뉴스 RSS 요청에 공통으로 사용하는 HTTP 세션(커넥션 풀)."""
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+# 커넥션 풀 설정
+POOL_CONNECTIONS = 4  # 호스트별로 유지할 커넥션 풀 개수
+POOL_MAXSIZE = 16  # 호스트 하나에 유지할 최대 keep-alive 연결 수
+
+# 타임아웃 (연결 / 응답 읽기를 따로 지정)
+CONNECT_TIMEOUT = 5
+READ_TIMEOUT = 15
+
+# 일시적인 5xx 오류와 연결 끊김에 대한 재시도 설정
+RETRY_TOTAL = 3
+RETRY_BACKOFF = 0.5
+RETRY_STATUS = (500, 502, 503, 504)
+
+
+_lock = threading.Lock()
+_session = None
+_in_flight = 0
+_counters = {"requests": 0, "failures": 0}
+
+
+def _build_session():
+    retry = Retry(
+        total=RETRY_TOTAL,
+        connect=RETRY_TOTAL,
+        read=RETRY_TOTAL,
+        status=RETRY_TOTAL,
+        backoff_factor=RETRY_BACKOFF,
+        status_forcelist=RETRY_STATUS,
+        allowed_methods=frozenset(["GET", "HEAD"]),
+        # 마지막 응답은 그대로 돌려주고 raise_for_status()에서 처리합니다.
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=POOL_CONNECTIONS,
+        pool_maxsize=POOL_MAXSIZE,
+        max_retries=retry,
+    )
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session():
+    """프로세스 전체에서 공유하는 keep-alive 세션을 반환합니다."""
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
+
+
+def configure_session(
+    pool_connections=None,
+    pool_maxsize=None,
+    retries=None,
+    backoff=None,
+    connect_timeout=None,
+    read_timeout=None,
+):
+    """풀 크기, 재시도, 타임아웃 설정을 바꾸고 세션을 다시 만듭니다."""
+    global POOL_CONNECTIONS, POOL_MAXSIZE, RETRY_TOTAL, RETRY_BACKOFF
+    global CONNECT_TIMEOUT, READ_TIMEOUT, _session
+
+    with _lock:
+        if pool_connections is not None:
+            POOL_CONNECTIONS = pool_connections
+        if pool_maxsize is not None:
+            POOL_MAXSIZE = pool_maxsize
+        if retries is not None:
+            RETRY_TOTAL = retries
+        if backoff is not None:
+            RETRY_BACKOFF = backoff
+        if connect_timeout is not None:
+            CONNECT_TIMEOUT = connect_timeout
+        if read_timeout is not None:
+            READ_TIMEOUT = read_timeout
+
+        old, _session = _session, _build_session()
+    if old is not None:
+        old.close()
+
+
+def close_session():
+    """세션과 열려 있는 연결을 모두 닫습니다."""
+    global _session
+    with _lock:
+        old, _session = _session, None
+    if old is not None:
+        old.close()
+
+
+def http_get(url: str, headers=None, timeout=None):
+    """공유 세션으로 GET 요청을 보냅니다. 예외는 호출한 쪽에서 처리합니다."""
+    global _in_flight
+    session = get_session()
+    if timeout is None:
+        timeout = (CONNECT_TIMEOUT, READ_TIMEOUT)
+
+    with _lock:
+        _in_flight += 1
+        _counters["requests"] += 1
+    try:
+        return session.get(url, headers=headers, timeout=timeout)
+    except requests.RequestException:
+        with _lock:
+            _counters["failures"] += 1
+        raise
+    finally:
+        with _lock:
+            _in_flight -= 1
+
+
+def get_pool_stats() -> dict:
+    """커넥션 풀 통계 (재사용 횟수, 진행 중인 요청 수 등)를 반환합니다."""
+    with _lock:
+        stats = {
+            "requests": _counters["requests"],
+            "failures": _counters["failures"],
+            "in_flight": _in_flight,
+            "pool_maxsize": POOL_MAXSIZE,
+            "connections_opened": 0,
+            "connections_reused": 0,
+            "idle_connections": 0,
+            "hosts": {},
+        }
+        session = _session
+
+    if session is None:
+        return stats
+
+    seen = set()
+    for adapter in session.adapters.values():
+        if id(adapter) in seen:
+            continue
+        seen.add(id(adapter))
+        pools = adapter.poolmanager.pools
+        for key in list(pools.keys()):
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            opened = pool.num_connections
+            # urllib3는 재시도를 포함한 요청 횟수를 셉니다.
+            reused = max(pool.num_requests - opened, 0)
+            # 풀 큐에는 아직 열지 않은 슬롯이 None으로 들어 있습니다.
+            idle = sum(1 for conn in list(pool.pool.queue) if conn is not None) if pool.pool else 0
+            stats["connections_opened"] += opened
+            stats["connections_reused"] += reused
+            stats["idle_connections"] += idle
+            stats["hosts"][f"{pool.scheme}://{pool.host}"] = {
+                "connections_opened": opened,
+                "connections_reused": reused,
+                "idle_connections": idle,
+            }
+    return stats
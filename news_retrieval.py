@@ -0,0 +1,111 @@
+"""채팅 질문과 관련된 기사만 골라내는 로컬 검색 (BM25).
+
+외부 서비스나 추가 패키지 없이 기사 제목/내용으로 BM25 색인을 만들고,
+질문마다 점수가 높은 기사를 토큰 예산 안에서 최대 k개 고릅니다.
+한국어는 띄어쓰기와 조사가 일정하지 않으므로 단어 토큰과 함께
+한글 글자 2-gram 을 색인합니다 ("인공지능은" → 인공지능은, 인공, 공지, 지능, 능은).
+"""
+import math
+import re
+import unicodedata
+from collections import Counter
+
+from news_text import estimate_tokens
+
+
+RETRIEVAL_TOP_K = 6
+
+# BM25 파라미터
+BM25_K1 = 1.5
+BM25_B = 0.75
+TITLE_WEIGHT = 2  # 제목 토큰은 내용보다 이만큼 더 세어 줍니다
+CONTEXT_WEIGHT = 0.5  # 직전 질문("그 기사 더 알려줘" 같은 후속 질문용)의 가중치
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> list:
+    """단어 토큰과 한글 글자 2-gram 목록을 반환합니다."""
+    text = unicodedata.normalize("NFC", text or "").casefold()
+    tokens = []
+    for word in _WORD_RE.findall(text):
+        tokens.append(word)
+        if len(word) > 1 and not word.isascii():
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return tokens
+
+
+def article_tokens(article: dict) -> int:
+    """기사 하나가 프롬프트에서 차지하는 토큰 수 (추정치)."""
+    return estimate_tokens(
+        f"{article.get('title', '')}\n{article.get('published', '')}\n{article.get('summary', '')}"
+    ) + 10  # "[기사 n]" 머리글 등
+
+
+class BM25Index:
+    """기사 목록에 대한 BM25 색인. 한 번 만들어 두고 질문마다 search() 를 호출합니다."""
+
+    def __init__(self, articles: list):
+        self.articles = articles
+        self.term_freqs = []
+        self.lengths = []
+        self.costs = [article_tokens(article) for article in articles]
+        doc_freq = Counter()
+        for article in articles:
+            title = tokenize(article.get("title", ""))
+            terms = Counter(title * TITLE_WEIGHT + tokenize(article.get("summary", "")))
+            self.term_freqs.append(terms)
+            self.lengths.append(sum(terms.values()))
+            doc_freq.update(terms.keys())
+
+        count = len(articles)
+        self.avg_length = (sum(self.lengths) / count) if count else 0.0
+        self.idf = {
+            term: math.log(1 + (count - df + 0.5) / (df + 0.5)) for term, df in doc_freq.items()
+        }
+
+    def __len__(self):
+        return len(self.articles)
+
+    def scores(self, question: str, context: str = "") -> list:
+        """기사별 BM25 점수 목록을 반환합니다."""
+        weights = Counter()
+        for term in tokenize(context):
+            weights[term] += CONTEXT_WEIGHT
+        for term in tokenize(question):
+            weights[term] += 1.0
+
+        results = []
+        for terms, length in zip(self.term_freqs, self.lengths):
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * length / self.avg_length) if self.avg_length else BM25_K1
+            score = 0.0
+            for term, weight in weights.items():
+                tf = terms.get(term)
+                if tf:
+                    score += weight * self.idf[term] * tf * (BM25_K1 + 1) / (tf + norm)
+            results.append(score)
+        return results
+
+    def search(self, question: str, k: int = RETRIEVAL_TOP_K, token_budget=None, context: str = ""):
+        """점수가 높은 순서로 [(기사 위치, 점수), ...] 를 반환합니다.
+
+        최대 k개를 고르되, token_budget 을 주면 그 안에 들어가는 기사만 고릅니다.
+        점수가 같으면 원래 순서(최신 기사 우선)를 따릅니다. 관련 기사가 하나라도
+        있으면 점수가 0인 기사는 보내지 않고, 하나도 없으면("오늘 뉴스 정리해줘" 등)
+        앞에서부터 k개를 고릅니다.
+        """
+        scores = self.scores(question, context)
+        ranked = sorted(range(len(scores)), key=lambda i: (-scores[i], i))
+        if ranked and scores[ranked[0]] > 0:
+            ranked = [i for i in ranked if scores[i] > 0]
+        selected = []
+        used = 0
+        for i in ranked:
+            if len(selected) >= k:
+                break
+            if token_budget is not None and selected and used + self.costs[i] > token_budget:
+                continue
+            selected.append((i, scores[i]))
+            used += self.costs[i]
+        return selected
+
@@ -0,0 +1,87 @@
+"""Google 뉴스 RSS 전용 가벼운 파서.
+
+feedparser 는 인코딩 추정, HTML 정리, 모든 항목의 변환까지 하므로 무겁습니다.
+Google 뉴스 RSS 2.0 은 형식이 단순하므로 XMLPullParser 로 문서를 조금씩 읽으며
+<item> 의 title / link / description / pubDate / source 만 꺼내고, max_results 개를
+읽으면 나머지 문서는 보지 않고 멈춥니다. 형식이 예상과 다르면 RssFormatError 를
+내므로 호출하는 쪽에서 feedparser 로 다시 파싱합니다.
+"""
+import xml.etree.ElementTree as ET
+from datetime import timezone
+from email.utils import parsedate_to_datetime
+
+
+RSS_CHUNK_SIZE = 16 * 1024  # 파서에 한 번에 넣는 바이트 수
+
+
+class RssFormatError(ValueError):
+    """RSS 2.0 이 아니거나 XML 이 깨진 문서 (feedparser 로 다시 파싱해야 함)."""
+
+
+def _local_name(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def _parse_pubdate(value: str):
+    """RFC 822 날짜를 feedparser 의 published_parsed 처럼 UTC time.struct_time 으로 바꿉니다."""
+    try:
+        dt = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc)
+    return dt.timetuple()
+
+
+def _item_entry(item) -> dict:
+    """<item> 요소를 feedparser 항목과 같은 키의 dict 로 바꿉니다."""
+    entry = {}
+    for child in item:
+        name = _local_name(child.tag)
+        text = (child.text or "").strip()
+        if name == "title":
+            entry["title"] = text
+        elif name == "link":
+            entry["link"] = text
+        elif name == "description":
+            entry["summary"] = text
+        elif name == "pubDate":
+            entry["published"] = text
+            entry["published_parsed"] = _parse_pubdate(text)
+        elif name == "source":
+            entry["source"] = {"title": text, "href": child.get("url", "")}
+    return entry
+
+
+def parse_rss_items(content: bytes, max_results: int) -> list:
+    """RSS 문서에서 앞의 max_results 개 항목을 읽어 반환합니다.
+
+    항목은 feedparser 와 같은 키(title, link, summary, published, published_parsed,
+    source)를 가진 dict 입니다. 최상위 요소가 <rss> 가 아니거나 읽는 도중 XML 오류가
+    나면 RssFormatError 를 냅니다.
+    """
+    if max_results <= 0:
+        return []
+    parser = ET.XMLPullParser(events=("start", "end"))
+    entries = []
+    root_checked = False
+    try:
+        for offset in range(0, len(content), RSS_CHUNK_SIZE):
+            parser.feed(content[offset:offset + RSS_CHUNK_SIZE])
+            for event, elem in parser.read_events():
+                if not root_checked:
+                    if _local_name(elem.tag) != "rss":
+                        raise RssFormatError(f"RSS 문서가 아닙니다: <{_local_name(elem.tag)}>")
+                    root_checked = True
+                if event != "end" or _local_name(elem.tag) != "item":
+                    continue
+                entries.append(_item_entry(elem))
+                elem.clear()  # 읽은 항목은 버려 메모리를 아낍니다
+                if len(entries) >= max_results:
+                    return entries
+        parser.close()
+    except ET.ParseError as e:
+        raise RssFormatError(f"XML 파싱 오류: {e}") from e
+    if not root_checked:
+        raise RssFormatError("빈 문서입니다")
+    return entries
@@ -0,0 +1,106 @@
+"""미리 만들어 두는 정적 응답 (HTML 페이지, CSS/JS).
+
+본문은 앱을 만들 때 한 번만 준비하고 gzip(brotli 패키지가 있으면 brotli 도)으로
+미리 압축해 둡니다. 요청마다 Accept-Encoding 에 맞는 압축본을 고르고, 내용 해시로 만든
+강한 ETag 가 If-None-Match 와 같으면 본문 없이 304 를 돌려줍니다.
+"""
+import gzip
+import hashlib
+import mimetypes
+import os
+
+from flask import Response
+
+try:
+    import brotli
+except ImportError:  # 선택 의존성
+    brotli = None
+
+
+MIN_COMPRESS_BYTES = 512  # 이보다 작은 본문은 압축하지 않음
+PAGE_CACHE_CONTROL = "no-cache"  # 매번 ETag 로 재검증 (서버를 다시 시작하면 바로 반영)
+ASSET_CACHE_CONTROL = "public, max-age=31536000, immutable"  # 주소에 버전(?v=해시)이 붙은 CSS/JS
+
+CONTENT_TYPES = {
+    ".html": "text/html; charset=utf-8",
+    ".css": "text/css; charset=utf-8",
+    ".js": "text/javascript; charset=utf-8",
+}
+# 브라우저가 둘 다 받으면 더 작은 brotli 를 먼저 고릅니다.
+_ENCODING_PREFERENCE = ("br", "gzip")
+
+
+class StaticAsset:
+    """본문과 압축본, ETag 를 미리 계산해 둔 응답 하나."""
+
+    def __init__(self, body: bytes, content_type: str, cache_control: str = PAGE_CACHE_CONTROL):
+        self.body = body
+        self.content_type = content_type
+        self.cache_control = cache_control
+        self.digest = hashlib.sha256(body).hexdigest()[:32]
+        self.version = self.digest[:12]  # 정적 파일 주소의 ?v= 값
+        self.variants = {"identity": body}
+        if len(body) >= MIN_COMPRESS_BYTES:
+            compressed = {"gzip": gzip.compress(body, compresslevel=9, mtime=0)}
+            if brotli is not None:
+                compressed["br"] = brotli.compress(body, quality=11)
+            for encoding, data in compressed.items():
+                if len(data) < len(body):
+                    self.variants[encoding] = data
+
+    def etag(self, encoding: str) -> str:
+        """압축 방식마다 다른 강한 ETag (바이트가 다르므로)."""
+        return self.digest if encoding == "identity" else f"{self.digest}-{encoding}"
+
+    def choose_encoding(self, accept_encodings) -> str:
+        for encoding in _ENCODING_PREFERENCE:
+            if encoding in self.variants and accept_encodings.quality(encoding) > 0:
+                return encoding
+        return "identity"
+
+    def response(self, request, cache_control: str = None) -> Response:
+        encoding = self.choose_encoding(request.accept_encodings)
+        etag = self.etag(encoding)
+        headers = {
+            "Cache-Control": cache_control or self.cache_control,
+            "Vary": "Accept-Encoding",
+        }
+        if request.if_none_match.contains_weak(etag):
+            response = Response(status=304, headers=headers)
+        else:
+            response = Response(self.variants[encoding], content_type=self.content_type, headers=headers)
+            if encoding != "identity":
+                response.headers["Content-Encoding"] = encoding
+        response.set_etag(etag)
+        return response
+
+    def stats(self) -> dict:
+        return {encoding: len(data) for encoding, data in self.variants.items()}
+
+
+def content_type_for(path: str) -> str:
+    ext = os.path.splitext(path)[1].lower()
+    # Windows 레지스트리에 따라 .js 가 text/plain 으로 잡히는 경우가 있어 직접 지정합니다.
+    return CONTENT_TYPES.get(ext) or mimetypes.guess_type(path)[0] or "application/octet-stream"
+
+
+def load_file(path: str, cache_control: str = PAGE_CACHE_CONTROL):
+    """파일을 읽어 StaticAsset 으로 만듭니다. 파일이 없으면 None."""
+    try:
+        with open(path, "rb") as f:
+            body = f.read()
+    except FileNotFoundError:
+        return None
+    return StaticAsset(body, content_type_for(path), cache_control)
+
+
+def load_directory(directory: str) -> dict:
+    """디렉터리의 파일들(하위 디렉터리 제외)을 {파일 이름: StaticAsset} 로 읽습니다."""
+    if not os.path.isdir(directory):
+        return {}
+    assets = {}
+    for name in sorted(os.listdir(directory)):
+        path = os.path.join(directory, name)
+        if os.path.isfile(path):
+            assets[name] = load_file(path)
+    return assets
@@ -0,0 +1,886 @@
+"""저장한 뉴스 저장소 (SQLite / 추가 전용 JSONL).
+
+SqliteNewsStore 는 키워드, 검색, 기사를 테이블로 나눠 색인과 커서 페이지 조회를 제공합니다.
+기사는 정규화한 링크(또는 내용 해시)마다 한 번만 저장하고, 여러 언론사에 실린 거의 같은
+기사(news_dedup 의 제목 MinHash)도 먼저 저장한 기사 하나로 합칩니다.
+
+JsonlStore 는 추가 전용(append-only) JSONL 파일로, 저장할 때마다 전체 파일을 다시 쓰지 않고 한 줄(JSON 한 개)을 파일 끝에 덧붙입니다.
+여러 스레드/프로세스가 동시에 저장해도 잃어버리지 않도록 잠금 파일(<경로>.lock)로
+쓰기를 직렬화하고, 파일 전체를 다시 쓰는 정리(compact)와 예전 JSON 배열 파일의
+변환은 임시 파일에 쓴 뒤 이름을 바꾸는 방식(os.replace)으로 원자적으로 처리합니다.
+"""
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+import weakref
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from news_cache import normalize_keyword
+from news_dedup import (
+    NEAR_DUPLICATE_THRESHOLD,
+    NearDuplicateIndex,
+    article_key,
+    band_keys,
+    pack_signature,
+    published_close,
+    similarity,
+    title_signature,
+    unpack_signature,
+)
+
+
+class FileLock:
+    """프로세스 간 배타적 잠금 (POSIX 는 flock, Windows 는 msvcrt.locking)."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._thread_lock = threading.Lock()
+        self._file = None
+
+    def acquire(self):
+        self._thread_lock.acquire()
+        try:
+            self._file = open(self.path, "a+b")
+            if fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_EX)
+            else:
+                self._file.seek(0)
+                while True:
+                    try:
+                        msvcrt.locking(self._file.fileno(), msvcrt.LK_LOCK, 1)
+                        break
+                    except OSError:  # LK_LOCK 은 약 10초 뒤 포기하므로 다시 시도
+                        time.sleep(0.05)
+        except BaseException:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            self._thread_lock.release()
+            raise
+
+    def release(self):
+        try:
+            if fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+            else:
+                self._file.seek(0)
+                msvcrt.locking(self._file.fileno(), msvcrt.LK_UNLCK, 1)
+        finally:
+            self._file.close()
+            self._file = None
+            self._thread_lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+def _fsync_directory(directory: str):
+    # 이름 바꾸기(os.replace)까지 디스크에 남도록 디렉터리도 동기화합니다 (POSIX 만 가능).
+    if fcntl is None:
+        return
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class JsonlStore:
+    """레코드(dict)를 한 줄에 하나씩 저장하는 추가 전용 로그 파일.
+
+    fsync=True 이면 저장할 때마다 디스크에 기록될 때까지 기다립니다 (전원이 꺼져도 유지).
+    비정상 종료로 마지막 줄이 잘렸으면 읽을 때 그 줄만 건너뛰고, 다음 저장은 새 줄에서 시작합니다.
+    """
+
+    def __init__(self, path: str, fsync: bool = True):
+        self.path = path
+        self.fsync = fsync
+        self.lock = FileLock(path + ".lock")
+        self._stats = {"appends": 0, "compactions": 0, "skipped_lines": 0}
+
+    def append(self, record: dict):
+        data = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+        with self.lock:
+            with open(self.path, "a+b") as f:
+                f.seek(0, os.SEEK_END)
+                if f.tell() > 0:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b"\n":
+                        data = b"\n" + data
+                f.write(data)
+                f.flush()
+                if self.fsync:
+                    os.fsync(f.fileno())
+            self._stats["appends"] += 1
+
+    def read_all(self) -> list:
+        with self.lock:
+            return self._read_unlocked()
+
+    def _read_unlocked(self) -> list:
+        if not os.path.exists(self.path):
+            return []
+        records = []
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    self._stats["skipped_lines"] += 1
+        return records
+
+    def _write_atomic(self, records: list):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".saved-", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                for record in records:
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                f.flush()
+                if self.fsync:
+                    os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        if self.fsync:
+            _fsync_directory(directory)
+
+    def compact(self, keep=None) -> int:
+        """잘린 줄을 버리고 파일을 다시 씁니다. keep(record) 가 False 인 레코드도 버립니다.
+
+        남은 레코드 수를 반환합니다.
+        """
+        with self.lock:
+            records = self._read_unlocked()
+            if keep is not None:
+                records = [record for record in records if keep(record)]
+            self._write_atomic(records)
+            self._stats["compactions"] += 1
+            return len(records)
+
+    def migrate_json_array(self, legacy_path: str) -> int:
+        """예전 형식(JSON 배열 한 개)의 파일을 한 번만 JSONL 로 옮깁니다.
+
+        로그 파일이 아직 없을 때만 변환하고, 원본은 <경로>.migrated 로 이름을 바꿔 남겨 둡니다.
+        옮긴 레코드 수를 반환합니다 (변환하지 않았으면 0).
+        """
+        with self.lock:
+            if os.path.exists(self.path) or not os.path.exists(legacy_path):
+                return 0
+            with open(legacy_path, "r", encoding="utf-8") as f:
+                records = json.load(f)
+            if not isinstance(records, list):
+                raise ValueError(f"{legacy_path} 는 JSON 배열 형식이 아닙니다.")
+            self._write_atomic(records)
+            os.replace(legacy_path, legacy_path + ".migrated")
+            return len(records)
+
+    def stats(self) -> dict:
+        return dict(
+            self._stats,
+            path=self.path,
+            bytes=os.path.getsize(self.path) if os.path.exists(self.path) else 0,
+        )
+
+    def list_searches(self, limit: int = 20, cursor=None, keyword=None, with_articles: bool = False) -> dict:
+        """SqliteNewsStore.list_searches 와 같은 형식의 목록 (id 는 파일 안의 줄 순서).
+
+        JSONL 은 색인이 없으므로 매번 파일 전체를 읽습니다.
+        """
+        normalized = normalize_keyword(keyword) if keyword else None
+        items = []
+        records = self.read_all()
+        for search_id in range(len(records), 0, -1):
+            record = records[search_id - 1]
+            if cursor is not None and search_id >= cursor:
+                continue
+            if normalized and normalize_keyword(record.get("keyword", "")) != normalized:
+                continue
+            if len(items) == limit:
+                return {"items": items, "next_cursor": items[-1]["id"]}
+            items.append(_search_summary(search_id, record, with_articles))
+        return {"items": items, "next_cursor": None}
+
+    def search(self, query: str, limit: int = 20, offset: int = 0, date_from=None, date_to=None) -> dict:
+        """SqliteNewsStore.search 와 같은 형식. 색인 없이 최신 기록부터 전체를 훑습니다."""
+        terms = [term.casefold() for term in (query or "").split()]
+        if not terms:
+            return {"items": [], "next_offset": None}
+        if date_to and len(date_to) == 10:
+            date_to += " 23:59:59"
+
+        items, seen = [], set()
+        records = self.read_all()
+        for search_id in range(len(records), 0, -1):
+            record = records[search_id - 1]
+            timestamp = record.get("timestamp", "")
+            if (date_from and timestamp < date_from) or (date_to and timestamp > date_to):
+                continue
+            for article in record.get("articles") or []:
+                identity = article.get("link") or article.get("title")
+                title = (article.get("title") or "").casefold()
+                text = title + " " + (article.get("summary") or "").casefold()
+                if identity in seen or not all(term in text for term in terms):
+                    continue
+                seen.add(identity)
+                items.append(dict(
+                    article,
+                    score=float(sum(term in title for term in terms)),
+                    search_id=search_id,
+                    keyword=record.get("keyword", ""),
+                    saved_at=timestamp,
+                ))
+        items.sort(key=lambda item: -item["score"])  # 안정 정렬: 점수가 같으면 최신 순
+        page = items[offset:offset + limit]
+        return {"items": page, "next_offset": offset + limit if len(items) > offset + limit else None}
+
+    def get_search(self, search_id: int):
+        records = self.read_all()
+        if not 1 <= search_id <= len(records):
+            return None
+        return _search_summary(search_id, records[search_id - 1], True)
+
+
+def _search_summary(search_id: int, record: dict, with_articles: bool) -> dict:
+    articles = record.get("articles") or []
+    item = {
+        "id": search_id,
+        "keyword": record.get("keyword", ""),
+        "timestamp": record.get("timestamp", ""),
+        "article_count": len(articles),
+    }
+    if with_articles:
+        item["articles"] = articles
+    return item
+
+
+_SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS keywords (
+    id INTEGER PRIMARY KEY,
+    keyword TEXT NOT NULL,
+    normalized TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS searches (
+    id INTEGER PRIMARY KEY,
+    keyword_id INTEGER NOT NULL REFERENCES keywords(id),
+    keyword TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    article_count INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_searches_keyword ON searches(keyword_id, id);
+CREATE INDEX IF NOT EXISTS idx_searches_timestamp ON searches(timestamp);
+CREATE TABLE IF NOT EXISTS articles (
+    id INTEGER PRIMARY KEY,
+    link TEXT UNIQUE,
+    title TEXT,
+    summary TEXT,
+    published TEXT,
+    extra TEXT,
+    canonical_key TEXT,
+    minhash BLOB
+);
+CREATE TABLE IF NOT EXISTS article_bands (
+    band INTEGER NOT NULL,
+    article_id INTEGER NOT NULL REFERENCES articles(id) ON DELETE CASCADE,
+    PRIMARY KEY (band, article_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS search_articles (
+    search_id INTEGER NOT NULL REFERENCES searches(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    article_id INTEGER NOT NULL REFERENCES articles(id),
+    PRIMARY KEY (search_id, position)
+);
+CREATE INDEX IF NOT EXISTS idx_search_articles_article ON search_articles(article_id);
+CREATE TABLE IF NOT EXISTS store_meta (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+CREATE TRIGGER IF NOT EXISTS articles_count_insert AFTER INSERT ON articles BEGIN
+    UPDATE store_meta SET value = value + 1 WHERE name = 'articles';
+END;
+CREATE TRIGGER IF NOT EXISTS articles_count_delete AFTER DELETE ON articles BEGIN
+    UPDATE store_meta SET value = value - 1 WHERE name = 'articles';
+END;
+"""
+
+# PRAGMA user_version. 2: 기사 canonical_key / minhash / article_bands 추가
+# 3: store_meta 의 기사 수 카운터 (stats() 가 매번 COUNT(*) 하지 않도록 트리거로 유지)
+SQLITE_SCHEMA_VERSION = 3
+
+# 한 트랜잭션 안에서 실행하도록 문장 단위로 나눠 둡니다 (executescript 는 먼저 커밋함).
+_FTS_SCHEMA = (
+    """CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5(
+    title, summary, content='articles', content_rowid='id', tokenize='trigram'
+)""",
+    """CREATE TRIGGER IF NOT EXISTS articles_fts_insert AFTER INSERT ON articles BEGIN
+    INSERT INTO articles_fts (rowid, title, summary) VALUES (new.id, new.title, new.summary);
+END""",
+    """CREATE TRIGGER IF NOT EXISTS articles_fts_delete AFTER DELETE ON articles BEGIN
+    INSERT INTO articles_fts (articles_fts, rowid, title, summary) VALUES ('delete', old.id, old.title, old.summary);
+END""",
+    """CREATE TRIGGER IF NOT EXISTS articles_fts_update AFTER UPDATE ON articles BEGIN
+    INSERT INTO articles_fts (articles_fts, rowid, title, summary) VALUES ('delete', old.id, old.title, old.summary);
+    INSERT INTO articles_fts (rowid, title, summary) VALUES (new.id, new.title, new.summary);
+END""",
+    # 두 글자 검색어용 2-gram 색인. 2-gram 은 SQL 로 만들 수 없으므로 기사를 저장할 때
+    # _index_bigrams 가 채우고, 지울 때는 트리거가 함께 지웁니다.
+    """CREATE VIRTUAL TABLE IF NOT EXISTS articles_bigrams USING fts5(
+    title, summary, tokenize='unicode61 remove_diacritics 0'
+)""",
+    """CREATE TRIGGER IF NOT EXISTS articles_bigrams_delete AFTER DELETE ON articles BEGIN
+    DELETE FROM articles_bigrams WHERE rowid = old.id;
+END""",
+)
+_FTS_TABLES = frozenset({"articles_fts", "articles_bigrams"})
+# 이 SQLite 에 FTS5 / trigram 토크나이저가 없을 때의 오류 메시지
+_FTS_UNSUPPORTED_ERRORS = ("no such module", "no such tokenizer")
+
+# 전문 검색 순위: 제목 일치를 내용 일치보다 두 배로 칩니다.
+FTS_TITLE_WEIGHT = 2.0
+FTS_SUMMARY_WEIGHT = 1.0
+# trigram 색인은 세 글자 이상 검색어만 찾을 수 있으므로 두 글자 검색어는 2-gram 색인으로,
+# 한 글자 검색어는 LIKE 로 찾습니다.
+FTS_MIN_TERM_LENGTH = 3
+
+
+def _like_pattern(term: str) -> str:
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def _bigrams(text) -> str:
+    """2-gram 색인에 넣을 글자 (단어 안의 연속한 두 글자, 글자/숫자로만 된 것, 중복 제외)."""
+    grams = []
+    for word in (text or "").split():
+        grams.extend(word[i:i + 2] for i in range(len(word) - 1) if word[i:i + 2].isalnum())
+    return " ".join(dict.fromkeys(grams))
+
+
+def _is_bigram_term(term: str) -> bool:
+    return len(term) == 2 and term.isalnum()
+
+_ARTICLE_COLUMNS = ("title", "summary", "published")
+
+
+class _Connection(sqlite3.Connection):
+    """WeakSet 에 넣을 수 있는 연결 (sqlite3.Connection 자체는 약한 참조를 지원하지 않음)."""
+
+
+def _row_article(row) -> dict:
+    article = {"title": row["title"], "link": row["link"], "summary": row["summary"], "published": row["published"]}
+    if row["extra"]:
+        article.update(json.loads(row["extra"]))
+    return article
+
+
+class SqliteNewsStore:
+    """저장한 뉴스를 SQLite 에 나눠 보관합니다 (키워드 / 검색 / 기사 / 검색-기사 연결).
+
+    같은 기사는 canonical_key(정규화한 링크 또는 내용 해시)로 한 번만 저장하고, 제목이
+    거의 같은 기사는 article_bands(MinHash LSH band)로 후보를 찾아 같은 검색 안에서, 또는
+    발행 시각이 가까울 때만(NEAR_DUPLICATE_WINDOW) 합칩니다. 목록 조회는 기사 본문 없이 검색 단위로
+    id 역순 커서 페이지를 돌려주므로 기록이 늘어도 한 페이지의 비용은 일정합니다.
+    append / read_all / stats 는 JsonlStore 와 같은 형식입니다.
+    스레드마다 연결을 따로 열고, WAL 모드로 읽기와 쓰기가 서로 막지 않게 합니다.
+    """
+
+    def __init__(self, path: str, fsync: bool = True):
+        self.path = path
+        self.fsync = fsync
+        self._local = threading.local()
+        # close() 가 모든 스레드의 연결을 닫을 수 있도록 열린 연결을 기억합니다. 약한 참조라서
+        # 스레드가 끝나면(요청마다 스레드를 만드는 서버) 그 연결은 저절로 닫히고 빠집니다.
+        self._connections = weakref.WeakSet()
+        self._connections_lock = threading.Lock()
+        self._generation = 0  # close() 할 때마다 증가. 스레드의 연결이 예전 것이면 새로 엶
+        self._stats = {"appends": 0, "searches": 0, "near_duplicates": 0}
+        conn = self._connect()
+        conn.executescript(_SQLITE_SCHEMA)
+        self.merged_on_upgrade = self._upgrade(conn)
+        self.fts = self._ensure_fts(conn)
+
+    def _upgrade(self, conn) -> int:
+        """예전 버전 DB 를 현재 스키마로 올리고 합친 기사 수를 반환합니다.
+
+        버전 2 이전 DB 는 기사에 canonical_key / minhash 를 채우면서 같은 기사와
+        발행 시각이 가까운 거의 같은 기사를 먼저 저장한 기사로 합칩니다 (검색-기사 연결도 옮김).
+        버전 3 이전 DB 는 기사 수 카운터를 한 번 셉니다.
+        여러 프로세스가 동시에 열어도 한 번만 하도록 쓰기 잠금을 잡은 뒤 확인합니다.
+        """
+        if conn.execute("PRAGMA user_version").fetchone()[0] >= SQLITE_SCHEMA_VERSION:
+            return 0
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if conn.execute("PRAGMA user_version").fetchone()[0] >= SQLITE_SCHEMA_VERSION:
+                conn.rollback()
+                return 0
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(articles)")}
+            for column, kind in (("canonical_key", "TEXT"), ("minhash", "BLOB")):
+                if column not in columns:
+                    conn.execute(f"ALTER TABLE articles ADD COLUMN {column} {kind}")
+            merged = self._merge_duplicate_articles(conn)
+            conn.execute(
+                "CREATE UNIQUE INDEX IF NOT EXISTS idx_articles_canonical ON articles(canonical_key)"
+            )
+            conn.execute(
+                "INSERT OR REPLACE INTO store_meta (name, value) SELECT 'articles', COUNT(*) FROM articles"
+            )
+            conn.execute(f"PRAGMA user_version = {SQLITE_SCHEMA_VERSION}")
+            conn.commit()
+            return merged
+        except BaseException:
+            conn.rollback()
+            raise
+
+    def _merge_duplicate_articles(self, conn) -> int:
+        index = NearDuplicateIndex()
+        keys = {}
+        published = {}
+        merged = 0
+        rows = conn.execute(
+            "SELECT id, link, title, summary, published FROM articles WHERE canonical_key IS NULL ORDER BY id"
+        ).fetchall()
+        for row in rows:
+            key = article_key(dict(row))
+            signature = title_signature(row["title"])
+            target = keys.get(key)
+            if target is None and signature is not None:
+                target = index.find(
+                    signature, accept=lambda item_id: published_close(published[item_id], row["published"])
+                )
+            if target is not None:
+                conn.execute(
+                    "UPDATE search_articles SET article_id = ? WHERE article_id = ?", (target, row["id"])
+                )
+                conn.execute("DELETE FROM articles WHERE id = ?", (row["id"],))
+                keys.setdefault(key, target)
+                merged += 1
+                continue
+            keys[key] = row["id"]
+            if signature is not None:
+                index.add(row["id"], signature)
+                published[row["id"]] = row["published"]
+            self._set_fingerprint(conn, row["id"], key, signature)
+
+        if merged:
+            # 합친 뒤 한 검색에 같은 기사가 두 번 연결되었으면 앞의 것만 남깁니다.
+            conn.execute(
+                "DELETE FROM search_articles WHERE rowid NOT IN"
+                " (SELECT MIN(rowid) FROM search_articles GROUP BY search_id, article_id)"
+            )
+            conn.execute(
+                "UPDATE searches SET article_count ="
+                " (SELECT COUNT(*) FROM search_articles WHERE search_id = searches.id)"
+            )
+        return merged
+
+    @staticmethod
+    def _set_fingerprint(conn, article_id: int, key: str, signature):
+        conn.execute(
+            "UPDATE articles SET canonical_key = ?, minhash = ? WHERE id = ?",
+            (key, pack_signature(signature) if signature is not None else None, article_id),
+        )
+        if signature is not None:
+            conn.executemany(
+                "INSERT OR IGNORE INTO article_bands (band, article_id) VALUES (?, ?)",
+                [(band, article_id) for band in band_keys(signature)],
+            )
+
+    def _ensure_fts(self, conn) -> bool:
+        """기사 제목/내용의 전문 검색 색인(FTS5 trigram, 두 글자 검색어용 2-gram)을 준비합니다.
+
+        FTS5 나 trigram 토크나이저가 없는 SQLite(3.34 미만)에서는 False 를 반환하고
+        search() 는 LIKE 로만 찾습니다. 색인 없이 만든 예전 DB 는 처음 한 번 없는 색인을 채웁니다.
+        여러 프로세스가 동시에 열어도 한 번만 만들도록 쓰기 잠금을 잡은 뒤 다시 확인합니다.
+        """
+        if self._has_fts(conn):
+            return True
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if self._has_fts(conn):
+                conn.rollback()
+                return True
+            existing = self._fts_tables(conn)
+            for statement in _FTS_SCHEMA:
+                conn.execute(statement)
+            if "articles_fts" not in existing:
+                conn.execute("INSERT INTO articles_fts (articles_fts) VALUES ('rebuild')")
+            if "articles_bigrams" not in existing:
+                for row in conn.execute("SELECT id, title, summary FROM articles").fetchall():
+                    self._index_bigrams(conn, row["id"], row["title"], row["summary"])
+            conn.commit()
+            return True
+        except sqlite3.OperationalError as e:
+            conn.rollback()
+            if str(e).startswith(_FTS_UNSUPPORTED_ERRORS):
+                return False
+            raise
+        except BaseException:
+            conn.rollback()
+            raise
+
+    @staticmethod
+    def _fts_tables(conn) -> set:
+        return {
+            row[0] for row in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table' AND name IN ('articles_fts', 'articles_bigrams')"
+            )
+        }
+
+    @classmethod
+    def _has_fts(cls, conn) -> bool:
+        return cls._fts_tables(conn) == _FTS_TABLES
+
+    @staticmethod
+    def _index_bigrams(conn, article_id: int, title, summary):
+        conn.execute(
+            "INSERT INTO articles_bigrams (rowid, title, summary) VALUES (?, ?, ?)",
+            (article_id, _bigrams(title), _bigrams(summary)),
+        )
+
+    def _connect(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.generation != self._generation:
+            # 다른 스레드(close 를 부르는 쪽)에서 닫을 수 있어야 하므로 check_same_thread=False.
+            # 연결 하나는 계속 한 스레드에서만 사용합니다.
+            conn = sqlite3.connect(self.path, timeout=30, check_same_thread=False, factory=_Connection)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            # FULL: 커밋마다 디스크 기록까지 기다림. NORMAL: 프로그램 비정상 종료에는 안전
+            conn.execute(f"PRAGMA synchronous={'FULL' if self.fsync else 'NORMAL'}")
+            conn.execute("PRAGMA foreign_keys=ON")
+            with self._connections_lock:
+                self._connections.add(conn)
+                self._local.generation = self._generation
+            self._local.conn = conn
+        return conn
+
+    def close(self):
+        """모든 스레드가 연 연결을 닫습니다 (서버 종료 시). 그 뒤에 다시 쓰면 새로 엽니다."""
+        with self._connections_lock:
+            connections = list(self._connections)
+            self._connections = weakref.WeakSet()
+            self._generation += 1
+        for conn in connections:
+            conn.close()
+        self._local.conn = None
+
+    def append(self, record: dict) -> int:
+        """검색 기록 한 건을 저장하고 id 를 반환합니다."""
+        conn = self._connect()
+        with conn:
+            search_id = self._insert(conn, record)
+        self._stats["appends"] += 1
+        return search_id
+
+    def _insert(self, conn, record: dict) -> int:
+        keyword = record.get("keyword", "")
+        articles = record.get("articles") or []
+        normalized = normalize_keyword(keyword)
+        conn.execute(
+            "INSERT INTO keywords (keyword, normalized) VALUES (?, ?) ON CONFLICT(normalized) DO NOTHING",
+            (keyword, normalized),
+        )
+        keyword_id = conn.execute(
+            "SELECT id FROM keywords WHERE normalized = ?", (normalized,)
+        ).fetchone()[0]
+        # 한 검색 안에 같은 기사(다른 언론사의 같은 기사 포함)가 여러 번 나오면 한 번만 연결합니다.
+        article_ids = []
+        for article in articles:
+            article_id = self._article_id(conn, article, article_ids)
+            if article_id not in article_ids:
+                article_ids.append(article_id)
+        search_id = conn.execute(
+            "INSERT INTO searches (keyword_id, keyword, timestamp, article_count) VALUES (?, ?, ?, ?)",
+            (keyword_id, keyword, record.get("timestamp", ""), len(article_ids)),
+        ).lastrowid
+        conn.executemany(
+            "INSERT INTO search_articles (search_id, position, article_id) VALUES (?, ?, ?)",
+            [(search_id, pos, article_id) for pos, article_id in enumerate(article_ids)],
+        )
+        return search_id
+
+    def _article_id(self, conn, article: dict, batch=()) -> int:
+        """기사의 id. 같은 기사나 거의 같은 기사가 이미 있으면 그 id 를, 없으면 새로 저장합니다.
+
+        batch 는 같은 검색에서 먼저 저장한 기사 id 들입니다. 거의 같은 제목의 기사는 batch 안에
+        있거나 발행 시각이 가까울 때만 합칩니다 (매일 같은 제목으로 나오는 기사는 따로 저장).
+        """
+        key = article_key(article)
+        row = conn.execute("SELECT id FROM articles WHERE canonical_key = ?", (key,)).fetchone()
+        if row is not None:
+            return row[0]
+        signature = title_signature(article.get("title"))
+        if signature is not None:
+            duplicate = self._near_duplicate(conn, signature, article.get("published"), batch)
+            if duplicate is not None:
+                self._stats["near_duplicates"] += 1
+                return duplicate
+
+        values = [article.get(column) for column in _ARTICLE_COLUMNS]
+        rest = {k: v for k, v in article.items() if k != "link" and k not in _ARTICLE_COLUMNS}
+        extra = json.dumps(rest, ensure_ascii=False) if rest else None
+        article_id = conn.execute(
+            "INSERT INTO articles (link, title, summary, published, extra) VALUES (?, ?, ?, ?, ?)",
+            (article.get("link") or None, *values, extra),
+        ).lastrowid
+        self._set_fingerprint(conn, article_id, key, signature)
+        if self.fts:
+            self._index_bigrams(conn, article_id, article.get("title"), article.get("summary"))
+        return article_id
+
+    @staticmethod
+    def _near_duplicate(conn, signature, published=None, batch=()):
+        """LSH band 가 하나라도 같은 기사 중 제목 유사도가 가장 높은 기사 id (없으면 None).
+
+        batch 안의 기사이거나 발행 시각이 published 와 가까운 기사만 봅니다.
+        """
+        bands = band_keys(signature)
+        rows = conn.execute(
+            "SELECT id, minhash, published FROM articles WHERE id IN"
+            f" (SELECT article_id FROM article_bands WHERE band IN ({','.join('?' * len(bands))}))",
+            bands,
+        )
+        best, best_score = None, NEAR_DUPLICATE_THRESHOLD
+        for row in rows:
+            if row["id"] not in batch and not published_close(published, row["published"]):
+                continue
+            score = similarity(signature, unpack_signature(row["minhash"]))
+            if score >= best_score:
+                best, best_score = row["id"], score
+        return best
+
+    def import_if_empty(self, load_records) -> int:
+        """저장된 기록이 하나도 없을 때만 load_records() 의 기록을 한 트랜잭션으로 가져옵니다.
+
+        여러 프로세스가 동시에 시작해도 한 번만 가져오도록 쓰기 잠금(BEGIN IMMEDIATE)을
+        잡은 뒤 확인합니다. 가져온 기록 수를 반환합니다.
+        """
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if conn.execute("SELECT 1 FROM searches LIMIT 1").fetchone() is not None:
+                conn.rollback()
+                return 0
+            records = load_records()
+            for record in records:
+                self._insert(conn, record)
+            conn.commit()
+            return len(records)
+        except BaseException:
+            conn.rollback()
+            raise
+
+    def _articles_for(self, conn, search_ids: list) -> dict:
+        articles = {search_id: [] for search_id in search_ids}
+        if not search_ids:
+            return articles
+        placeholders = ",".join("?" * len(search_ids))
+        rows = conn.execute(
+            "SELECT sa.search_id, a.link, a.title, a.summary, a.published, a.extra"
+            " FROM search_articles sa JOIN articles a ON a.id = sa.article_id"
+            f" WHERE sa.search_id IN ({placeholders}) ORDER BY sa.search_id, sa.position",
+            search_ids,
+        )
+        for row in rows:
+            articles[row["search_id"]].append(_row_article(row))
+        return articles
+
+    def list_searches(self, limit: int = 20, cursor=None, keyword=None, with_articles: bool = False) -> dict:
+        """최신 기록부터 limit 개를 반환합니다: {"items": [...], "next_cursor": id 또는 None}.
+
+        다음 페이지는 next_cursor 를 cursor 로 넘겨 받습니다 (id 기준 커서라 OFFSET 처럼
+        앞 페이지를 건너뛰는 비용이 없습니다). keyword 를 주면 정규화한 키워드로 거릅니다.
+        """
+        conn = self._connect()
+        sql = "SELECT id, keyword, timestamp, article_count FROM searches WHERE 1 = 1"
+        params = []
+        if cursor is not None:
+            sql += " AND id < ?"
+            params.append(cursor)
+        if keyword:
+            sql += " AND keyword_id = (SELECT id FROM keywords WHERE normalized = ?)"
+            params.append(normalize_keyword(keyword))
+        sql += " ORDER BY id DESC LIMIT ?"
+        params.append(limit + 1)
+
+        rows = conn.execute(sql, params).fetchall()
+        items = [dict(row) for row in rows[:limit]]
+        if with_articles:
+            articles = self._articles_for(conn, [item["id"] for item in items])
+            for item in items:
+                item["articles"] = articles[item["id"]]
+        next_cursor = items[-1]["id"] if len(rows) > limit else None
+        return {"items": items, "next_cursor": next_cursor}
+
+    def get_search(self, search_id: int):
+        """기사 본문을 포함한 검색 기록 한 건. 없으면 None."""
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT id, keyword, timestamp, article_count FROM searches WHERE id = ?", (search_id,)
+        ).fetchone()
+        if row is None:
+            return None
+        item = dict(row)
+        item["articles"] = self._articles_for(conn, [search_id])[search_id]
+        return item
+
+    def search(self, query: str, limit: int = 20, offset: int = 0, date_from=None, date_to=None) -> dict:
+        """저장된 기사 제목/내용에서 검색어를 찾습니다.
+
+        검색어는 공백으로 나눠 모두 포함하는 기사를 찾고(AND), 세 글자 이상은 FTS5 trigram
+        색인, 두 글자("금리", "AI")는 2-gram 색인으로 찾아 BM25 점수를 더해 순위를 매기고,
+        한 글자나 기호가 섞인 두 글자 검색어만 LIKE 로 거릅니다. date_from / date_to
+        ("YYYY-MM-DD" 또는 "YYYY-MM-DD HH:MM:SS")는 저장한 시각 기준입니다.
+        {"items": [기사 + "score", "search_id", "keyword", "saved_at"], "next_offset": ...} 를
+        반환합니다. 한 기사가 여러 번 저장되었으면 기간 안의 가장 최근 저장 기록을 씁니다.
+        """
+        terms = (query or "").split()
+        if not terms:
+            return {"items": [], "next_offset": None}
+        fts_terms = [t for t in terms if self.fts and len(t) >= FTS_MIN_TERM_LENGTH]
+        bigram_terms = [t for t in terms if self.fts and _is_bigram_term(t)]
+        like_terms = [t for t in terms if t not in fts_terms and t not in bigram_terms]
+
+        range_sql, range_params = "", []
+        if date_from:
+            range_sql += " AND s.timestamp >= ?"
+            range_params.append(date_from)
+        if date_to:
+            range_sql += " AND s.timestamp <= ?"
+            range_params.append(date_to + " 23:59:59" if len(date_to) == 10 else date_to)
+
+        # 색인별로 (기사 id, 순위) 를 찾는 하위 질의. 여러 개면 id 로 이어서 모두 맞는 기사만 남깁니다.
+        hit_queries, hit_params = [], []
+        for table, table_terms in (("articles_fts", fts_terms), ("articles_bigrams", bigram_terms)):
+            if table_terms:
+                hit_queries.append(
+                    f"SELECT rowid AS id, bm25({table}, {FTS_TITLE_WEIGHT}, {FTS_SUMMARY_WEIGHT}) AS rank"
+                    f" FROM {table} WHERE {table} MATCH ?"
+                )
+                hit_params.append(" ".join('"' + term.replace('"', '""') + '"' for term in table_terms))
+
+        like_sql, like_params = "", []
+        for term in like_terms:
+            like_sql += " AND (a.title LIKE ? ESCAPE '\\' OR a.summary LIKE ? ESCAPE '\\')"
+            like_params += [_like_pattern(term)] * 2
+
+        saved_in_range = ""
+        if range_sql:
+            saved_in_range = (
+                " AND EXISTS (SELECT 1 FROM search_articles sa JOIN searches s ON s.id = sa.search_id"
+                f" WHERE sa.article_id = a.id{range_sql})"
+            )
+        if hit_queries:
+            source = f"({hit_queries[0]}) AS h0 JOIN articles a ON a.id = h0.id" + "".join(
+                f" JOIN ({query}) AS h{i} ON h{i}.id = a.id" for i, query in enumerate(hit_queries[1:], 1)
+            )
+            rank = " + ".join(f"h{i}.rank" for i in range(len(hit_queries)))
+            order = "rank, a.id DESC"
+        else:
+            # 순위 없이 LIKE 만 쓰면 최신 기사부터 훑다가 한 페이지가 차면 멈춥니다.
+            source = "articles a"
+            rank = "0.0"
+            order = "a.id DESC"
+        sql = (
+            f"SELECT a.id, a.link, a.title, a.summary, a.published, a.extra, {rank} AS rank"
+            f" FROM {source}"
+            f" WHERE 1 = 1{like_sql}{saved_in_range}"
+            f" ORDER BY {order} LIMIT ? OFFSET ?"
+        )
+        conn = self._connect()
+        params = hit_params + like_params + range_params + [limit + 1, offset]
+        rows = conn.execute(sql, params).fetchall()
+        self._stats["searches"] += 1
+
+        # 순위를 매겨 한 페이지를 자른 뒤, 그 기사들의 (기간 안) 최근 저장 기록만 찾습니다.
+        items = []
+        for row in rows[:limit]:
+            saved = conn.execute(
+                "SELECT s.id, s.keyword, s.timestamp FROM search_articles sa JOIN searches s ON s.id = sa.search_id"
+                f" WHERE sa.article_id = ?{range_sql} ORDER BY s.timestamp DESC, s.id DESC LIMIT 1",
+                [row["id"]] + range_params,
+            ).fetchone()
+            if saved is None:
+                continue
+            item = _row_article(row)
+            item.update(
+                id=row["id"],
+                score=round(-row["rank"], 4) or 0.0,
+                search_id=saved["id"],
+                keyword=saved["keyword"],
+                saved_at=saved["timestamp"],
+            )
+            items.append(item)
+        next_offset = offset + limit if len(rows) > limit else None
+        return {"items": items, "next_offset": next_offset}
+
+    def read_all(self) -> list:
+        """예전 load_saved_news 형식 ({"keyword", "timestamp", "articles"} 목록, 오래된 순)."""
+        return [record for _, record in self._iter_records()]
+
+    def _iter_records(self):
+        rows = self._connect().execute(
+            "SELECT s.id AS search_id, s.keyword, s.timestamp, sa.article_id,"
+            " a.link, a.title, a.summary, a.published, a.extra"
+            " FROM searches s"
+            " LEFT JOIN search_articles sa ON sa.search_id = s.id"
+            " LEFT JOIN articles a ON a.id = sa.article_id"
+            " ORDER BY s.id, sa.position"
+        )
+        current_id, record = None, None
+        for row in rows:
+            if row["search_id"] != current_id:
+                if record is not None:
+                    yield current_id, record
+                current_id = row["search_id"]
+                record = {"keyword": row["keyword"], "timestamp": row["timestamp"], "articles": []}
+            if row["article_id"] is not None:
+                record["articles"].append(_row_article(row))
+        if record is not None:
+            yield current_id, record
+
+    def compact(self, keep=None) -> int:
+        """keep(record) 가 False 인 기록과 더 이상 쓰지 않는 기사를 지우고 파일을 줄입니다(VACUUM).
+
+        남은 검색 기록 수를 반환합니다.
+        """
+        conn = self._connect()
+        if keep is not None:
+            removed = [search_id for search_id, record in self._iter_records() if not keep(record)]
+            with conn:
+                conn.executemany("DELETE FROM searches WHERE id = ?", [(i,) for i in removed])
+                conn.execute(
+                    "DELETE FROM articles WHERE id NOT IN (SELECT article_id FROM search_articles)"
+                )
+        conn.execute("VACUUM")
+        return conn.execute("SELECT COUNT(*) FROM searches").fetchone()[0]
+
+    def stats(self) -> dict:
+        articles = self._connect().execute(
+            "SELECT value FROM store_meta WHERE name = 'articles'"
+        ).fetchone()[0]
+        return dict(
+            self._stats,
+            path=self.path,
+            articles=articles,
+            merged_on_upgrade=self.merged_on_upgrade,
+            bytes=os.path.getsize(self.path) if os.path.exists(self.path) else 0,
+        )
@@ -0,0 +1,153 @@
+"""뉴스 텍스트 처리 도구 (프롬프트 토큰 수 추정, HTML 정리, 문장 나누기)."""
+import html
+import re
+
+
+# 줄바꿈으로 바꿀 태그 (RSS 설명에 자주 들어 있음)
+_BREAK_TAG_RE = re.compile(r"<\s*(?:br|/p|/div|/li)\b[^>]*>", re.IGNORECASE)
+_TAG_RE = re.compile(r"<[^>]*>")
+
+# 문장 끝 후보
+#  1) 마침표/물음표/느낌표(…, 전각 포함) 뒤에 닫는 따옴표·괄호가 올 수 있고 그 뒤가 공백이나 글 끝
+#  2) 마침표 없이 줄이 끝나는 한국어 종결어미 ("…했다", "…해요", "…이죠", "…일까")
+_CLOSERS = "\"'”’」』)]"
+_BOUNDARY_RE = re.compile(
+    rf"[.?!？！。…]+[{re.escape(_CLOSERS)}]*(?=\s|$)"
+    rf"|(?<=[다요죠까])[{re.escape(_CLOSERS)}]*(?=[ \t]*(?:\n|$))"
+)
+# 마침표가 문장 끝이 아닌 약어 (소문자로 비교)
+ABBREVIATIONS = frozenset({
+    "mr", "mrs", "ms", "dr", "prof", "sr", "jr", "st", "vs", "etc", "inc", "corp", "co",
+    "ltd", "no", "vol", "fig", "jan", "feb", "mar", "apr", "jun", "jul", "aug", "sep",
+    "sept", "oct", "nov", "dec", "e.g", "i.e", "a.m", "p.m",
+})
+_ABBREVIATION_SCAN = 12  # 약어인지 보려고 마침표 앞을 살피는 최대 글자 수
+LEAD_WINDOW = 2048  # lead_sentences 가 처음 정리해 보는 글자 수 (모자라면 4배씩 늘림)
+
+
+def estimate_tokens(text: str) -> int:
+    """프롬프트 토큰 수를 대략 추정합니다.
+
+    재미나이 토크나이저를 호출하지 않는 빠른 근사치로, 영문/숫자는 약 4자,
+    한글 등 그 밖의 문자는 약 1.5자를 1토큰으로 셉니다.
+    """
+    if not text:
+        return 0
+    ascii_chars = len(text.encode("ascii", "ignore"))
+    other_chars = len(text) - ascii_chars
+    return int(ascii_chars / 4 + other_chars / 1.5) + 1
+
+
+def clean_html(text: str) -> str:
+    """RSS 설명의 HTML 을 글자로 바꿉니다 (줄바꿈 태그는 줄바꿈으로, 나머지 태그는 삭제, 엔티티 변환).
+
+    태그를 지운 뒤 엔티티를 한 번만 풀므로 본문에 이스케이프된 "&lt;작품명&gt;" 은 글자로 남습니다.
+    """
+    if not text:
+        return ""
+    if "<" in text:
+        text = _TAG_RE.sub("", _BREAK_TAG_RE.sub("\n", text))
+    if "&" in text:
+        text = html.unescape(text)
+    return text
+
+
+def html_to_text(text: str) -> str:
+    """HTML 조각을 공백을 한 칸으로 줄인 한 줄 글자로 바꿉니다."""
+    return " ".join(clean_html(text).split())
+
+
+def plain_text(text: str) -> str:
+    """HTML 이 아닌 글자(RSS 제목, 언론사 이름)의 엔티티만 풀고 공백을 한 칸으로 줄입니다.
+
+    태그는 지우지 않으므로 제목의 "<오징어 게임2>" 같은 작품명은 그대로 남습니다.
+    """
+    if text and "&" in text:
+        text = html.unescape(text)
+    return " ".join((text or "").split())
+
+
+def strip_source_suffix(text: str, source: str) -> str:
+    """끝에 붙은 언론사 이름을 지웁니다 ("제목 - 연합뉴스" → "제목")."""
+    if not source or not text.endswith(source) or len(text) == len(source):
+        return text
+    return text[:-len(source)].rstrip(" -–—|·").rstrip() or text
+
+
+def _is_abbreviation(text: str, dot: int) -> bool:
+    """text[dot] 의 마침표가 약어("Dr.", "U.S.", 이니셜 "J.")의 일부인지."""
+    start = dot
+    limit = max(0, dot - _ABBREVIATION_SCAN)
+    while start > limit and not text[start - 1].isspace():
+        start -= 1
+    word = text[start:dot].lstrip(_CLOSERS + "(").lower()
+    if not word or not word.isascii():
+        return False
+    return word in ABBREVIATIONS or (len(word) == 1 and word.isalpha()) or (
+        "." in word and all(len(part) == 1 for part in word.split("."))
+    )
+
+
+def _sentence_spans(text: str):
+    """정리된 text 의 (문장, 끝 위치) 를 차례로 돌려줍니다. 한 번 훑고 끝납니다."""
+    start = 0
+    for match in _BOUNDARY_RE.finditer(text):
+        end = match.end()
+        if match.group() == "." and _is_abbreviation(text, match.start()):
+            continue
+        sentence = " ".join(text[start:end].split())
+        start = end
+        if sentence:
+            yield sentence, end
+    rest = " ".join(text[start:].split())
+    if rest:
+        yield rest, len(text)
+
+
+def iter_sentences(text: str):
+    """HTML 을 정리한 text 의 문장을 앞에서부터 하나씩 돌려줍니다 (공백은 한 칸으로)."""
+    for sentence, _ in _sentence_spans(clean_html(text)):
+        yield sentence
+
+
+def split_sentences(text: str) -> list:
+    """text 를 문장 목록으로 나눕니다."""
+    return list(iter_sentences(text))
+
+
+def lead_sentences(text: str, max_sentences: int = 2) -> str:
+    """앞의 max_sentences 개 문장.
+
+    긴 설명은 앞부분(LEAD_WINDOW 글자)만 정리해서 문장을 찾고, 모자라면 범위를 넓힙니다.
+    범위 끝에 걸친 문장은 뒤가 잘렸을 수 있으므로 쓰지 않아 결과는 전체를 나눈 것과 같습니다.
+    """
+    text = text or ""
+    window = LEAD_WINDOW
+    while True:
+        partial = len(text) > window
+        prefix = text[:window] if partial else text
+        if partial and prefix.rfind("<") > prefix.rfind(">"):
+            prefix = prefix[:prefix.rfind("<")]  # 잘린 태그는 다음 범위에서 처리
+        cleaned = clean_html(prefix)
+        sentences = []
+        for sentence, end in _sentence_spans(cleaned):
+            if partial and end >= len(cleaned) - _ABBREVIATION_SCAN:
+                break
+            sentences.append(sentence)
+            if len(sentences) >= max_sentences:
+                return " ".join(sentences)
+        if not partial:
+            return " ".join(sentences)
+        window *= 4
+
+
+def lead_sentences_batch(texts, max_sentences: int = 2) -> list:
+    """여러 글의 lead_sentences 목록. 같은 글(여러 키워드에 나온 기사 등)은 한 번만 처리합니다."""
+    done = {}
+    results = []
+    for text in texts:
+        text = text or ""
+        if text not in done:
+            done[text] = lead_sentences(text, max_sentences)
+        results.append(done[text])
+    return results
@@ -0,0 +1,156 @@
+"""운영용 서버 실행 스크립트.
+
+    python serve.py                       # 기본 설정
+    python serve.py --workers 4 --threads 16 --timeout 300
+
+Linux/macOS 에서는 gunicorn(여러 워커 프로세스 x 스레드), Windows 에서는 waitress
+(한 프로세스, 여러 스레드)로 news_chatbot_web.create_app() 을 실행합니다.
+재미나이 호출은 대부분 응답을 기다리는 시간이라 워커마다 스레드를 여러 개 두고,
+요약/스트리밍 응답이 길어질 수 있으므로 타임아웃을 넉넉하게 잡습니다.
+설정은 명령행 인자나 환경 변수(NEWS_HOST, NEWS_PORT, NEWS_WORKERS, NEWS_THREADS,
+NEWS_TIMEOUT, NEWS_GRACEFUL_TIMEOUT)로 바꿀 수 있습니다.
+
+SIGTERM(또는 Ctrl+C)을 받으면 /readyz 가 503 을 반환하기 시작하고, 처리 중인
+요청을 기다린 뒤(gunicorn 은 --graceful-timeout 까지, waitress 는 약 5초)
+백그라운드 작업과 연결을 정리하고 끝납니다.
+"""
+import argparse
+import importlib.util
+import os
+import signal
+import sys
+
+
+DEFAULT_HOST = "0.0.0.0"
+DEFAULT_PORT = 5000
+DEFAULT_WORKERS = max(2, min(os.cpu_count() or 1, 4))  # 워커마다 캐시를 따로 가지므로 너무 많지 않게
+DEFAULT_THREADS = 8  # 워커 하나가 동시에 처리하는 요청 수
+DEFAULT_TIMEOUT = 180  # 초. 요청 하나(긴 요약, 스트리밍 포함)가 걸릴 수 있는 최대 시간
+DEFAULT_GRACEFUL_TIMEOUT = 60  # 초. 종료 신호 후 처리 중인 요청을 기다리는 시간
+DEFAULT_KEEPALIVE = 5  # 초
+
+
+def parse_args(argv=None):
+    env = os.environ.get
+    parser = argparse.ArgumentParser(description="뉴스 챗봇 운영 서버")
+    parser.add_argument("--host", default=env("NEWS_HOST", DEFAULT_HOST))
+    parser.add_argument("--port", type=int, default=int(env("NEWS_PORT", DEFAULT_PORT)))
+    parser.add_argument(
+        "--workers", type=int, default=int(env("NEWS_WORKERS", DEFAULT_WORKERS)),
+        help="워커 프로세스 수 (gunicorn 만 해당)",
+    )
+    parser.add_argument("--threads", type=int, default=int(env("NEWS_THREADS", DEFAULT_THREADS)))
+    parser.add_argument("--timeout", type=int, default=int(env("NEWS_TIMEOUT", DEFAULT_TIMEOUT)))
+    parser.add_argument(
+        "--graceful-timeout", type=int,
+        default=int(env("NEWS_GRACEFUL_TIMEOUT", DEFAULT_GRACEFUL_TIMEOUT)),
+        help="종료 신호 후 처리 중인 요청을 기다리는 시간 (gunicorn 만 해당)",
+    )
+    parser.add_argument(
+        "--no-background-refresh", action="store_true",
+        help="인기 키워드 사전 갱신을 끕니다",
+    )
+    return parser.parse_args(argv)
+
+
+def _app_config(args) -> dict:
+    return {"START_BACKGROUND_REFRESH": not args.no_background_refresh}
+
+
+def _post_worker_init(worker):
+    """gunicorn 워커의 SIGTERM 처리 앞에 /readyz 를 503 으로 바꾸는 단계를 끼워 넣습니다."""
+    from news_chatbot_web import begin_shutdown
+
+    handle_exit = signal.getsignal(signal.SIGTERM)
+
+    def _on_term(signum, frame):
+        begin_shutdown()
+        if callable(handle_exit):
+            handle_exit(signum, frame)
+
+    signal.signal(signal.SIGTERM, _on_term)
+
+
+def _worker_exit(server, worker):
+    from news_chatbot_web import shutdown_app
+
+    shutdown_app()
+
+
+def run_gunicorn(args):
+    from gunicorn.app.base import BaseApplication
+
+    class NewsChatbotApplication(BaseApplication):
+        def load_config(self):
+            options = {
+                "bind": f"{args.host}:{args.port}",
+                "workers": args.workers,
+                "worker_class": "gthread",
+                "threads": args.threads,
+                "timeout": args.timeout,
+                "graceful_timeout": args.graceful_timeout,
+                "keepalive": DEFAULT_KEEPALIVE,
+                "post_worker_init": _post_worker_init,
+                "worker_exit": _worker_exit,
+                "accesslog": "-",
+            }
+            for key, value in options.items():
+                self.cfg.set(key, value)
+
+        def load(self):
+            # preload 하지 않으므로 워커 프로세스마다 앱(캐시, 스레드 풀, 연결)을 새로 만듭니다.
+            from news_chatbot_web import create_app
+
+            return create_app(_app_config(args))
+
+    NewsChatbotApplication().run()
+
+
+def run_waitress(args):
+    from waitress import create_server
+
+    from news_chatbot_web import begin_shutdown, create_app, shutdown_app
+
+    app = create_app(_app_config(args))
+    server = create_server(
+        app,
+        host=args.host,
+        port=args.port,
+        threads=args.threads,
+        channel_timeout=args.timeout,
+    )
+
+    def _on_term(signum, frame):
+        begin_shutdown()
+        raise KeyboardInterrupt  # Ctrl+C 와 같게 처리
+
+    signal.signal(signal.SIGTERM, _on_term)
+    print(f"waitress: http://{args.host}:{args.port} (스레드 {args.threads}개)")
+    try:
+        # Ctrl+C / SIGTERM 을 받으면 waitress 가 처리 중인 요청을 잠시(5초) 기다린 뒤 반환합니다.
+        server.run()
+    finally:
+        shutdown_app()
+
+
+def _select_runner():
+    if sys.platform != "win32" and importlib.util.find_spec("gunicorn") is not None:
+        return run_gunicorn
+    if importlib.util.find_spec("waitress") is not None:
+        return run_waitress
+    return None
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    runner = _select_runner()
+    if runner is None:
+        print("운영 서버 패키지(gunicorn 또는 waitress)를 찾을 수 없습니다.")
+        print("python -m pip install -r requirements.txt 로 설치해주세요.")
+        return 1
+    runner(args)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,483 @@
+const API_BASE = (window.location.protocol === "file:") ? "http://localhost:5000" : "";
+const NETWORK_MSG = "서버에 연결할 수 없습니다. start.bat을 실행한 뒤 브라우저에서 http://localhost:5000 으로 접속해 주세요.";
+
+let currentArticles = [];
+let currentKeyword = "";
+let currentResultId = null;  // 서버에 보관된 검색 결과 ID
+let currentConversationId = null;  // 이어서 대화할 때 보내는 대화 ID
+
+// 서버가 준 글자(기사 제목, 언론사, 오류 메시지 등)를 HTML 에 넣기 전에 이스케이프합니다.
+function escapeHtml(value) {
+  return String(value == null ? "" : value)
+    .replace(/&/g, "&amp;")
+    .replace(/</g, "&lt;")
+    .replace(/>/g, "&gt;")
+    .replace(/"/g, "&quot;")
+    .replace(/'/g, "&#39;");
+}
+
+// http(s) 주소만 링크로 씁니다 (javascript: 등은 "#").
+function safeUrl(url) {
+  return /^https?:\/\//i.test(url || "") ? escapeHtml(url) : "#";
+}
+
+function isNetworkError(err) {
+  const msg = (err && err.message) ? err.message : String(err);
+  return /fetch|network|Failed to load|연결할 수 없습니다|JSON|Unexpected token/i.test(msg);
+}
+
+// POST 요청을 보내고 Server-Sent Events 응답을 이벤트 단위로 onEvent 에 넘깁니다.
+async function postEventStream(path, body, onEvent) {
+  const resp = await fetch(API_BASE + path, {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify(body),
+  });
+  if (!resp.ok || !resp.body) {
+    throw new Error("서버 응답 오류 (" + resp.status + ")");
+  }
+
+  const reader = resp.body.getReader();
+  const decoder = new TextDecoder("utf-8");
+  let buffer = "";
+  while (true) {
+    const { value, done } = await reader.read();
+    if (done) break;
+    buffer += decoder.decode(value, { stream: true });
+
+    let boundary;
+    while ((boundary = buffer.indexOf("\n\n")) !== -1) {
+      const rawEvent = buffer.slice(0, boundary);
+      buffer = buffer.slice(boundary + 2);
+      const data = rawEvent
+        .split("\n")
+        .filter((line) => line.startsWith("data:"))
+        .map((line) => line.slice(5).trim())
+        .join("\n");
+      if (data) onEvent(JSON.parse(data));
+    }
+  }
+}
+
+// 검색 결과는 서버에 보관되어 있으므로 result_id 만 보냅니다.
+// (result_id 가 없으면 예전처럼 기사 목록 전체를 보냅니다.)
+function articlePayload(extra) {
+  const payload = Object.assign({}, extra);
+  if (currentResultId) {
+    payload.result_id = currentResultId;
+  } else {
+    payload.articles = currentArticles;
+  }
+  return payload;
+}
+
+// 서버의 검색 결과가 만료되었으면 기사 목록을 직접 보내 한 번 더 시도합니다.
+async function postArticleEventStream(path, extra, onEvent) {
+  let expired = false;
+  await postEventStream(path, articlePayload(extra), (event) => {
+    if (event.type === "error" && event.expired && currentResultId) {
+      expired = true;
+      return;
+    }
+    onEvent(event);
+  });
+  if (expired) {
+    currentResultId = null;
+    await postEventStream(path, articlePayload(extra), onEvent);
+  }
+}
+
+// API 키 검증 및 저장
+async function validateAndSaveApiKey() {
+  const apiKeyInput = document.getElementById("api-key-input");
+  const apiKey = apiKeyInput.value.trim();
+  const resultDiv = document.getElementById("api-validation-result");
+
+  if (!apiKey) {
+    resultDiv.innerHTML = `
+      <div class="validation-result validation-error">
+        <strong>❌ API 키가 입력되지 않았습니다.</strong><br>
+        재미나이(Gemini) API 키를 입력해주세요.
+      </div>
+    `;
+    return;
+  }
+
+  resultDiv.innerHTML = `
+    <div class="validation-result" style="background-color: #f3f4f6; border: 1px solid #9ca3af;">
+      <strong>⏳ API 키를 검증하는 중...</strong>
+    </div>
+  `;
+
+  try {
+    const resp = await fetch(API_BASE + "/validate-api", {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({ api_key: apiKey }),
+    });
+    const data = await resp.json();
+
+    if (data.valid) {
+      resultDiv.innerHTML = `
+        <div class="validation-result validation-success">
+          <strong>${escapeHtml(data.message)}</strong><br>
+          <small>${escapeHtml(data.details)}</small>
+        </div>
+      `;
+      // 저장
+      await fetch(API_BASE + "/save-api-key", {
+        method: "POST",
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify({ api_key: apiKey }),
+      });
+    } else {
+      resultDiv.innerHTML = `
+        <div class="validation-result validation-error">
+          <strong>${escapeHtml(data.message)}</strong><br>
+          <small>${escapeHtml(data.details)}</small>
+        </div>
+      `;
+    }
+  } catch (err) {
+    const detail = isNetworkError(err) ? NETWORK_MSG : err.message;
+    resultDiv.innerHTML = `
+      <div class="validation-result validation-error">
+        <strong>❌ 검증 중 오류 발생</strong><br>
+        <small>${escapeHtml(detail)}</small>
+      </div>
+    `;
+  }
+}
+
+// 뉴스 검색
+document.getElementById("search-form").addEventListener("submit", async (e) => {
+  e.preventDefault();
+  const keyword = document.getElementById("search-keyword").value.trim();
+  if (!keyword) return;
+
+  const errorDiv = document.getElementById("search-error");
+  const articlesContainer = document.getElementById("articles-container");
+  const articlesList = document.getElementById("articles-list");
+  const statusBadge = document.getElementById("news-status");
+
+  errorDiv.style.display = "none";
+  articlesContainer.innerHTML = "";
+  articlesList.innerHTML = "";
+  statusBadge.textContent = "검색 중...";
+  statusBadge.className = "status-badge status-waiting";
+
+  try {
+    const resp = await fetch(API_BASE + "/search", {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({ keyword: keyword }),
+    });
+    const data = await resp.json();
+
+    if (data.error) {
+      errorDiv.innerHTML = `<strong>${escapeHtml(data.message)}</strong><br><small>${escapeHtml(data.details)}</small>`;
+      errorDiv.style.display = "block";
+      statusBadge.textContent = "검색 실패";
+      statusBadge.className = "status-badge status-waiting";
+    } else {
+      currentArticles = data.articles || [];
+      currentKeyword = keyword;
+      currentResultId = data.result_id || null;
+      currentConversationId = null;  // 새 검색이면 대화도 새로 시작
+
+      if (currentArticles.length > 0) {
+        statusBadge.textContent = `${currentArticles.length}개 뉴스 수집 완료`;
+        statusBadge.className = "status-badge status-ready";
+
+        // 뉴스 목록 표시
+        let listHtml = "";
+        currentArticles.forEach((article, idx) => {
+          listHtml += `
+            <div class="article-card">
+              <div class="article-title">
+                ${idx + 1}. ${escapeHtml(article.title || "(제목 없음)")}
+              </div>
+              ${article.published ? `<div class="article-meta">${escapeHtml(article.published)}</div>` : ""}
+            </div>
+          `;
+        });
+        articlesList.innerHTML = listHtml;
+
+        // 상세 뉴스 표시
+        let detailHtml = `<p class="text-muted mb-2">총 ${currentArticles.length}개의 기사를 찾았습니다.</p>`;
+        currentArticles.forEach((article) => {
+          detailHtml += `
+            <div class="article-card">
+              <div class="article-title">
+                ${article.link ? `<a href="${safeUrl(article.link)}" target="_blank" rel="noopener">${escapeHtml(article.title)}</a>` : escapeHtml(article.title)}
+              </div>
+              ${article.published || article.source ? `<div class="article-meta">${escapeHtml([article.published, article.source].filter(Boolean).join(" · "))}</div>` : ""}
+              <div class="article-summary">${escapeHtml(article.summary_short || article.summary)}</div>
+            </div>
+          `;
+        });
+        articlesContainer.innerHTML = detailHtml;
+
+        // 대화 상태 업데이트
+        document.getElementById("chat-status").textContent = `${currentArticles.length}개 뉴스 준비됨`;
+        document.getElementById("chat-status").className = "status-badge status-ready";
+
+        // 액션 버튼 표시
+        document.getElementById("action-buttons").style.display = "block";
+      } else {
+        statusBadge.textContent = "뉴스를 찾지 못했습니다";
+        statusBadge.className = "status-badge status-waiting";
+        articlesList.innerHTML = '<div class="text-muted">뉴스를 찾지 못했습니다.</div>';
+      }
+    }
+  } catch (err) {
+    const detail = isNetworkError(err) ? NETWORK_MSG : err.message;
+    errorDiv.innerHTML = `<strong>오류 발생</strong><br><small>${escapeHtml(detail)}</small>`;
+    errorDiv.style.display = "block";
+    statusBadge.textContent = "검색 실패";
+    statusBadge.className = "status-badge status-waiting";
+  }
+});
+
+// AI 요약 생성
+async function generateSummary() {
+  if (currentArticles.length === 0) {
+    alert("요약할 뉴스가 없습니다.");
+    return;
+  }
+
+  const summaryBox = document.getElementById("summary-box");
+  const summaryContent = document.getElementById("summary-content");
+  summaryBox.style.display = "block";
+  summaryContent.textContent = "요약 생성 중...";
+
+  try {
+    // 생성되는 대로 요약을 화면에 이어 붙입니다 (SSE 스트리밍)
+    let text = "";
+    await postArticleEventStream("/summarize/stream", { keyword: currentKeyword }, (event) => {
+      if (event.type === "progress") {
+        // 기사가 많으면 묶음별로 나눠 요약한 뒤 합칩니다.
+        summaryContent.textContent = event.stage === "reduce"
+          ? "요약을 합치는 중..."
+          : `기사를 나눠 요약하는 중... (${event.done}/${event.total})`;
+      } else if (event.type === "chunk") {
+        text += event.text;
+        summaryContent.textContent = text;
+      } else if (event.type === "done") {
+        summaryContent.textContent = event.summary;
+      } else if (event.type === "error") {
+        summaryContent.innerHTML = `<strong>오류:</strong> ${escapeHtml(event.message)}<br><small>${escapeHtml(event.details)}</small>`;
+      }
+    });
+  } catch (err) {
+    summaryContent.textContent = isNetworkError(err) ? NETWORK_MSG : ("요약 생성 중 오류: " + err.message);
+  }
+}
+
+// 채팅 기능
+document.getElementById("chat-form").addEventListener("submit", async (e) => {
+  e.preventDefault();
+  const input = document.getElementById("chat-input");
+  const message = input.value.trim();
+  if (!message) return;
+
+  if (currentArticles.length === 0) {
+    alert("먼저 뉴스를 검색해주세요.");
+    return;
+  }
+
+  // 사용자 메시지 표시
+  const chatMessages = document.getElementById("chat-messages");
+  const userMsg = document.createElement("div");
+  userMsg.className = "message user";
+  userMsg.textContent = message;
+  chatMessages.appendChild(userMsg);
+  input.value = "";
+
+  // 로딩 표시
+  const loading = document.getElementById("chat-loading");
+  loading.style.display = "block";
+
+  try {
+    // 첫 토큰이 도착하면 로딩 표시를 숨기고 답변을 이어 붙입니다 (SSE 스트리밍)
+    let botMsg = null;
+    let text = "";
+    const chatBody = { message: message, conversation_id: currentConversationId };
+    await postArticleEventStream("/chat/stream", chatBody, (event) => {
+      if (event.type === "done") {
+        currentConversationId = event.conversation_id || null;
+      } else if (event.type === "chunk") {
+        if (!botMsg) {
+          loading.style.display = "none";
+          botMsg = document.createElement("div");
+          botMsg.className = "message bot";
+          chatMessages.appendChild(botMsg);
+        }
+        text += event.text;
+        botMsg.textContent = text;
+        chatMessages.scrollTop = chatMessages.scrollHeight;
+      } else if (event.type === "error") {
+        const errorMsg = document.createElement("div");
+        errorMsg.className = "message bot";
+        errorMsg.innerHTML = `<strong>오류:</strong> ${escapeHtml(event.message)}<br><small>${escapeHtml(event.details)}</small>`;
+        chatMessages.appendChild(errorMsg);
+      }
+    });
+  } catch (err) {
+    const errorMsg = document.createElement("div");
+    errorMsg.className = "message bot";
+    errorMsg.textContent = isNetworkError(err) ? NETWORK_MSG : ("오류: " + err.message);
+    chatMessages.appendChild(errorMsg);
+  } finally {
+    loading.style.display = "none";
+    chatMessages.scrollTop = chatMessages.scrollHeight;
+  }
+});
+
+// 뉴스 저장하기
+async function saveCurrentNews() {
+  if (!currentKeyword || currentArticles.length === 0) {
+    alert("저장할 뉴스가 없습니다.");
+    return;
+  }
+
+  try {
+    const postSave = async () => {
+      const resp = await fetch(API_BASE + "/save", {
+        method: "POST",
+        headers: { "Content-Type": "application/json" },
+        body: JSON.stringify(articlePayload({ keyword: currentKeyword })),
+      });
+      return resp.json();
+    };
+    let data = await postSave();
+    if (data.expired) {
+      currentResultId = null;
+      data = await postSave();
+    }
+    if (data.success) {
+      alert("뉴스가 저장되었습니다!");
+      loadSavedNews();
+    } else {
+      alert("저장 실패: " + data.error);
+    }
+  } catch (err) {
+    alert(isNetworkError(err) ? NETWORK_MSG : ("저장 중 오류: " + err.message));
+  }
+}
+
+// 저장된 뉴스 불러오기
+// 저장된 뉴스는 기사 본문 없이 한 페이지씩 불러옵니다 (cursor 가 있으면 이어서 불러오기).
+let savedNewsCursor = null;
+async function loadSavedNews(cursor) {
+  if (!cursor) savedSearchQuery = "";
+  const listEl = document.getElementById("saved-news-list");
+  const moreBtn = document.getElementById("saved-news-more");
+  try {
+    const query = cursor ? "?cursor=" + encodeURIComponent(cursor) : "";
+    const resp = await fetch(API_BASE + "/saved" + query);
+    const data = await resp.json();
+    if (!data.success) {
+      throw new Error(data.error || "불러오기 실패");
+    }
+
+    let html = "";
+    data.saved_news.forEach((item) => {
+      html += `
+        <div class="article-card mb-3">
+          <div class="d-flex justify-content-between align-items-center mb-2">
+            <div>
+              <span class="badge bg-primary">${escapeHtml(item.keyword)}</span>
+              <span class="text-muted ms-2">${escapeHtml(item.timestamp)}</span>
+            </div>
+            <span class="badge bg-secondary">${escapeHtml(item.article_count)}개 기사</span>
+          </div>
+        </div>
+      `;
+    });
+    if (cursor) {
+      listEl.insertAdjacentHTML("beforeend", html);
+    } else {
+      listEl.innerHTML = html || '<div class="text-muted">저장된 뉴스가 없습니다.</div>';
+    }
+    savedNewsCursor = data.next_cursor;
+    moreBtn.style.display = savedNewsCursor ? "inline-block" : "none";
+  } catch (err) {
+    const detail = isNetworkError(err) ? NETWORK_MSG : err.message;
+    listEl.innerHTML = '<div class="text-danger">불러오기 오류: ' + escapeHtml(detail) + "</div>";
+    moreBtn.style.display = "none";
+  }
+}
+
+// 저장된 기사 검색 (관련도 순, offset 이 있으면 이어서 불러오기)
+let savedSearchQuery = "";
+let savedSearchOffset = null;
+async function searchSavedNews(query, offset) {
+  const listEl = document.getElementById("saved-news-list");
+  const moreBtn = document.getElementById("saved-news-more");
+  try {
+    let url = API_BASE + "/saved/search?q=" + encodeURIComponent(query);
+    if (offset) url += "&offset=" + offset;
+    const resp = await fetch(url);
+    const data = await resp.json();
+    if (!data.success) {
+      throw new Error(data.error || "검색 실패");
+    }
+
+    let html = "";
+    data.results.forEach((item) => {
+      html += `
+        <div class="article-card mb-3">
+          <div class="article-title">
+            <a href="${safeUrl(item.link)}" target="_blank" rel="noopener">${escapeHtml(item.title)}</a>
+          </div>
+          <div class="text-muted small">
+            <span class="badge bg-primary">${escapeHtml(item.keyword)}</span>
+            <span class="ms-2">${escapeHtml(item.saved_at)} 저장</span>
+          </div>
+        </div>
+      `;
+    });
+    if (offset) {
+      listEl.insertAdjacentHTML("beforeend", html);
+    } else {
+      listEl.innerHTML = html || '<div class="text-muted">검색 결과가 없습니다.</div>';
+    }
+    savedSearchQuery = query;
+    savedSearchOffset = data.next_offset;
+    moreBtn.style.display = savedSearchOffset ? "inline-block" : "none";
+  } catch (err) {
+    const detail = isNetworkError(err) ? NETWORK_MSG : err.message;
+    listEl.innerHTML = '<div class="text-danger">검색 오류: ' + escapeHtml(detail) + "</div>";
+    moreBtn.style.display = "none";
+  }
+}
+
+// "더 보기": 검색 중이면 다음 검색 결과, 아니면 다음 저장 목록
+function loadMoreSaved() {
+  if (savedSearchQuery) {
+    searchSavedNews(savedSearchQuery, savedSearchOffset);
+  } else {
+    loadSavedNews(savedNewsCursor);
+  }
+}
+
+document.getElementById("saved-search-form").addEventListener("submit", (e) => {
+  e.preventDefault();
+  const query = document.getElementById("saved-search-input").value.trim();
+  if (query) {
+    searchSavedNews(query);
+  } else {
+    savedSearchQuery = "";
+    loadSavedNews();
+  }
+});
+
+// 페이지 로드 시
+document.addEventListener("DOMContentLoaded", () => {
+  if (window.location.protocol === "file:") {
+    document.getElementById("server-alert").style.display = "block";
+  }
+  loadSavedNews();
+  document.getElementById("api-key-input").focus();
+});
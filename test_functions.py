@@ -2,9 +2,19 @@
 기능 검증 테스트 스크립트
 모든 기능이 정상 작동하는지 확인합니다.
 """
+import asyncio
+import gzip
 import json
 import os
+import re
+import sqlite3
 import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import feedparser
 from news_chatbot import (
     get_api_key,
     save_api_key,
@@ -15,6 +25,90 @@ from news_chatbot import (
     save_news,
     load_saved_news,
 )
+import news_async
+import news_chatbot
+import news_chatbot_web
+from news_cache import BackgroundRefresher, RateLimiter, SingleFlight, TTLCache, normalize_keyword
+import news_conversation
+import news_http
+import serve
+from news_dedup import canonical_link, unique_article_indices
+from news_retrieval import BM25Index, tokenize
+from news_rss import RssFormatError, parse_rss_items
+from news_store import JsonlStore, SqliteNewsStore
+from news_text import estimate_tokens, lead_sentences, split_sentences
+
+# 테스트가 API 키와 저장 기록을 작업 디렉터리에 남기지 않도록 임시 디렉터리를 씁니다.
+_TEST_DATA_DIR = tempfile.TemporaryDirectory(ignore_cleanup_errors=True)
+news_chatbot.API_KEY_FILE = os.path.join(_TEST_DATA_DIR.name, "api_key.json")
+news_chatbot.SAVED_NEWS_DB = os.path.join(_TEST_DATA_DIR.name, "saved_news.db")
+news_chatbot.SAVED_NEWS_LOG = os.path.join(_TEST_DATA_DIR.name, "saved_news.jsonl")
+news_chatbot.SAVED_NEWS_FILE = os.path.join(_TEST_DATA_DIR.name, "saved_news.json")
+
+
+class StubFeedServer:
+    """Google 뉴스 대신 쓰는 로컬 RSS 서버 (ETag 재검증, 받은 요청 헤더 기록, 응답 지연).
+
+    with 블록 안에서는 news_chatbot.GOOGLE_NEWS_SEARCH_RSS 가 이 서버를 가리키고,
+    검색 결과 캐시와 조건부 GET 검증값은 비어 있는 상태로 시작합니다.
+    """
+
+    ETAG = '"feed-v1"'
+    LAST_MODIFIED = "Mon, 07 Oct 2024 00:00:00 GMT"
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.requests = []  # 받은 요청의 헤더 (dict)
+        self.body = (
+            '<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+            + "".join(
+                f"<item><title>테스트 기사 {i} - 연합뉴스</title><link>https://example.com/{i}</link>"
+                f"<pubDate>Mon, 07 Oct 2024 0{i}:30:00 +0900</pubDate><description>내용 {i}</description></item>"
+                for i in range(3)
+            )
+            + "</channel></rss>"
+        ).encode("utf-8")
+
+    def __enter__(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive (연결 재사용 확인용)
+
+            def do_GET(self):
+                stub.requests.append(dict(self.headers))
+                time.sleep(stub.delay)
+                if self.headers.get("If-None-Match") == stub.ETAG:
+                    self.send_response(304)
+                    self.send_header("ETag", stub.ETAG)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", "application/rss+xml; charset=utf-8")
+                self.send_header("Content-Length", str(len(stub.body)))
+                self.send_header("ETag", stub.ETAG)
+                self.send_header("Last-Modified", stub.LAST_MODIFIED)
+                self.end_headers()
+                self.wfile.write(stub.body)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self._saved_url = news_chatbot.GOOGLE_NEWS_SEARCH_RSS
+        news_chatbot.GOOGLE_NEWS_SEARCH_RSS = f"http://127.0.0.1:{self.server.server_port}/rss?q={{query}}"
+        news_chatbot.clear_news_cache()
+        news_chatbot._feed_validators.clear()
+        return self
+
+    def __exit__(self, *exc):
+        news_chatbot.GOOGLE_NEWS_SEARCH_RSS = self._saved_url
+        news_chatbot.clear_news_cache()
+        news_chatbot._feed_validators.clear()
+        self.server.shutdown()
+        self.server.server_close()
 
 def test_api_key_functions():
     """API 키 관련 기능 테스트"""
@@ -188,6 +282,1273 @@ def test_save_load():
     
     print()
 
+def test_news_cache():
+    """검색 결과 캐시 테스트 (네트워크 불필요)"""
+    print("=" * 60)
+    print("테스트 7: 검색 결과 캐시 (TTL + LRU)")
+    print("=" * 60)
+
+    assert normalize_keyword("  AI   뉴스 ") == normalize_keyword("ai 뉴스"), "키워드 정규화 실패"
+    print("✅ 키워드 정규화 성공")
+
+    cache = TTLCache(maxsize=2, ttl=60)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1, "캐시 조회 실패"
+    cache.set("c", 3)  # 가장 오래 사용하지 않은 "b"가 제거되어야 함
+    assert cache.get("b") is None, "LRU 제거 실패"
+    assert cache.get("c") == 3
+
+    cache.set("d", 4, ttl=-1)  # 이미 만료된 항목
+    assert cache.get("d") is None, "TTL 만료 실패"
+
+    stats = cache.stats()
+    assert stats["hits"] == 2 and stats["misses"] == 2, f"통계 오류: {stats}"
+    assert stats["evictions"] >= 1 and stats["expirations"] == 1
+    print(f"✅ 캐시 동작 확인: {stats}")
+
+    print()
+
+def test_stale_while_revalidate():
+    """만료된 캐시 항목을 먼저 돌려주는지 테스트 (네트워크 불필요)"""
+    print("=" * 60)
+    print("테스트 8: stale-while-revalidate 캐시")
+    print("=" * 60)
+
+    cache = TTLCache(maxsize=10, ttl=-1, stale_ttl=60)  # 저장 즉시 만료
+    cache.set("주식", ["기사"])
+    assert cache.get("주식") is None, "만료된 항목이 신선한 값으로 반환됨"
+    assert cache.get_stale("주식") == (["기사"], False), "오래된 값 조회 실패"
+    print("✅ 만료된 항목을 오래된 값으로 반환")
+
+    limiter = RateLimiter(rate=0.001, burst=2)
+    allowed = [limiter.try_acquire() for _ in range(5)]
+    assert allowed == [True, True, False, False, False], f"속도 제한 오류: {allowed}"
+    print("✅ 백그라운드 갱신 속도 제한 확인")
+
+    # 멈출 때 취소된 대기 작업의 키가 남아 있으면 다시 시작한 뒤 영영 갱신되지 않음
+    refresher = BackgroundRefresher(max_workers=1)
+    release = threading.Event()
+    refresher.submit("실행 중", release.wait, 5)
+    assert refresher.submit("대기 중", time.sleep, 0)
+    refresher.shutdown()
+    assert refresher.stats()["pending"] == 0, refresher.stats()
+    assert refresher.submit("대기 중", time.sleep, 0), "취소된 키가 예약 중으로 남음"
+    release.set()
+    refresher.shutdown(wait=True)
+    print("✅ 멈춘 뒤 취소된 갱신도 다시 예약 가능")
+
+    print()
+
+def test_single_flight():
+    """동시에 들어온 같은 요청이 한 번만 실행되는지 테스트 (네트워크 불필요)"""
+    print("=" * 60)
+    print("테스트 9: 동시 요청 합치기 (single-flight)")
+    print("=" * 60)
+
+    flight = SingleFlight()
+    executions = []
+    results = []
+
+    def slow_fetch():
+        executions.append(1)
+        time.sleep(0.2)
+        return "뉴스"
+
+    threads = [
+        threading.Thread(target=lambda: results.append(flight.do("주식", slow_fetch)))
+        for _ in range(10)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(executions) == 1, f"중복 실행됨: {len(executions)}회"
+    assert results == ["뉴스"] * 10, "결과 공유 실패"
+    stats = flight.stats()
+    assert stats["coalesced"] == 9, f"통계 오류: {stats}"
+    print(f"✅ 10개 요청이 1회 실행으로 합쳐짐: {stats}")
+
+    print()
+
+def test_api_key_store():
+    """API 키 메모리 보관 및 파일 변경 감지 테스트 (네트워크 불필요)"""
+    print("=" * 60)
+    print("테스트 10: API 키 메모리 보관 / 파일 변경 감지")
+    print("=" * 60)
+
+    original_file = news_chatbot.API_KEY_FILE
+    original_interval = news_chatbot.API_KEY_CHECK_INTERVAL
+    with tempfile.TemporaryDirectory() as tmp:
+        news_chatbot.API_KEY_FILE = os.path.join(tmp, "api_key.json")
+        news_chatbot.API_KEY_CHECK_INTERVAL = 0
+        try:
+            assert get_api_key() == "", "키 파일이 없으면 빈 문자열이어야 함"
+            assert save_api_key("AIzaFirstKey") == True
+            assert get_api_key() == "AIzaFirstKey", "저장한 키를 메모리에서 읽지 못함"
+            print("✅ 저장한 키를 메모리에서 반환")
+
+            # 외부에서 파일을 수정한 경우
+            with open(news_chatbot.API_KEY_FILE, "w", encoding="utf-8") as f:
+                json.dump({"api_key": "AIzaEditedKey"}, f)
+            stat = os.stat(news_chatbot.API_KEY_FILE)
+            os.utime(news_chatbot.API_KEY_FILE, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+            assert get_api_key() == "AIzaEditedKey", "외부 변경 감지 실패"
+            print("✅ 외부에서 수정한 키 파일 반영")
+        finally:
+            news_chatbot.API_KEY_FILE = original_file
+            news_chatbot.API_KEY_CHECK_INTERVAL = original_interval
+
+    print()
+
+def test_summary_cache():
+    """같은 기사 묶음의 요약을 캐시에서 돌려주는지 테스트 (네트워크 불필요)"""
+    print("=" * 60)
+    print("테스트 11: 재미나이 요약 캐시 (메모리 + 디스크)")
+    print("=" * 60)
+
+    articles = [
+        {"title": "반도체 수출 증가", "summary": "반도체 수출이  늘었다."},
+        {"title": "환율 하락", "summary": "원달러 환율이 내렸다."},
+    ]
+    original_dir = news_chatbot.SUMMARY_CACHE_DIR
+    original_file = news_chatbot.API_KEY_FILE
+    with tempfile.TemporaryDirectory() as tmp:
+        news_chatbot.SUMMARY_CACHE_DIR = os.path.join(tmp, "summary_cache")
+        news_chatbot.API_KEY_FILE = os.path.join(tmp, "api_key.json")
+        try:
+            save_api_key("AIzaSummaryCacheTest")
+            key = news_chatbot._articles_fingerprint(
+                articles, ("title", "summary"),
+                news_chatbot.SUMMARY_PROMPT_VERSION, news_chatbot.GEMINI_MODEL,
+            )
+            news_chatbot._store_summary(key, "수출은 늘고 환율은 내렸습니다.")
+            news_chatbot._summary_cache.clear()  # 재시작 상황: 메모리 캐시 비우기
+
+            # 공백만 다른 같은 기사 묶음도 같은 키가 되어야 함
+            same_articles = [dict(a, summary=" ".join(a["summary"].split())) for a in articles]
+            result = summarize_with_gemini(same_articles)
+            assert result.get("cached") == True, f"캐시 적중 실패: {result}"
+            assert result["summary"] == "수출은 늘고 환율은 내렸습니다."
+            print("✅ 디스크 캐시에서 요약 복원")
+
+            assert summarize_with_gemini(articles).get("cached") == True
+            stats = news_chatbot.get_runtime_stats()["summary_cache"]
+            assert stats["disk_hits"] >= 1 and stats["memory_hits"] >= 1, f"통계 오류: {stats}"
+            print(f"✅ 요약 캐시 적중률: {stats['hit_rate']}")
+        finally:
+            news_chatbot.SUMMARY_CACHE_DIR = original_dir
+            news_chatbot.API_KEY_FILE = original_file
+
+    print()
+
+def test_result_sets():
+    """서버 보관 검색 결과(result_id)와 메모리 한도 테스트 (네트워크 불필요)"""
+    print("=" * 60)
+    print("테스트 12: 서버 보관 검색 결과 (result_id)")
+    print("=" * 60)
+
+    articles = [{"title": "기사", "summary": "내용", "link": "https://example.com/1"}]
+    result_id = news_chatbot.create_result_set("경제", articles)
+    result_set = news_chatbot.get_result_set(result_id)
+    assert result_set["keyword"] == "경제" and result_set["articles"] == articles, "검색 결과 조회 실패"
+    assert news_chatbot.get_result_set("없는-아이디") is None
+    print("✅ result_id 로 검색 결과 조회")
+
+    cache = TTLCache(maxsize=100, ttl=60, max_weight=10, weigher=len)
+    cache.set("a", "12345")
+    cache.set("b", "12345")
+    cache.set("c", "123")  # 크기 합계 13 > 10 → 가장 오래된 "a" 제거
+    assert "a" not in cache and "b" in cache and "c" in cache, "메모리 한도 초과 시 제거 실패"
+    assert cache.stats()["weight"] == 8, f"크기 합계 오류: {cache.stats()}"
+    print("✅ 메모리 한도(크기 합계) 기준 제거 확인")
+
+    print()
+
+def test_conversation_history():
+    """여러 번 주고받는 대화 기록과 토큰 예산 테스트 (네트워크 불필요)"""
+    print("=" * 60)
+    print("테스트 13: 대화 기록과 토큰 예산")
+    print("=" * 60)
+
+    articles = [{"title": f"기사 {i}", "summary": "경제 관련 내용 " * 20, "published": ""} for i in range(3)]
+    first = news_chatbot.get_conversation(None, articles)
+    assert news_chatbot.get_conversation(first.id, articles) is first, "같은 대화를 찾지 못함"
+    changed = news_chatbot.get_conversation(first.id, articles[:1])
+    assert changed.id != first.id, "기사 목록이 바뀌면 새 대화를 시작해야 함"
+    print("✅ conversation_id 로 대화 이어가기 / 새 검색이면 새 대화")
+
+    conversation = news_conversation.Conversation("test", "key", [{"title": "기사", "summary": "본문"}])
+    conversation.add_turn("첫 질문입니다", "첫 답변입니다")
+    assert "첫 질문입니다" in conversation.build_prompt("두 번째 질문"), "이전 대화가 프롬프트에 없음"
+
+    for i in range(200):
+        conversation.add_turn(f"질문 {i} " + "가" * 50, f"답변 {i} " + "나" * 200)
+    prompt = conversation.build_prompt("마지막 질문")
+    budget = (
+        news_conversation.CHAT_HISTORY_TOKEN_BUDGET
+        + news_conversation.CHAT_DIGEST_TOKEN_BUDGET
+        + 200  # 안내 문구, 기사 본문, 질문
+    )
+    assert estimate_tokens(prompt) <= budget, f"프롬프트가 예산을 넘음: {estimate_tokens(prompt)}"
+    assert "답변 199" in prompt, "가장 최근 대화가 빠짐"
+    assert conversation.digest and "질문 0 " not in prompt, "오래된 대화가 정리되지 않음"
+    print(f"✅ 200번 대화 후 프롬프트 약 {estimate_tokens(prompt)} 토큰 (예산 {budget})")
+
+    context = news_conversation.build_article_context(
+        [{"title": "제목", "summary": "가" * 3000}] * 10, token_budget=5000
+    )
+    assert "생략" in context and estimate_tokens(context) <= 5100, "기사 본문 예산 초과"
+    print("✅ 기사 본문 토큰 예산 확인")
+
+    class Response:
+        def __init__(self, text):
+            self.text = text
+
+    class SlowModel:
+        def __init__(self):
+            self.calls = 0
+
+        def generate_content(self, prompt):
+            self.calls += 1
+            time.sleep(0.2)
+            return Response(f"답변 {self.calls}")
+
+    api_key = "AIza-chat-flight-test"
+    model = SlowModel()
+    original_key_file = news_chatbot.API_KEY_FILE
+    with tempfile.TemporaryDirectory() as tmp:
+        news_chatbot.API_KEY_FILE = os.path.join(tmp, "api_key.json")
+        try:
+            save_api_key(api_key)
+            news_chatbot._gemini_models.set((api_key, news_chatbot.GEMINI_MODEL), model)
+            shared = [{"title": f"같은 기사 {i} {time.time()}", "summary": "내용", "published": ""} for i in range(3)]
+            results = []
+            threads = [
+                threading.Thread(target=lambda: results.append(chat_with_gemini(shared, "무슨 일이 있었나요?")))
+                for _ in range(4)
+            ]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            assert model.calls == 1, f"같은 첫 질문이 합쳐지지 않음: {model.calls}번 생성"
+            ids = {r["conversation_id"] for r in results}
+            assert len(ids) == 4 and all(r["response"] == "답변 1" for r in results), results
+            assert all(news_chatbot._conversations.get(i).total_turns == 1 for i in ids), "각 대화에 답변이 기록되지 않음"
+            print("✅ 새 대화 4개의 같은 첫 질문은 한 번만 생성하고 각 대화에 기록")
+
+            follow_up = chat_with_gemini(shared, "더 자세히", results[0]["conversation_id"])
+            assert model.calls == 2 and follow_up["conversation_id"] == results[0]["conversation_id"]
+            assert news_chatbot._conversations.get(results[1]["conversation_id"]).total_turns == 1, "다른 대화에 섞임"
+            print("✅ 이어지는 질문은 대화별로 생성")
+        finally:
+            news_chatbot.API_KEY_FILE = original_key_file
+            news_chatbot.invalidate_gemini_models(api_key)
+
+    print()
+
+def test_retrieval():
+    """질문과 관련된 기사만 고르는 로컬 검색(BM25) 테스트 (네트워크 불필요)"""
+    print("=" * 60)
+    print("테스트 14: 관련 기사 검색 (BM25)")
+    print("=" * 60)
+
+    assert {"인공지능은", "인공", "지능"} <= set(tokenize("인공지능은")), "한글 2-gram 토큰화 실패"
+    print("✅ 한글 글자 2-gram 토큰화")
+
+    articles = [{"title": f"날씨 소식 {i}", "summary": "맑고 따뜻한 날씨", "published": ""} for i in range(100)]
+    articles[42] = {"title": "인공지능 반도체 투자 확대", "summary": "삼성전자가 HBM 라인을 늘린다", "published": ""}
+    articles[7] = {"title": "반도체 수출 증가", "summary": "수출 실적 발표", "published": ""}
+    index = BM25Index(articles)
+
+    hits = index.search("인공지능 반도체 투자는 어떻게 되나요?", k=5)
+    assert hits[0][0] == 42 and hits[1][0] == 7, f"관련 기사 순위 오류: {hits}"
+    assert len(hits) == 2, "점수가 0인 기사는 보내지 않아야 함"
+    print(f"✅ 100개 중 관련 기사 선택: {hits}")
+
+    assert [i for i, _ in index.search("오늘 뉴스 정리해줘", k=3)] == [0, 1, 2], "관련 기사가 없을 때 기본 선택 오류"
+    budget_hits = index.search("날씨", k=50, token_budget=100)
+    assert sum(index.costs[i] for i, _ in budget_hits) <= 100, "토큰 예산 초과"
+    print("✅ 기본 선택 / 토큰 예산 확인")
+
+    print()
+
+def test_map_reduce_summary():
+    """많은 기사를 묶음별로 나눠 요약한 뒤 합치는지 테스트 (재미나이 호출 없이 가짜 모델 사용)"""
+    print("=" * 60)
+    print("테스트 15: 묶음별 요약 (map-reduce)")
+    print("=" * 60)
+
+    class Response:
+        def __init__(self, text):
+            self.text = text
+
+    class FakeModel:
+        """묶음 요약 요청마다 짧은 정리를 돌려주고, 첫 번째 묶음은 한 번 실패합니다."""
+        def __init__(self):
+            self.lock = threading.Lock()
+            self.prompts = []
+            self.active = 0
+            self.max_active = 0
+            self.failed = False
+
+        def generate_content(self, prompt):
+            with self.lock:
+                self.prompts.append(prompt)
+                self.active += 1
+                self.max_active = max(self.max_active, self.active)
+            try:
+                time.sleep(0.02)
+                if "[기사 1]" in prompt and not self.failed:
+                    self.failed = True
+                    raise RuntimeError("일시적인 오류")
+                return Response("묶음 정리")
+            finally:
+                with self.lock:
+                    self.active -= 1
+
+    articles = [{"title": f"뉴스 {i}", "summary": "경제 관련 소식 " * 40} for i in range(200)]
+    original_backoff = news_chatbot.SUMMARY_RETRY_BACKOFF
+    news_chatbot.SUMMARY_RETRY_BACKOFF = 0
+    try:
+        model = FakeModel()
+        events = []
+        prompt = news_chatbot._final_summary_prompt(model, articles, progress=events.append)
+    finally:
+        news_chatbot.SUMMARY_RETRY_BACKOFF = original_backoff
+
+    chunks = len(news_chatbot._pack_blocks(
+        news_chatbot._summary_blocks(articles), news_chatbot.SUMMARY_CHUNK_TOKENS
+    ))
+    assert chunks > 1, "묶음이 나뉘지 않음"
+    assert len(model.prompts) == chunks + 1, f"실패한 묶음만 다시 시도해야 함: {len(model.prompts)}"
+    assert model.max_active <= news_chatbot.SUMMARY_MAP_WORKERS, "동시 실행 수 제한 초과"
+    assert estimate_tokens(prompt) <= news_chatbot.SUMMARY_CHUNK_TOKENS and "[묶음 1]" in prompt
+    assert events[-1] == {"stage": "reduce"} and events[-2]["done"] == chunks, f"진행 상황 오류: {events[-2:]}"
+    print(f"✅ 기사 200개 → 묶음 {chunks}개 요약 후 합치기 (최대 동시 {model.max_active}개)")
+
+    model = FakeModel()
+    news_chatbot._final_summary_prompt(model, articles)
+    assert model.prompts == [], "이미 요약한 묶음은 캐시를 사용해야 함"
+    print("✅ 묶음 요약 캐시 재사용")
+
+    print()
+
+def test_incremental_summary():
+    """다시 검색한 기사 중 새 기사만 이전 요약에 반영하는지 테스트 (네트워크 불필요)"""
+    print("=" * 60)
+    print("테스트 16: 새 기사만 반영하는 요약")
+    print("=" * 60)
+
+    old = [{"title": f"기사 {i}", "summary": "내용", "link": f"https://example.com/{i}"} for i in range(10)]
+    news_chatbot._remember_summary("반도체", old, "이전 요약입니다.")
+
+    new = old[2:] + [{"title": "새 기사", "summary": "새 내용", "link": "https://example.com/new"}]
+    plan = news_chatbot._incremental_plan(new, " 반도체 ")
+    assert plan is not None and [a["title"] for a in plan["new_articles"]] == ["새 기사"], f"새 기사 찾기 실패: {plan}"
+    prompt = news_chatbot._summary_prompt_plan(None, new, "반도체")["prompt"]
+    assert "이전 요약입니다." in prompt and "새 기사" in prompt and "기사 5" not in prompt, "증분 프롬프트 오류"
+    print("✅ 새 기사 1개만 이전 요약에 반영")
+
+    same = news_chatbot._summary_prompt_plan(None, old, "반도체")
+    assert same["prompt"] is None and same["summary"] == "이전 요약입니다.", "새 기사가 없으면 이전 요약 재사용"
+    print("✅ 새 기사가 없으면 재미나이 호출 없이 이전 요약 사용")
+
+    different = [{"title": f"다른 기사 {i}", "summary": "내용"} for i in range(10)]
+    assert news_chatbot._incremental_plan(different, "반도체") is None, "겹치는 기사가 적으면 전체 요약"
+    assert news_chatbot._incremental_plan(new, "다른 주제") is None
+    print("✅ 겹치는 기사가 적거나 주제가 다르면 전체 요약")
+
+    class Response:
+        def __init__(self, text):
+            self.text = text
+
+    class SlowModel:
+        def generate_content(self, prompt):
+            time.sleep(0.2)
+            return Response("이어서 쓴 요약" if "[이전 요약]" in prompt else "전체 요약")
+
+    api_key = "AIza-incremental-test"
+    original_key_file = news_chatbot.API_KEY_FILE
+    with tempfile.TemporaryDirectory() as tmp:
+        news_chatbot.API_KEY_FILE = os.path.join(tmp, "api_key.json")
+        try:
+            save_api_key(api_key)
+            news_chatbot._gemini_models.set((api_key, news_chatbot.GEMINI_MODEL), SlowModel())
+            stamp = time.time()
+            # 제목이 서로 비슷하면 중복 기사로 합쳐져 캐시 키가 달라지므로 뚜렷이 다른 제목을 씁니다.
+            topics = ["반도체", "배터리", "자동차", "조선", "철강", "항공", "게임", "통신", "금융", "유통"]
+            base = [
+                {"title": f"{word} 업계 동향", "summary": f"{word} 내용 {stamp}", "link": f"https://example.com/{stamp}/{i}"}
+                for i, word in enumerate(topics)
+            ]
+            news_chatbot._remember_summary("메모리", base, "이전 요약입니다.")
+            grown = base[2:] + [{"title": "새로 나온 바이오 소식", "summary": f"새 내용 {stamp}", "link": f"https://example.com/{stamp}/new"}]
+            assert len(news_chatbot.dedupe_articles(grown)) == len(grown)
+            results = {}
+            threads = [
+                threading.Thread(target=lambda t=topic: results.__setitem__(t, news_chatbot.summarize_with_gemini(grown, topic=t)))
+                for topic in ("메모리", "배터리")
+            ]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            assert results["메모리"]["summary"] == "이어서 쓴 요약" and results["메모리"]["incremental"], results
+            assert results["배터리"]["summary"] == "전체 요약" and not results["배터리"]["incremental"], results
+            assert news_chatbot._previous_summaries.get("배터리")["summary"] == "전체 요약", "다른 주제의 이전 요약이 기억되지 않음"
+            assert news_chatbot._previous_summaries.get("메모리")["chain"] == 1
+            print("✅ 주제가 다른 동시 요약은 따로 생성하고 각 주제의 이전 요약으로 기억")
+
+            assert news_chatbot._cached_summary(grown, None) == "전체 요약", "이어서 쓴 요약이 전체 요약 캐시에 저장됨"
+            topic_key = news_chatbot._summary_cache_key(grown, " 메모리 ")
+            assert news_chatbot._summary_cache.get(topic_key) == "이어서 쓴 요약", "주제별 캐시 키에 저장되지 않음"
+            print("✅ 이어서 쓴 요약은 주제별 캐시 키에 저장")
+        finally:
+            news_chatbot.API_KEY_FILE = original_key_file
+            news_chatbot.invalidate_gemini_models(api_key)
+
+    print()
+
+def test_jsonl_store():
+    """추가 전용 JSONL 저장소 테스트 (변환, 동시 저장, 잘린 줄 복구, 정리)"""
+    print("=" * 60)
+    print("테스트 17: 추가 전용 저장 파일 (JSONL)")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy = os.path.join(tmp, "saved_news.json")
+        with open(legacy, "w", encoding="utf-8") as f:
+            json.dump([{"keyword": "예전", "timestamp": "", "articles": []}], f, ensure_ascii=False)
+
+        store = JsonlStore(os.path.join(tmp, "saved_news.jsonl"), fsync=False)
+        assert store.migrate_json_array(legacy) == 1, "예전 JSON 파일 변환 실패"
+        assert store.migrate_json_array(legacy) == 0, "변환은 한 번만 해야 함"
+        assert os.path.exists(legacy + ".migrated")
+        print("✅ 예전 JSON 배열 파일을 한 번만 변환")
+
+        def save_many(prefix):
+            for i in range(25):
+                store.append({"keyword": f"{prefix}-{i}", "articles": [{"title": "제목" * 50}]})
+
+        threads = [threading.Thread(target=save_many, args=(n,)) for n in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert len(store.read_all()) == 1 + 8 * 25, "동시 저장 중 기록 유실"
+        print("✅ 8개 스레드 동시 저장 200건 유실 없음")
+
+        with open(store.path, "ab") as f:
+            f.write(b'{"keyword": "cut')  # 저장 도중 종료된 상황
+        store.append({"keyword": "다음"})
+        records = store.read_all()
+        assert len(records) == 202 and records[-1]["keyword"] == "다음", "잘린 줄 복구 실패"
+        print("✅ 잘린 마지막 줄은 건너뛰고 다음 저장은 정상")
+
+        assert store.compact(keep=lambda r: r["keyword"] != "예전") == 201
+        with open(store.path, "rb") as f:
+            assert b"cut" not in f.read(), "정리 후에도 잘린 줄이 남음"
+        print("✅ 정리(compact) 후 잘린 줄 / 삭제한 기록 제거")
+
+    print()
+
+def test_sqlite_store():
+    """SQLite 저장소의 페이지 조회, 기사 중복 제거, 예전 기록 변환 테스트"""
+    print("=" * 60)
+    print("테스트 18: SQLite 저장소와 페이지 조회")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = SqliteNewsStore(os.path.join(tmp, "saved_news.db"), fsync=False)
+        legacy = [{"keyword": "예전", "timestamp": "2024-01-01 00:00:00", "articles": [{"title": "옛 기사", "link": "https://example.com/old"}]}]
+        assert store.import_if_empty(lambda: legacy) == 1, "예전 기록 가져오기 실패"
+        assert store.import_if_empty(lambda: legacy) == 0, "비어 있지 않으면 가져오지 않아야 함"
+        print("✅ 예전 기록을 한 번만 가져오기")
+
+        for i in range(45):
+            articles = [{"title": f"기사 {j}", "link": f"https://example.com/{j}", "summary": "내용"} for j in range(5)]
+            store.append({"keyword": "경제" if i % 3 else " AI ", "timestamp": f"2024-02-{i % 28 + 1:02d}", "articles": articles})
+
+        first = store.list_searches(limit=20)
+        assert len(first["items"]) == 20 and "articles" not in first["items"][0], "가벼운 목록 형식 오류"
+        assert first["items"][0]["id"] == 46 and first["items"][0]["article_count"] == 5
+        ids = [item["id"] for item in first["items"]]
+        cursor = first["next_cursor"]
+        while cursor is not None:
+            page = store.list_searches(limit=20, cursor=cursor)
+            ids += [item["id"] for item in page["items"]]
+            cursor = page["next_cursor"]
+        assert ids == list(range(46, 0, -1)), "커서 페이지 순서 오류"
+        print("✅ 커서 페이지로 46건을 최신 순으로 빠짐없이 조회")
+
+        ai = store.list_searches(limit=100, keyword="ai")["items"]
+        assert len(ai) == 15 and all(item["keyword"] == " AI " for item in ai), "키워드 필터 오류"
+        conn = store._connect()
+        assert conn.execute("SELECT COUNT(*) FROM articles").fetchone()[0] == 6, "같은 링크의 기사는 한 번만 저장"
+        print("✅ 정규화된 키워드 필터 / 링크 기준 기사 중복 제거")
+
+        records = store.read_all()
+        assert records[0]["keyword"] == "예전" and records[0]["articles"][0]["title"] == "옛 기사"
+        assert store.get_search(46)["articles"][4]["link"] == "https://example.com/4"
+        print("✅ 예전 load_saved_news 형식 / 한 건 조회")
+
+        # close() 는 다른 스레드(워커 스레드)가 연 연결까지 닫아야 함
+        opened = []
+        worker = threading.Thread(target=lambda: opened.append(store._connect()))
+        worker.start()
+        worker.join()
+        store.close()
+        try:
+            opened[0].execute("SELECT 1")
+            raise AssertionError("다른 스레드의 연결이 닫히지 않음")
+        except sqlite3.ProgrammingError:
+            pass
+        assert store.stats()["articles"] == 6, "닫은 뒤 다시 열어 쓰지 못함"
+        print("✅ close() 가 모든 스레드의 연결을 닫음")
+
+        assert store.compact(keep=lambda r: r["keyword"] != "예전") == 45
+        count = store._connect().execute("SELECT COUNT(*) FROM articles").fetchone()[0]
+        assert store.stats()["articles"] == count == 5, f"기사 수 카운터 오류: {store.stats()['articles']} != {count}"
+        store.close()
+        print("✅ 기사 수 카운터 (저장 / 정리 후)")
+
+    print()
+
+def test_saved_search():
+    """저장된 기사 전문 검색 테스트 (FTS5 trigram / 짧은 검색어 / 기간 / 페이지)"""
+    print("=" * 60)
+    print("테스트 19: 저장된 기사 전문 검색")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "saved_news.db")
+        store = SqliteNewsStore(path, fsync=False)
+        store.append({"keyword": "반도체", "timestamp": "2024-01-10 09:00:00", "articles": [
+            {"title": "삼성전자 인공지능 반도체 투자", "link": "https://example.com/1", "summary": "HBM 생산 확대"},
+            {"title": "환율 하락", "link": "https://example.com/2", "summary": "반도체 수출 호조로 원화 강세"},
+        ]})
+        store.append({"keyword": "AI", "timestamp": "2024-03-05 09:00:00", "articles": [
+            {"title": "AI 스타트업 투자 급증", "link": "https://example.com/3", "summary": "인공지능 분야 벤처 투자"},
+        ] + [{"title": f"경제 소식 {i}", "link": f"https://example.com/e{i}", "summary": "경제"} for i in range(30)]})
+
+        hits = store.search("반도체")["items"]
+        assert [h["link"] for h in hits] == ["https://example.com/1", "https://example.com/2"], f"순위 오류: {hits}"
+        assert hits[0]["score"] > hits[1]["score"] and hits[0]["keyword"] == "반도체"
+        print(f"✅ 제목 일치가 먼저 (FTS5 사용: {store.fts})")
+
+        assert [h["link"] for h in store.search("AI 투자")["items"]] == ["https://example.com/3"], "두 글자 검색어 오류"
+        statements = []
+        store._connect().set_trace_callback(statements.append)
+        assert [h["link"] for h in store.search("환율")["items"]] == ["https://example.com/2"], "두 글자 검색어 오류"
+        store._connect().set_trace_callback(None)
+        assert not store.fts or not any("LIKE" in s for s in statements), "두 글자 검색어가 색인 없이 전체를 훑음"
+        ranged = store.search("인공지능", date_from="2024-03-01", date_to="2024-03-31")["items"]
+        assert [h["link"] for h in ranged] == ["https://example.com/3"], "기간 필터 오류"
+        print("✅ 두 글자 검색어 / 저장 기간 필터")
+
+        first = store.search("경제", limit=20)
+        second = store.search("경제", limit=20, offset=first["next_offset"])
+        assert len(first["items"]) == 20 and len(second["items"]) == 10 and second["next_offset"] is None
+        print("✅ 페이지 나누기")
+
+        # 색인 없이 만든 예전 DB 는 다시 열 때 색인을 채워야 함
+        conn = store._connect()
+        conn.executescript(
+            "DROP TRIGGER articles_fts_insert; DROP TRIGGER articles_fts_delete;"
+            " DROP TRIGGER articles_fts_update; DROP TABLE articles_fts;"
+            " DROP TRIGGER articles_bigrams_delete; DROP TABLE articles_bigrams;"
+        )
+        store.close()
+        reopened = SqliteNewsStore(path, fsync=False)
+        assert len(reopened.search("반도체")["items"]) == 2, "예전 DB 색인 생성 실패"
+        assert [h["link"] for h in reopened.search("환율")["items"]] == ["https://example.com/2"], "예전 DB 2-gram 색인 생성 실패"
+        records = reopened.read_all()
+        print("✅ 예전 DB 에 색인 추가")
+
+        # 여러 워커가 동시에 열어도 색인은 한 번만 만들고 모두 FTS 를 써야 함
+        if reopened.fts:
+            reopened._connect().executescript(
+                "DROP TRIGGER articles_fts_insert; DROP TRIGGER articles_fts_delete;"
+                " DROP TRIGGER articles_fts_update; DROP TABLE articles_fts;"
+            )
+            barrier = threading.Barrier(6)
+            opened = []
+
+            def open_store():
+                barrier.wait()
+                worker = SqliteNewsStore(path, fsync=False)
+                opened.append(worker.fts)
+                worker.close()
+
+            threads = [threading.Thread(target=open_store) for _ in range(6)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+            assert opened == [True] * 6, f"동시에 연 저장소 중 FTS 를 못 쓰는 것이 있음: {opened}"
+            assert len(reopened.search("반도체")["items"]) == 2
+            print("✅ 동시에 열어도 모두 FTS 사용")
+        reopened.close()
+
+        jsonl = JsonlStore(os.path.join(tmp, "saved_news.jsonl"), fsync=False)
+        for record in records:
+            jsonl.append(record)
+        assert jsonl.search("반도체")["items"][0]["link"] == "https://example.com/1", "JSONL 검색 오류"
+        print("✅ JSONL 저장소 검색")
+
+    print()
+
+def test_article_dedup():
+    """중복 기사 판별 / 저장소 기사 합치기 / 대화 프롬프트 중복 제거 테스트"""
+    print("=" * 60)
+    print("테스트 20: 중복 기사 합치기")
+    print("=" * 60)
+
+    assert canonical_link("http://www.Example.com/news/1/?utm_source=rss&id=7&oc=5#top") == \
+        "https://example.com/news/1?id=7", "링크 정규화 오류"
+    articles = [
+        {"title": "삼성전자, 3분기 영업이익 10조 돌파 - 연합뉴스", "link": "https://a.example/1?oc=5", "published": "2024-01-01 08:00"},
+        {"title": "삼성전자 3분기 영업이익 10조 돌파 - 한국경제", "link": "https://b.example/2", "published": "2024-01-01 08:40"},
+        {"title": "LG에너지솔루션 미국 배터리 공장 착공", "link": "https://c.example/3", "published": "2024-01-01 07:00"},
+        {"title": "삼성전자, 3분기 영업이익 10조 돌파 - 연합뉴스", "link": "http://a.example/1/", "published": "2024-01-01 08:00"},
+        {"title": "오늘의 날씨", "link": "", "summary": "맑음"},
+        {"title": "오늘의 날씨", "link": "", "summary": "비"},
+    ]
+    assert unique_article_indices(articles) == [0, 2, 4, 5], "중복 판별 오류"
+    print("✅ 링크 정규화 / 다른 언론사의 같은 기사 / 짧은 제목은 내용으로 구분")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "saved_news.db")
+        store = SqliteNewsStore(path, fsync=False)
+        store.append({"keyword": "삼성", "timestamp": "2024-01-01 09:00:00", "articles": articles})
+        store.append({"keyword": "경제", "timestamp": "2024-01-02 09:00:00", "articles": articles[1:3]})
+        assert [len(r["articles"]) for r in store.read_all()] == [4, 2], "검색별 기사 연결 오류"
+        assert store.stats()["articles"] == 4, "같은 기사가 여러 번 저장됨"
+        print("✅ 같은 기사는 한 번만 저장")
+
+        # 매일 같은 제목으로 나오는 기사는 날짜가 다르면 다른 기사
+        daily = "코스피 마감 시황 외국인 순매수 - 연합뉴스"
+        store.append({"keyword": "증시", "timestamp": "2024-01-02 16:00:00", "articles": [
+            {"title": daily, "link": "https://yna.example/market/0102", "published": "2024-01-02 15:40"},
+        ]})
+        store.append({"keyword": "증시", "timestamp": "2024-01-03 16:00:00", "articles": [
+            {"title": daily, "link": "https://yna.example/market/0103", "published": "2024-01-03 15:40"},
+        ]})
+        latest = store.read_all()[-1]["articles"]
+        assert [a["link"] for a in latest] == ["https://yna.example/market/0103"], f"다른 날 기사와 합쳐짐: {latest}"
+        assert latest[0]["published"] == "2024-01-03 15:40" and store.stats()["articles"] == 6
+        conn = store._connect()
+        conn.execute("DELETE FROM searches WHERE keyword = '증시'")
+        conn.execute("DELETE FROM articles WHERE link LIKE 'https://yna.example/%'")
+        conn.commit()
+        print("✅ 제목이 같아도 발행일이 다르면 따로 저장")
+
+        # 합치기 전의 예전 DB: 같은 기사가 따로 저장되어 있음
+        conn = store._connect()
+        conn.executescript(
+            "DROP INDEX idx_articles_canonical; DELETE FROM article_bands;"
+            " UPDATE articles SET canonical_key = NULL, minhash = NULL;"
+            " INSERT INTO articles (id, link, title, published) VALUES (100, 'https://www.b.example/2?oc=1', '삼성전자 3분기 영업이익 10조 돌파 - 한국경제', '2024-01-01 09:10');"
+            " UPDATE search_articles SET article_id = 100 WHERE search_id = 2 AND position = 0;"
+            " PRAGMA user_version = 0;"
+        )
+        store.close()
+        reopened = SqliteNewsStore(path, fsync=False)
+        assert reopened.merged_on_upgrade == 1 and reopened.stats()["articles"] == 4, "예전 DB 기사 합치기 실패"
+        assert [len(r["articles"]) for r in reopened.read_all()] == [4, 2]
+        reopened.close()
+        print("✅ 예전 DB 의 중복 기사 합치기")
+
+    conversation = news_chatbot.get_conversation(None, articles)
+    assert len(conversation.articles) == 4 and conversation.numbers == [1, 3, 5, 6], "대화 기사 중복 제거 오류"
+    assert "[기사 3]" in conversation.article_context and "[기사 2]" not in conversation.article_context
+    print("✅ 대화 프롬프트에서 중복 기사 제외 (기사 번호는 원래 목록 기준)")
+
+    print()
+
+def test_sentence_split():
+    """문장 나누기 / 간단 요약 테스트 (한국어 어미, HTML, 약어)"""
+    print("=" * 60)
+    print("테스트 21: 문장 나누기")
+    print("=" * 60)
+
+    text = "정부는 다주택자 규제를 완화한다고 밝혔다. 다음 달부터 시행된다. 세 번째 문장이다."
+    assert split_sentences(text) == [
+        "정부는 다주택자 규제를 완화한다고 밝혔다.", "다음 달부터 시행된다.", "세 번째 문장이다."
+    ], "단어 중간의 '다'에서 문장을 나눔"
+    print("✅ 단어 중간의 '다'/'요'는 문장 끝이 아님")
+
+    assert split_sentences("삼성전자가 &quot;AI 반도체&quot;를 발표했다<br/>출시는 내년이에요<br>끝") == [
+        '삼성전자가 "AI 반도체"를 발표했다', "출시는 내년이에요", "끝"
+    ], "HTML 처리 오류"
+    assert split_sentences("Dr. Kim met U.S. officials at 3 p.m. today. Talks ended!") == [
+        "Dr. Kim met U.S. officials at 3 p.m. today.", "Talks ended!"
+    ], "약어 처리 오류"
+    print("✅ HTML 줄바꿈/엔티티, 영문 약어")
+
+    long_text = "<p>" + "첫 문장이다. 두 번째 문장이다. " + "본문이 이어진다. " * 20000 + "</p>"
+    assert lead_sentences(long_text, 2) == "첫 문장이다. 두 번째 문장이다."
+    assert news_chatbot.simple_summarize("") == "(요약할 내용이 없습니다.)"
+    assert news_chatbot.simple_summarize_batch(["가 문장이다. 나 문장이다. 다", "", "가 문장이다. 나 문장이다. 다"], 1) == [
+        "가 문장이다.", "(요약할 내용이 없습니다.)", "가 문장이다."
+    ]
+    print("✅ 긴 설명의 앞 문장 / 일괄 요약")
+
+    print()
+
+def test_feed_cleaning():
+    """RSS 제목/내용 정리 테스트 (태그, 엔티티, 언론사 표기, 절약한 토큰 수)"""
+    print("=" * 60)
+    print("테스트 22: RSS 기사 내용 정리")
+    print("=" * 60)
+
+    description = (
+        '<ol><li><a href="https://news.google.com/rss/articles/abc?oc=5" target="_blank">'
+        "반도체 수출 &quot;역대 최대&quot;</a>&nbsp;&nbsp;<font color=\"#6f6f6f\">연합뉴스</font></li>"
+        '<li><a href="https://news.google.com/rss/articles/def?oc=5">환율   하락</a>'
+        '&nbsp;&nbsp;<font color="#6f6f6f">한국경제</font></li></ol>'
+    )
+    xml = (
+        '<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel><title>t</title>'
+        "<item><title>반도체 수출 &quot;역대 최대&quot; - 연합뉴스</title>"
+        "<link>https://news.google.com/rss/articles/abc?oc=5</link>"
+        f"<description><![CDATA[{description}]]></description>"
+        '<source url="https://www.yna.co.kr">연합뉴스</source></item>'
+        "</channel></rss>"
+    )
+    before = news_chatbot.get_runtime_stats()["feeds"]["tokens_saved"]
+    articles = news_chatbot._parse_entries(feedparser.parse(xml.encode("utf-8")).entries)
+    assert articles[0]["title"] == '반도체 수출 "역대 최대"', f"제목 정리 오류: {articles[0]['title']}"
+    assert articles[0]["summary"] == '반도체 수출 "역대 최대" 환율 하락', f"내용 정리 오류: {articles[0]['summary']}"
+    assert articles[0]["source"] == "연합뉴스"
+    print("✅ 태그/엔티티/언론사 표기 제거, 언론사는 source 필드로")
+
+    saved = news_chatbot.get_runtime_stats()["feeds"]["tokens_saved"] - before
+    assert saved > 0, "절약한 토큰 수가 집계되지 않음"
+    print(f"✅ 기사 1개에서 프롬프트 토큰 약 {saved}개 절약")
+
+    # 제목의 <작품명> 과 본문의 이스케이프된 부등호는 글자 그대로 남아야 함
+    titled = (
+        '<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>'
+        "<item><title>넷플릭스 &lt;오징어 게임2&gt; 공개 - 연합뉴스</title>"
+        "<link>https://example.com/x</link>"
+        "<description>&lt;b&gt;시청률&lt;/b&gt; a &amp;lt; b and c &amp;gt; d</description>"
+        '<source url="https://www.yna.co.kr">연합뉴스</source></item>'
+        "</channel></rss>"
+    ).encode("utf-8")
+    for entries in (parse_rss_items(titled, 10), feedparser.parse(titled).entries):
+        article = news_chatbot._parse_entries(entries)[0]
+        assert article["title"] == "넷플릭스 <오징어 게임2> 공개", article["title"]
+        assert article["summary"] == "시청률 a < b and c > d", article["summary"]
+    assert news_chatbot.html_to_text("a &lt; b and c &gt; d") == "a < b and c > d"
+    print("✅ 제목의 <작품명> 과 &lt;/&gt; 글자 유지")
+
+    print()
+
+def test_rss_parser():
+    """Google 뉴스 RSS 전용 파서 테스트 (feedparser 와 같은 결과, 필요한 항목만, 대체 파싱)"""
+    print("=" * 60)
+    print("테스트 23: RSS 파서")
+    print("=" * 60)
+
+    items = "".join(
+        f"<item><title>기사 {i} &amp; 속보 - 연합뉴스</title><link>https://example.com/{i}</link>"
+        f"<pubDate>Mon, 07 Oct 2024 0{i}:30:00 +0900</pubDate>"
+        f"<description>&lt;a href=\"https://example.com/{i}\"&gt;기사 {i}&lt;/a&gt;</description>"
+        '<source url="https://www.yna.co.kr">연합뉴스</source></item>'
+        for i in range(5)
+    )
+    content = f'<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel>{items}</channel></rss>'.encode()
+
+    fast = news_chatbot._parse_entries(parse_rss_items(content, 3))
+    slow = news_chatbot._parse_entries(feedparser.parse(content).entries[:3])
+    assert fast == slow, f"feedparser 와 결과가 다름: {fast} / {slow}"
+    assert len(fast) == 3 and fast[0]["published"] == "2024-10-06 15:30", fast[0]
+    print("✅ feedparser 와 같은 결과 (앞의 3개만 읽기, 날짜는 UTC)")
+
+    # 문서 뒷부분이 깨져 있어도 필요한 항목까지만 읽으므로 문제없음
+    assert len(parse_rss_items(content[:-40], 2)) == 2
+    atom = b'<feed xmlns="http://www.w3.org/2005/Atom"><entry><title>Atom</title><link href="https://a.example"/></entry></feed>'
+    try:
+        parse_rss_items(atom, 5)
+        assert False, "Atom 문서를 RSS 로 읽음"
+    except RssFormatError:
+        pass
+    result = news_chatbot._handle_feed_response("https://a.example/feed", 5, 200, {}, atom, None)
+    assert result["articles"][0]["title"] == "Atom", "feedparser 대체 파싱 실패"
+    print("✅ RSS 가 아니면 feedparser 로 파싱")
+
+    print()
+
+def test_app_factory():
+    """앱 팩토리 / 상태 확인 엔드포인트 테스트"""
+    print("=" * 60)
+    print("테스트 24: 앱 팩토리와 상태 확인")
+    print("=" * 60)
+
+    app = news_chatbot_web.create_app()
+    assert news_chatbot._hot_refresh_task is None, "import/create_app 만으로 백그라운드 작업이 시작됨"
+    client = app.test_client()
+    assert client.get("/healthz").get_json() == {"status": "ok"}
+    ready = client.get("/readyz")
+    assert ready.status_code == 200 and ready.get_json()["ready"], ready.get_json()
+    print("✅ /healthz, /readyz")
+
+    news_chatbot_web.begin_shutdown()
+    assert client.get("/readyz").status_code == 503, "종료 중인데 준비 상태로 응답"
+    assert client.get("/healthz").status_code == 200
+    news_chatbot_web.create_app()
+    assert client.get("/readyz").status_code == 200
+    print("✅ 종료 중에는 /readyz 503")
+
+    original_db = news_chatbot.SAVED_NEWS_DB
+    with tempfile.TemporaryDirectory() as tmp:
+        news_chatbot.SAVED_NEWS_DB = tmp  # 디렉터리라서 SQLite 로 열 수 없음
+        try:
+            broken = client.get("/readyz")
+        finally:
+            news_chatbot.SAVED_NEWS_DB = original_db
+    assert broken.status_code == 503 and broken.get_json()["checks"]["saved_news"].startswith("error"), broken.get_json()
+    print("✅ 저장소를 열 수 없으면 /readyz 503")
+
+    args = serve.parse_args(["--workers", "3", "--no-background-refresh"])
+    assert args.workers == 3 and args.port == serve.DEFAULT_PORT
+    assert serve._app_config(args) == {"START_BACKGROUND_REFRESH": False}
+    os.environ["NEWS_THREADS"] = "12"
+    try:
+        assert serve.parse_args([]).threads == 12, "환경 변수 설정이 적용되지 않음"
+    finally:
+        del os.environ["NEWS_THREADS"]
+    runner = serve._select_runner()
+    expected = serve.run_waitress if sys.platform == "win32" else serve.run_gunicorn
+    assert runner in (expected, serve.run_waitress, None), runner
+    print(f"✅ serve.py 설정 (실행기: {runner.__name__ if runner else '없음'})")
+
+    print()
+
+def test_static_pages():
+    """미리 만든 메인 페이지 / 정적 파일의 캐시 헤더 테스트"""
+    print("=" * 60)
+    print("테스트 25: 페이지 ETag, 304, 압축, 정적 파일")
+    print("=" * 60)
+
+    client = news_chatbot_web.create_app().test_client()
+    page = client.get("/")
+    assert page.status_code == 200 and page.headers.get("ETag"), page.headers
+    assert page.headers["Cache-Control"] == "no-cache"
+    assert "Content-Encoding" not in page.headers
+    html = page.get_data(as_text=True)
+    assert "<style>" not in html, "CSS 가 아직 페이지 안에 있음"
+    print(f"✅ 메인 페이지 {len(page.data)}바이트, ETag {page.headers['ETag']}")
+
+    again = client.get("/", headers={"If-None-Match": page.headers["ETag"]})
+    assert again.status_code == 304 and not again.data, again.status_code
+    print("✅ If-None-Match 가 같으면 304")
+
+    zipped = client.get("/", headers={"Accept-Encoding": "gzip"})
+    assert zipped.headers.get("Content-Encoding") == "gzip", zipped.headers
+    assert gzip.decompress(zipped.data) == page.data
+    assert zipped.headers["ETag"] != page.headers["ETag"], "압축본과 원본의 ETag 가 같음"
+    assert "Accept-Encoding" in zipped.headers.get("Vary", "")
+    print(f"✅ gzip {len(zipped.data)}바이트")
+
+    urls = re.findall(r'(?:href|src)="(/static/[^"]+)"', html)
+    assert len(urls) == 2, urls
+    for url in urls:
+        asset = client.get(url)
+        assert asset.status_code == 200 and "immutable" in asset.headers["Cache-Control"], url
+        unversioned = client.get(url.split("?")[0])
+        assert unversioned.headers["Cache-Control"] == "no-cache"
+    assert client.get("/static/../news_chatbot.py").status_code == 404
+    assert client.get("/static/missing.js").status_code == 404
+    print(f"✅ 정적 파일 {urls}")
+
+    print()
+
+def test_async_client():
+    """asyncio 뉴스 클라이언트 테스트 (로컬 RSS 서버, 동기 호출과 다운로드 공유, 304 재사용)"""
+    print("=" * 60)
+    print("테스트 26: 비동기 뉴스 클라이언트")
+    print("=" * 60)
+
+    with StubFeedServer(delay=0.3) as stub:
+        async def fetch_together():
+            return await asyncio.gather(*[
+                news_async.afetch_news("비동기 테스트", 3, use_cache=False) for _ in range(5)
+            ])
+
+        sync_results = []
+        sync_thread = threading.Thread(
+            target=lambda: sync_results.append(fetch_news("비동기 테스트", 3, use_cache=False))
+        )
+        sync_thread.start()
+        time.sleep(0.1)  # 동기 호출이 먼저 다운로드를 시작한 상태에서 비동기 호출이 합류
+        results = news_async.run_sync(fetch_together(), timeout=30)
+        sync_thread.join()
+        assert len(stub.requests) == 1, f"같은 검색을 {len(stub.requests)}번 내려받음"
+        assert all(r == sync_results[0] for r in results) and len(results[0]["articles"]) == 3, results
+        print("✅ 동시 요청 6개(동기 1 + 비동기 5)에 다운로드 1번")
+
+        before = news_chatbot.get_runtime_stats()["feeds"]["not_modified"]
+        again = news_async.run_sync(news_async.afetch_news("비동기 테스트", 3, use_cache=False), timeout=30)
+        assert stub.requests[-1].get("If-None-Match") == stub.ETAG, stub.requests[-1]
+        assert news_chatbot.get_runtime_stats()["feeds"]["not_modified"] == before + 1
+        assert again == results[0], "304 응답 후 저장된 기사를 재사용하지 못함"
+        print("✅ 304 응답이면 저장된 기사 재사용")
+
+    class Response:
+        def __init__(self, text):
+            self.text = text
+
+    class AsyncModel:
+        """generate_content_async 만 있는 가짜 모델 (동기 호출이나 스레드를 쓰면 실패)."""
+        def __init__(self):
+            self.active = 0
+            self.max_active = 0
+
+        async def generate_content_async(self, prompt):
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+            await asyncio.sleep(0.3)
+            self.active -= 1
+            return Response("비동기 답변")
+
+    api_key = "AIza-async-test"
+    original_key_file = news_chatbot.API_KEY_FILE
+    with tempfile.TemporaryDirectory() as tmp:
+        news_chatbot.API_KEY_FILE = os.path.join(tmp, "api_key.json")
+        try:
+            save_api_key(api_key)
+            model = AsyncModel()
+            news_chatbot._gemini_models.set((api_key, news_chatbot.GEMINI_MODEL, "async"), model)
+            stamp = time.time()
+            count = news_async.ASYNC_BLOCKING_WORKERS * 3
+
+            async def many_calls():
+                summaries = [
+                    news_async.asummarize_with_gemini([{"title": f"비동기 기사 {i} {stamp}", "summary": "내용"}])
+                    for i in range(count)
+                ]
+                chats = [
+                    news_async.achat_with_gemini([{"title": f"비동기 대화 {stamp}", "summary": "내용"}], f"질문 {i}")
+                    for i in range(count)
+                ]
+                return await asyncio.gather(*summaries, *chats)
+
+            started = time.perf_counter()
+            results = news_async.run_sync(many_calls(), timeout=30)
+            elapsed = time.perf_counter() - started
+            assert all(not r["error"] for r in results), [r for r in results if r["error"]][:1]
+            assert model.max_active == count * 2, f"동시에 기다린 재미나이 호출 {model.max_active}개"
+            assert "blocking" not in news_async._executors, "재미나이 호출이 스레드 풀을 사용함"
+            print(f"✅ 재미나이 호출 {count * 2}개를 공유 루프에서 동시에 기다림 ({elapsed:.2f}초)")
+        finally:
+            news_chatbot.API_KEY_FILE = original_key_file
+            news_chatbot.invalidate_gemini_models(api_key)
+
+    news_async.shutdown()
+    assert news_async._http is None and news_async._loop is None, "비동기 클라이언트가 정리되지 않음"
+    print("✅ shutdown 후 커넥션 풀과 이벤트 루프 정리")
+
+    # 커넥션 풀을 닫다가 멈춰도 루프와 스레드 풀은 정리되어야 함
+    async def hang():
+        await asyncio.sleep(60)
+
+    original_close, original_timeout = news_async._aclose_http, news_async.ASYNC_SHUTDOWN_TIMEOUT
+    news_async._aclose_http, news_async.ASYNC_SHUTDOWN_TIMEOUT = hang, 0.2
+    try:
+        news_async.run_sync(news_async._run_in("parse", len, "abc"))
+        loop, thread, executor = news_async._loop, news_async._loop_thread, news_async._executors["parse"]
+        news_async.shutdown()
+    finally:
+        news_async._aclose_http, news_async.ASYNC_SHUTDOWN_TIMEOUT = original_close, original_timeout
+    assert not thread.is_alive() and loop.is_closed() and executor._shutdown, "루프나 스레드 풀이 남음"
+    print("✅ 커넥션 풀을 닫지 못해도 루프와 스레드 풀 정리")
+
+    print()
+
+def test_batch_search():
+    """여러 키워드 동시 검색 테스트 (표기가 다른 같은 키워드, 키워드별 오류, 시간 초과, 중복 표시)"""
+    print("=" * 60)
+    print("테스트 27: 여러 키워드 동시 검색")
+    print("=" * 60)
+
+    calls = []
+
+    def fake_fetch(keyword, max_results=10, use_cache=True):
+        calls.append(keyword)
+        if keyword == "오류":
+            raise RuntimeError("피드 서버 오류")
+        if keyword == "느림":
+            time.sleep(1.0)
+        shared = {"title": "두 키워드에 모두 나온 기사", "link": "https://example.com/shared?oc=5"}
+        own = {"title": f"{keyword} 기사", "link": f"https://example.com/{keyword}"}
+        return {"error": False, "articles": [dict(shared), own]}
+
+    original = news_chatbot.fetch_news
+    news_chatbot.fetch_news = fake_fetch
+    try:
+        result = news_chatbot.fetch_news_many(["반도체", "AI", " ai ", "오류"])
+        assert sorted(result["results"]) == sorted(["반도체", "AI", "ai", "오류"]), result["results"].keys()
+        assert sorted(calls) == sorted(["반도체", "AI", "오류"]), f"같은 키워드를 여러 번 가져옴: {calls}"
+        assert result["results"]["ai"]["articles"] == result["results"]["AI"]["articles"]
+        assert result["results"]["ai"]["articles"] is not result["results"]["AI"]["articles"]
+        print("✅ 표기가 다른 같은 키워드는 한 번만 가져오고 요청한 키워드마다 결과")
+
+        failed = result["results"]["오류"]
+        assert failed["error"] and "피드 서버 오류" in failed["message"], failed
+        assert not result["results"]["반도체"]["error"], "다른 키워드의 오류가 번짐"
+        print("✅ 키워드별 오류는 그 키워드에만")
+
+        shared = result["results"]["반도체"]["articles"][0]
+        assert shared["duplicate"] and shared["also_in"] == ["AI"], shared
+        assert list(result["duplicates"].values()) == [["반도체", "AI"]], result["duplicates"]
+        assert "duplicate" not in result["results"]["반도체"]["articles"][1]
+        print("✅ 여러 키워드에 나온 기사 표시")
+
+        slow = news_chatbot.fetch_news_many(["느림", "빠름"], deadline=0.3)
+        timed_out = slow["results"]["느림"]
+        assert timed_out["error"] and "시간이 초과" in timed_out["message"] and "0.3초" in timed_out["details"], timed_out
+        assert not slow["results"]["빠름"]["error"]
+        print("✅ 제한 시간 안에 끝나지 않은 키워드는 시간 초과 오류")
+
+        client = news_chatbot_web.create_app().test_client()
+        body = client.post("/search/batch", json={"keywords": "반도체, AI"}).get_json()
+        assert not body["error"] and set(body["results"]) == {"반도체", "AI"}, body
+        assert all(r["result_id"] and r["articles"][0]["summary_short"] is not None for r in body["results"].values())
+        assert client.post("/search/batch", json={"keywords": []}).get_json()["error"]
+        print("✅ /search/batch")
+    finally:
+        news_chatbot.fetch_news = original
+
+    print()
+
+def test_conditional_get():
+    """조건부 GET 테스트 (로컬 RSS 서버의 ETag / Last-Modified, 304 이면 저장된 기사와 캐시 재사용)"""
+    print("=" * 60)
+    print("테스트 28: 조건부 GET (304 Not Modified)")
+    print("=" * 60)
+
+    with StubFeedServer() as stub:
+        cache_key = (normalize_keyword("조건부"), 3)
+        first = fetch_news("조건부", 3)
+        assert not first["error"] and len(first["articles"]) == 3, first
+        assert "If-None-Match" not in stub.requests[0], "처음 요청에 검증값을 보냄"
+        first_expiry = news_chatbot._news_cache.expires_in(cache_key)
+        print("✅ 처음 요청은 전체 다운로드")
+
+        before = news_chatbot.get_runtime_stats()["feeds"]
+        time.sleep(0.2)
+        again = fetch_news("조건부", 3, use_cache=False)
+        sent = stub.requests[-1]
+        assert sent.get("If-None-Match") == stub.ETAG, sent
+        assert sent.get("If-Modified-Since") == stub.LAST_MODIFIED, sent
+        print("✅ If-None-Match / If-Modified-Since 전송")
+
+        after = news_chatbot.get_runtime_stats()["feeds"]
+        assert after["not_modified"] == before["not_modified"] + 1, "304 응답이 집계되지 않음"
+        assert after["downloads"] == before["downloads"], "304 인데 피드를 다시 파싱함"
+        assert again == first, "304 응답 후 저장된 기사를 재사용하지 못함"
+        # 갱신하지 않았으면 남은 시간이 0.2초 넘게 줄었어야 함
+        assert news_chatbot._news_cache.expires_in(cache_key) > first_expiry - 0.1, "캐시 TTL 이 갱신되지 않음"
+        print("✅ 304 이면 저장된 기사 재사용, 캐시 TTL 갱신")
+
+        # 저장된 기사보다 많이 요청하면 304 로는 채울 수 없으므로 검증값 없이 요청
+        fetch_news("조건부", 10, use_cache=False)
+        assert "If-None-Match" not in stub.requests[-1], "저장된 기사가 모자란데 조건부 요청을 보냄"
+        print("✅ 더 많은 기사를 요청하면 전체 다운로드")
+
+    print()
+
+def test_gemini_model_cache():
+    """API 키별 재미나이 모델/클라이언트 캐시 테스트 (네트워크 불필요)"""
+    print("=" * 60)
+    print("테스트 29: API 키별 재미나이 모델 캐시")
+    print("=" * 60)
+
+    key_a, key_b = "AIza-test-key-a", "AIza-test-key-b"
+    news_chatbot.invalidate_gemini_models()
+    model_a = news_chatbot.get_gemini_model(key_a)
+    model_b = news_chatbot.get_gemini_model(key_b)
+    assert news_chatbot.get_gemini_model(key_a) is model_a, "같은 키의 모델을 재사용하지 않음"
+    assert model_a is not model_b and model_a._client is not model_b._client, "두 키가 같은 클라이언트를 씀"
+    async def on_shared_loop(fn, *args):
+        return fn(*args)
+
+    async_a = news_async.run_sync(on_shared_loop(news_async._get_model, key_a))
+    async_b = news_async.run_sync(on_shared_loop(news_async._get_model, key_b))
+    assert async_a is not model_a and async_a._async_client is not async_b._async_client, "비동기 클라이언트가 키별로 묶이지 않음"
+    assert news_async.run_sync(on_shared_loop(news_async._get_model, key_a)) is async_a
+    print("✅ 키 두 개에 클라이언트 두 개 (동기, 공유 루프의 비동기)")
+
+    news_chatbot.invalidate_gemini_models(key_a)
+    assert news_chatbot.get_gemini_model(key_b) is model_b, "다른 키의 모델까지 버림"
+    assert (key_a, news_chatbot.GEMINI_MODEL, "async") not in news_chatbot._gemini_models.keys(), "비동기 모델이 남음"
+    model_a2 = news_chatbot.get_gemini_model(key_a)
+    assert model_a2 is not model_a, "invalidate_gemini_models(키) 후에도 같은 모델"
+    print("✅ invalidate_gemini_models(키) 는 그 키의 모델만 버림")
+
+    def reject(*args, **kwargs):
+        raise RuntimeError("400 API key not valid. Please pass a valid API key. [reason: API_KEY_INVALID]")
+
+    model_a2.generate_content = reject  # 인증 실패 응답 흉내
+    result = news_chatbot.validate_api_key(key_a)
+    assert not result["valid"], result
+    assert news_chatbot.get_gemini_model(key_a) is not model_a2, "인증에 실패한 키의 모델이 캐시에 남음"
+    assert news_chatbot.get_gemini_model(key_b) is model_b
+    print("✅ 인증에 실패한 키의 모델은 캐시에서 제거")
+
+    news_chatbot.invalidate_gemini_models()
+    print()
+
+def parse_sse(body: str) -> list:
+    """Server-Sent Events 응답을 [(event 이름, data dict), ...] 로 나눕니다."""
+    events = []
+    for block in body.split("\n\n"):
+        if not block.strip():
+            continue
+        lines = block.split("\n")
+        assert lines[0].startswith("event: ") and lines[1].startswith("data: "), f"SSE 형식 오류: {block!r}"
+        events.append((lines[0][len("event: "):], json.loads(lines[1][len("data: "):])))
+    return events
+
+def test_streaming():
+    """요약/대화 스트리밍 테스트 (가짜 모델, Flask 테스트 클라이언트로 SSE 형식 확인)"""
+    print("=" * 60)
+    print("테스트 30: 요약/대화 스트리밍 (SSE)")
+    print("=" * 60)
+
+    class Chunk:
+        def __init__(self, text):
+            self._text = text
+
+        @property
+        def text(self):
+            if self._text is None:
+                raise ValueError("안전 필터로 막힌 조각")
+            return self._text
+
+    class StreamingModel:
+        """stream=True 이면 조각을 나눠 돌려주고, fail 이면 두 번째 조각 뒤에 실패합니다."""
+        def __init__(self, fail=False):
+            self.fail = fail
+
+        def generate_content(self, prompt, stream=False):
+            if not stream:
+                return Chunk("묶음 정리")
+            return self._chunks()
+
+        def _chunks(self):
+            yield Chunk("첫 조각. ")
+            yield Chunk(None)
+            yield Chunk("둘째 조각.")
+            if self.fail:
+                raise RuntimeError("연결이 끊어졌습니다")
+
+    api_key = "AIza-stream-test"
+    original_key_file = news_chatbot.API_KEY_FILE
+    original_chunk_tokens = news_chatbot.SUMMARY_CHUNK_TOKENS
+    with tempfile.TemporaryDirectory() as tmp:
+        news_chatbot.API_KEY_FILE = os.path.join(tmp, "api_key.json")
+        try:
+            save_api_key(api_key)
+            news_chatbot._gemini_models.set((api_key, news_chatbot.GEMINI_MODEL), StreamingModel())
+            client = news_chatbot_web.create_app().test_client()
+            stamp = time.time()
+            articles = [{"title": f"스트리밍 기사 {i} {stamp}", "summary": "내용"} for i in range(3)]
+
+            response = client.post("/summarize/stream", json={"keyword": "스트림", "articles": articles})
+            assert response.mimetype == "text/event-stream", response.mimetype
+            events = parse_sse(response.get_data(as_text=True))
+            assert [name for name, _ in events] == ["chunk", "chunk", "done"], events
+            assert all(name == data["type"] for name, data in events)
+            assert events[-1][1]["summary"] == "첫 조각. 둘째 조각." and not events[-1][1]["cached"]
+            print("✅ 요약: chunk 이벤트 뒤에 done (텍스트 없는 조각은 건너뜀)")
+
+            cached = parse_sse(client.post(
+                "/summarize/stream", json={"keyword": "스트림", "articles": articles}
+            ).get_data(as_text=True))
+            assert cached[-1][1] == {"type": "done", "summary": "첫 조각. 둘째 조각.", "cached": True}, cached
+            print("✅ 같은 기사는 캐시된 요약을 한 번에")
+
+            news_chatbot.SUMMARY_CHUNK_TOKENS = 60
+            many = [{"title": f"긴 기사 {i} {stamp}", "summary": "경제 소식 " * 20} for i in range(6)]
+            events = [data for _, data in parse_sse(client.post(
+                "/summarize/stream", json={"keyword": "많은 기사", "articles": many}
+            ).get_data(as_text=True))]
+            stages = [event["stage"] for event in events if event["type"] == "progress"]
+            assert stages and stages[0] == "map" and stages[-1] == "reduce", events
+            assert events[-1]["type"] == "done", events[-1]
+            print(f"✅ 기사가 많으면 progress 이벤트 {len(stages)}개 후 요약")
+            news_chatbot.SUMMARY_CHUNK_TOKENS = original_chunk_tokens
+
+            events = parse_sse(client.post(
+                "/chat/stream", json={"articles": articles, "message": "무슨 내용이야?"}
+            ).get_data(as_text=True))
+            assert [name for name, _ in events] == ["chunk", "chunk", "done"], events
+            done = events[-1][1]
+            assert done["response"] == "첫 조각. 둘째 조각." and done["conversation_id"], done
+            print("✅ 대화: chunk 이벤트 뒤에 conversation_id 가 담긴 done")
+
+            news_chatbot._gemini_models.set((api_key, news_chatbot.GEMINI_MODEL), StreamingModel(fail=True))
+            events = parse_sse(client.post(
+                "/chat/stream", json={"articles": articles, "message": "다른 질문", "conversation_id": done["conversation_id"]}
+            ).get_data(as_text=True))
+            assert [name for name, _ in events] == ["chunk", "chunk", "error"], events
+            assert "연결이 끊어졌습니다" in events[-1][1]["message"] and events[-1][1]["error"]
+            missing = parse_sse(client.post("/chat/stream", json={"articles": articles}).get_data(as_text=True))
+            assert missing == [("error", {"type": "error", "error": True, "message": "메시지가 없습니다."})], missing
+            print("✅ 중간에 실패하면 마지막에 error 이벤트")
+        finally:
+            news_chatbot.API_KEY_FILE = original_key_file
+            news_chatbot.SUMMARY_CHUNK_TOKENS = original_chunk_tokens
+            news_chatbot.invalidate_gemini_models()
+
+    print()
+
+def test_http_session():
+    """공유 HTTP 세션 테스트 (세션 재사용, 재시도 설정, 풀 크기, 타임아웃, 풀 통계)"""
+    print("=" * 60)
+    print("테스트 31: 공유 HTTP 세션 (커넥션 풀)")
+    print("=" * 60)
+
+    news_http.close_session()
+    session = news_http.get_session()
+    assert news_http.get_session() is session, "호출할 때마다 세션을 새로 만듦"
+    adapter = session.get_adapter("https://news.google.com/rss")
+    assert session.get_adapter("http://example.com") is adapter, "http/https 가 다른 어댑터를 씀"
+    retry = adapter.max_retries
+    assert (retry.total, retry.connect, retry.read, retry.status) == (news_http.RETRY_TOTAL,) * 4, retry
+    assert set(retry.status_forcelist) == set(news_http.RETRY_STATUS) and retry.backoff_factor == news_http.RETRY_BACKOFF
+    assert not retry.raise_on_status and "POST" not in retry.allowed_methods
+    assert adapter.poolmanager.connection_pool_kw["maxsize"] == news_http.POOL_MAXSIZE
+    print(f"✅ 재시도 {retry.total}회 (상태 {sorted(retry.status_forcelist)}), 호스트당 연결 {news_http.POOL_MAXSIZE}개")
+
+    sent = {}
+    session.get = lambda url, **kwargs: sent.update(kwargs)  # 보낸 인자만 기록
+    try:
+        news_http.http_get("https://example.com/feed")
+    finally:
+        del session.get
+    assert sent["timeout"] == (news_http.CONNECT_TIMEOUT, news_http.READ_TIMEOUT), sent
+    print(f"✅ 타임아웃 (연결, 읽기) = {sent['timeout']}")
+
+    with StubFeedServer() as stub:
+        url = news_chatbot.GOOGLE_NEWS_SEARCH_RSS.format(query="pool")
+        for _ in range(3):
+            assert news_http.http_get(url).status_code == 200
+        host = news_http.get_pool_stats()["hosts"]["http://127.0.0.1"]
+        assert host["connections_opened"] == 1 and host["connections_reused"] == 2, host
+        assert len(stub.requests) == 3
+    print(f"✅ 같은 호스트 요청 3번에 연결 1개 재사용: {host}")
+
+    news_http.close_session()
+    assert news_http.get_pool_stats()["hosts"] == {}
+    print()
+
 def main():
     """모든 테스트 실행"""
     print("\n" + "=" * 60)
@@ -240,6 +1601,181 @@ def main():
         print(f"❌ 테스트 실패: {e}")
         tests_failed += 1
     
+    try:
+        test_news_cache()
+        tests_passed += 1
+    except Exception as e:
+        print(f"❌ 테스트 실패: {e}")
+        tests_failed += 1
+    
+    try:
+        test_stale_while_revalidate()
+        tests_passed += 1
+    except Exception as e:
+        print(f"❌ 테스트 실패: {e}")
+        tests_failed += 1
+    
+    try:
+        test_single_flight()
+        tests_passed += 1
+    except Exception as e:
+        print(f"❌ 테스트 실패: {e}")
+        tests_failed += 1
+    
+    try:
+        test_api_key_store()
+        tests_passed += 1
+    except Exception as e:
+        print(f"❌ 테스트 실패: {e}")
+        tests_failed += 1
+    
+    try:
+        test_summary_cache()
+        tests_passed += 1
+    except Exception as e:
+        print(f"❌ 테스트 실패: {e}")
+        tests_failed += 1
+    
+    try:
+        test_result_sets()
+        tests_passed += 1
+    except Exception as e:
+        print(f"❌ 테스트 실패: {e}")
+        tests_failed += 1
+    
+    try:
+        test_conversation_history()
+        tests_passed += 1
+    except Exception as e:
+        print(f"❌ 테스트 실패: {e}")
+        tests_failed += 1
+    
+    try:
+        test_retrieval()
+        tests_passed += 1
+    except Exception as e:
+        print(f"❌ 테스트 실패: {e}")
+        tests_failed += 1
+    
+    try:
+        test_map_reduce_summary()
+        tests_passed += 1
+    except Exception as e:
+        print(f"❌ 테스트 실패: {e}")
+        tests_failed += 1
+    
+    try:
+        test_incremental_summary()
+        tests_passed += 1
+    except Exception as e:
+        print(f"❌ 테스트 실패: {e}")
+        tests_failed += 1
+    
+    try:
+        test_jsonl_store()
+        tests_passed += 1
+    except Exception as e:
+        print(f"❌ 테스트 실패: {e}")
+        tests_failed += 1
+    
+    try:
+        test_sqlite_store()
+        tests_passed += 1
+    except Exception as e:
+        print(f"❌ 테스트 실패: {e}")
+        tests_failed += 1
+    
+    try:
+        test_saved_search()
+        tests_passed += 1
+    except Exception as e:
+        print(f"❌ 테스트 실패: {e}")
+        tests_failed += 1
+    
+    try:
+        test_article_dedup()
+        tests_passed += 1
+    except Exception as e:
+        print(f"❌ 테스트 실패: {e}")
+        tests_failed += 1
+    
+    try:
+        test_sentence_split()
+        tests_passed += 1
+    except Exception as e:
+        print(f"❌ 테스트 실패: {e}")
+        tests_failed += 1
+    
+    try:
+        test_feed_cleaning()
+        tests_passed += 1
+    except Exception as e:
+        print(f"❌ 테스트 실패: {e}")
+        tests_failed += 1
+    
+    try:
+        test_rss_parser()
+        tests_passed += 1
+    except Exception as e:
+        print(f"❌ 테스트 실패: {e}")
+        tests_failed += 1
+    
+    try:
+        test_app_factory()
+        tests_passed += 1
+    except Exception as e:
+        print(f"❌ 테스트 실패: {e}")
+        tests_failed += 1
+    
+    try:
+        test_static_pages()
+        tests_passed += 1
+    except Exception as e:
+        print(f"❌ 테스트 실패: {e}")
+        tests_failed += 1
+    
+    try:
+        test_async_client()
+        tests_passed += 1
+    except Exception as e:
+        print(f"❌ 테스트 실패: {e}")
+        tests_failed += 1
+    
+    try:
+        test_batch_search()
+        tests_passed += 1
+    except Exception as e:
+        print(f"❌ 테스트 실패: {e}")
+        tests_failed += 1
+    
+    try:
+        test_conditional_get()
+        tests_passed += 1
+    except Exception as e:
+        print(f"❌ 테스트 실패: {e}")
+        tests_failed += 1
+    
+    try:
+        test_gemini_model_cache()
+        tests_passed += 1
+    except Exception as e:
+        print(f"❌ 테스트 실패: {e}")
+        tests_failed += 1
+    
+    try:
+        test_streaming()
+        tests_passed += 1
+    except Exception as e:
+        print(f"❌ 테스트 실패: {e}")
+        tests_failed += 1
+    
+    try:
+        test_http_session()
+        tests_passed += 1
+    except Exception as e:
+        print(f"❌ 테스트 실패: {e}")
+        tests_failed += 1
+    
     # 결과 요약
     print("=" * 60)
     print("테스트 결과 요약")